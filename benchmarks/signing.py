@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compare the signatures per second of the secp256k1 backends
+for Ribbon EIP712 bids and Thetanuts packed message bids
+
+    python3 benchmarks/signing.py --seconds 2
+"""
+import argparse
+import contextlib
+import io
+import time
+from collections.abc import Callable
+
+from eth_keys.backends import is_coincurve_available  # type: ignore
+
+from ribbon.definitions import Bid as RibbonBid
+from ribbon.definitions import Domain
+from ribbon.wallet import Wallet as RibbonWallet
+from sdk_commons.signing import ECC_BACKENDS
+from thetanuts.definitions import Bid as ThetanutsBid
+from thetanuts.wallet import Wallet as ThetanutsWallet
+
+PRIVATE_KEY = "0x" + "11" * 32
+ADDRESS_ZERO = "0x" + "0" * 40
+SWAP_ADDRESS = "0x58848824baEb9678847aF487CB02EAba782FECB5"
+VAULT_ADDRESS = "0x4a3c6DA195506ADC87D984C5B429708c8Ddd4237"
+
+
+def measure(sign: Callable[[int], object], seconds: float) -> float:
+    """Return the number of signatures per second"""
+    count = 0
+    start = time.perf_counter()
+    # Thetanuts wallet prints every signed bid
+    with contextlib.redirect_stdout(io.StringIO()):
+        while (elapsed := time.perf_counter() - start) < seconds:
+            sign(count)
+            count += 1
+    return count / elapsed
+
+
+def ribbon_flow(backend: str) -> Callable[[int], object]:
+    wallet = RibbonWallet(private_key=PRIVATE_KEY, backend=backend)
+    domain = Domain(name="RIBBON SWAP", version="1", chainId=1, verifyingContract=SWAP_ADDRESS)
+
+    def sign(nonce: int) -> object:
+        bid = RibbonBid(
+            swapId=1,
+            nonce=nonce,
+            signerWallet=str(wallet.public_key),
+            sellAmount=6000000,
+            buyAmount=1000000000000000000,
+            referrer=ADDRESS_ZERO,
+        )
+        return wallet.sign_bid(domain, bid)
+
+    return sign
+
+
+def thetanuts_flow(backend: str) -> Callable[[int], object]:
+    wallet = ThetanutsWallet(private_key=PRIVATE_KEY, backend=backend)
+
+    def sign(nonce: int) -> object:
+        bid = ThetanutsBid(
+            vaultAddress=VAULT_ADDRESS,
+            nonce=nonce,
+            signerWallet=wallet.public_key,
+            sellAmount=6000000,
+            buyAmount=1000000000000000000,
+            referrer=ADDRESS_ZERO,
+        )
+        return wallet.sign_bid(bid)
+
+    return sign
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    backends = [b for b in ECC_BACKENDS if b != "coincurve" or is_coincurve_available()]
+    if "coincurve" not in backends:
+        print("coincurve is not installed, skipping its backend")
+
+    for flow_name, flow in (("ribbon", ribbon_flow), ("thetanuts", thetanuts_flow)):
+        for backend in backends:
+            rate = measure(flow(backend), args.seconds)
+            print(f"{flow_name:<10} {backend:<10} {rate:>10.1f} signatures/s")
+
+
+if __name__ == "__main__":
+    main()
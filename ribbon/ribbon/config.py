@@ -1,12 +1,43 @@
+import asyncio
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
 from typing import Any
 
+import aiohttp
+from web3.contract import AsyncContract
+from web3.types import BlockIdentifier
+
+from ribbon.contract import check_rpc_chain
 from ribbon.definitions import Bid, ContractConfig, Domain, Offer, SignedBid
-from ribbon.otoken import oTokenContract
-from ribbon.swap import SwapContract
-from ribbon.wallet import Wallet
+from ribbon.offer_book import get_offer_book
+from ribbon.otoken import oTokenContract, parse_otoken_details
+from ribbon.swap import (
+    DOMAIN_NAME,
+    DOMAIN_VERSION,
+    SwapContract,
+    get_authorized_delegate,
+    get_swap_domain,
+    normalize_signed_bid,
+    parse_check_response,
+    parse_offer_details,
+    precheck_signed_bid,
+)
+from ribbon.utils import get_address
+from ribbon.wallet import MIN_ALLOWANCE, Wallet
 from sdk_commons.chains import Chains
-from sdk_commons.config import BidValidation, OfferDetails, OfferTokenDetails, SDKConfig
-from sdk_commons.helpers import get_evm_signature_components
+from sdk_commons.config import (
+    AsyncSDKConfig,
+    BidValidation,
+    OfferDetails,
+    OfferTokenDetails,
+    SDKConfig,
+)
+from sdk_commons.helpers import get_abi_path, get_evm_signature_components
+from sdk_commons.offers import offer_details_cache
+from sdk_commons.providers import get_async_chain_id, get_async_contract, get_contract
+from sdk_commons.receipts import PendingTransaction
+from sdk_commons.tokens import get_async_token_metadata
 
 
 class AuthorizationPages:
@@ -42,7 +73,40 @@ class RibbonSDKConfig(SDKConfig):
     ) -> str:
         """Create an offer"""
 
-        wallet = Wallet(public_key=public_key, private_key=private_key)
+        return self.submit_offer(
+            contract_address=contract_address,
+            chain_id=chain_id,
+            rpc_uri=rpc_uri,
+            oToken=oToken,
+            bidding_token=bidding_token,
+            min_price=min_price,
+            min_bid_size=min_bid_size,
+            offer_amount=offer_amount,
+            public_key=public_key,
+            private_key=private_key,
+        ).result()
+
+    def submit_offer(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        oToken: str,
+        bidding_token: str,
+        min_price: int,
+        min_bid_size: int,
+        offer_amount: int,
+        public_key: str,
+        private_key: str,
+        **kwargs: Any,
+    ) -> PendingTransaction[str]:
+        """
+        Create an offer without waiting for the transaction, the
+        returned handle resolves to the offer id once included
+        """
+
+        wallet = Wallet.cached(public_key=public_key, private_key=private_key)
 
         config = ContractConfig(address=contract_address, chain_id=chain_id, rpc_uri=rpc_uri)
 
@@ -55,7 +119,7 @@ class RibbonSDKConfig(SDKConfig):
             minPrice=min_price,
             offerAmount=offer_amount,
         )
-        return swap_contract.create_offer(new_offer, wallet)
+        return swap_contract.submit_offer(new_offer, wallet)
 
     def get_otoken_details(
         self,
@@ -84,6 +148,16 @@ class RibbonSDKConfig(SDKConfig):
     ) -> OfferDetails:
         """Return details for a given offer"""
 
+        # Answered locally when the offers of the contract are indexed
+        # up to the latest block, by the contract for new offers or
+        # when the index is stale or lagging
+        offer_book = get_offer_book(chain_id, contract_address)
+        if offer_book is not None:
+            block_number = offer_details_cache.get_block_number(rpc_uri, chain_id)
+            details = offer_book.find_offer_details(offer_id, block_number)
+            if details is not None:
+                return details
+
         swap_config = ContractConfig(address=contract_address, chain_id=chain_id, rpc_uri=rpc_uri)
 
         swap_contract = SwapContract(swap_config)
@@ -107,8 +181,8 @@ class RibbonSDKConfig(SDKConfig):
         """Sign a bid and return the signature"""
 
         domain = Domain(
-            name="RIBBON SWAP",
-            version="1",
+            name=DOMAIN_NAME,
+            version=DOMAIN_VERSION,
             chainId=chain_id.value,
             verifyingContract=contract_address,
         )
@@ -120,7 +194,7 @@ class RibbonSDKConfig(SDKConfig):
             buyAmount=buy_amount,
             referrer=referrer,
         )
-        wallet = Wallet(public_key=public_key, private_key=private_key)
+        wallet = Wallet.cached(public_key=public_key, private_key=private_key)
         signed_bid = wallet.sign_bid(domain, payload)
 
         if signed_bid.r is None or signed_bid.s is None or signed_bid.v is None:
@@ -141,9 +215,14 @@ class RibbonSDKConfig(SDKConfig):
         buy_amount: int,
         referrer: str,
         signature: str,
+        precheck: bool = False,
+        allow_delegates: bool = True,
         **kwargs: Any,
     ) -> BidValidation:
-        """Validate the signing bid"""
+        """
+        Validate the signing bid. With precheck the signature
+        is verified locally before calling the Swap contract
+        """
         r, s, v = get_evm_signature_components(signature)
 
         config = ContractConfig(
@@ -165,7 +244,9 @@ class RibbonSDKConfig(SDKConfig):
             s=s,
             v=v,
         )
-        return swap_contract.validate_bid(signed_bid)
+        return swap_contract.validate_bid(
+            signed_bid, precheck=precheck, allow_delegates=allow_delegates
+        )
 
     def verify_allowance(
         self,
@@ -186,3 +267,235 @@ class RibbonSDKConfig(SDKConfig):
 
         wallet = Wallet(public_key=public_key)
         return wallet.verify_allowance(config, token_address=token_address)
+
+
+class AsyncRibbonSDKConfig(AsyncSDKConfig):
+    """
+    asyncio implementation of RibbonSDKConfig on AsyncWeb3.
+    Signing and local signature checks run in the executor,
+    create_offer runs RibbonSDKConfig.create_offer in the executor
+    """
+
+    authorization_pages = AuthorizationPages
+    supported_chains = RibbonSDKConfig.supported_chains
+    sync_config = RibbonSDKConfig()
+
+    async def _get_contract(
+        self, contract_address: str, chain_id: Chains, rpc_uri: str, abi_name: str | Path
+    ) -> AsyncContract:
+        """Verify the RPC chain and return the contract handle"""
+
+        if chain_id not in self.supported_chains:
+            raise ValueError("Invalid chain")
+
+        try:
+            rpc_chain_id = await get_async_chain_id(rpc_uri, chain_id)
+        except (OSError, ValueError, aiohttp.ClientError, asyncio.TimeoutError):
+            raise ValueError("RPC connection error")
+
+        check_rpc_chain(chain_id, rpc_chain_id)
+
+        return get_async_contract(rpc_uri, chain_id, get_address(contract_address), abi_name)
+
+    async def create_offer(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        oToken: str,
+        bidding_token: str,
+        min_price: int,
+        min_bid_size: int,
+        offer_amount: int,
+        public_key: str,
+        private_key: str,
+        **kwargs: Any,
+    ) -> str:
+        """Create an offer"""
+
+        # Only the submission runs in the executor, the receipt
+        # is awaited from the shared receipt poller
+        pending = await self.run_in_executor(
+            self.sync_config.submit_offer,
+            contract_address=contract_address,
+            chain_id=chain_id,
+            rpc_uri=rpc_uri,
+            oToken=oToken,
+            bidding_token=bidding_token,
+            min_price=min_price,
+            min_bid_size=min_bid_size,
+            offer_amount=offer_amount,
+            public_key=public_key,
+            private_key=private_key,
+        )
+        return await pending
+
+    async def get_otoken_details(
+        self,
+        *,
+        # TODO: to be renamed into token_address
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        **kwargs: Any,
+    ) -> OfferTokenDetails:
+        """Return details about the offer token"""
+
+        otoken_contract = await self._get_contract(
+            contract_address, chain_id, rpc_uri, oTokenContract.abi_location
+        )
+        details = await otoken_contract.functions.getOtokenDetails().call()
+
+        return parse_otoken_details(details)
+
+    async def get_offer_details(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        offer_id: int,
+        **kwargs: Any,
+    ) -> OfferDetails:
+        """Return details for a given offer"""
+
+        offer_book = get_offer_book(chain_id, contract_address)
+        if offer_book is not None:
+            block_number = await offer_details_cache.get_async_block_number(rpc_uri, chain_id)
+            details = offer_book.find_offer_details(offer_id, block_number)
+            if details is not None:
+                return details
+
+        swap_contract = await self._get_contract(
+            contract_address, chain_id, rpc_uri, SwapContract.abi_location
+        )
+
+        async def fetch(block_number: BlockIdentifier) -> OfferDetails:
+            details = await swap_contract.functions.swapOffers(offer_id).call(
+                block_identifier=block_number
+            )
+            return parse_offer_details(offer_id, details)
+
+        return await offer_details_cache.get_or_fetch_async(
+            rpc_uri, chain_id, swap_contract.address, offer_id, fetch
+        )
+
+    async def sign_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        public_key: str,
+        private_key: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        **kwargs: Any,
+    ) -> str:
+        """Sign a bid and return the signature"""
+
+        return await self.run_in_executor(
+            self.sync_config.sign_bid,
+            contract_address=contract_address,
+            chain_id=chain_id,
+            public_key=public_key,
+            private_key=private_key,
+            swap_id=swap_id,
+            nonce=nonce,
+            signer_wallet=signer_wallet,
+            sell_amount=sell_amount,
+            buy_amount=buy_amount,
+            referrer=referrer,
+        )
+
+    async def validate_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        signature: str,
+        precheck: bool = False,
+        allow_delegates: bool = True,
+        **kwargs: Any,
+    ) -> BidValidation:
+        """
+        Validate the signing bid. With precheck the signature
+        is verified locally before calling the Swap contract
+        """
+        r, s, v = get_evm_signature_components(signature)
+
+        swap_contract = await self._get_contract(
+            contract_address, chain_id, rpc_uri, SwapContract.abi_location
+        )
+
+        signed_bid = normalize_signed_bid(
+            SignedBid(
+                swapId=swap_id,
+                nonce=nonce,
+                signerWallet=signer_wallet,
+                sellAmount=sell_amount,
+                buyAmount=buy_amount,
+                referrer=referrer,
+                r=r,
+                s=s,
+                v=v,
+            )
+        )
+
+        if precheck:
+            domain = get_swap_domain(chain_id, swap_contract.address)
+            # Delegates are read with the pooled sync contract,
+            # on the executor thread running the precheck
+            delegate_contract = get_contract(
+                rpc_uri, chain_id, swap_contract.address, SwapContract.abi_location
+            )
+            result = await self.run_in_executor(
+                precheck_signed_bid,
+                domain,
+                signed_bid,
+                allow_delegates,
+                partial(get_authorized_delegate, delegate_contract, chain_id),
+            )
+            if result is not None:
+                return result
+
+        response = await swap_contract.functions.check(asdict(signed_bid)).call()
+
+        return parse_check_response(response)
+
+    async def verify_allowance(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        public_key: str,
+        token_address: str,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Verify if the contract is allowed to access
+        the given token on the wallet
+        """
+
+        bidding_token = await self._get_contract(
+            token_address, chain_id, rpc_uri, get_abi_path("ERC20")
+        )
+
+        metadata = await get_async_token_metadata(rpc_uri, chain_id, bidding_token.address)
+        allowance = await bidding_token.functions.allowance(
+            get_address(public_key), get_address(contract_address)
+        ).call()
+
+        return bool(allowance / 10**metadata.decimals > MIN_ALLOWANCE)
@@ -7,13 +7,38 @@
 """ Abstract class for contract connection """
 # ---------------------------------------------------------------------------
 
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+from typing import Any
+
+from web3.contract.contract import ContractFunction
 
 from ribbon.definitions import ContractConfig
 from ribbon.utils import get_address
 from sdk_commons.chains import Chains
-from sdk_commons.helpers import get_abi, get_abi_path
+from sdk_commons.helpers import get_abi_path
+from sdk_commons.multicall import aggregate
+from sdk_commons.providers import get_chain_id, get_contract, get_web3
+
+
+# ---------------------------------------------------------------------------
+# Helper Functions
+# ---------------------------------------------------------------------------
+def check_rpc_chain(chain: Chains, rpc_chain_id: int) -> None:
+    """
+    Verify that the chain id returned by the RPC matches the chain
+
+    Args:
+        chain (Chains): Expected chain
+        rpc_chain_id (int): Chain id returned by the RPC
+
+    Raises:
+        ValueError: The chains don't match
+    """
+    if int(rpc_chain_id) != chain.value:
+        raise ValueError(
+            f"RPC chain mismatched ({rpc_chain_id}). "
+            + f"Expected: {chain.name} "
+            + f"({chain.value})"
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -46,22 +71,30 @@ class ContractConnection:
         self.config = config
         self.address = get_address(self.config.address)
 
-        self.w3 = Web3(Web3.HTTPProvider(self.config.rpc_uri))
-        if not self.w3.is_connected():
+        chain = self.config.chain_id
+        # Shared with the other contracts of the same RPC and chain
+        self.w3 = get_web3(self.config.rpc_uri, chain)
+
+        # Fetching the chain id also verifies the connection,
+        # only requested once within the TTL of the chain registry
+        try:
+            rpc_chain_id = get_chain_id(self.config.rpc_uri, chain)
+        except (OSError, ValueError):
             raise ValueError("RPC connection error")
 
-        chain = self.config.chain_id
-        rpc_chain_id = self.w3.eth.chain_id
-        if int(rpc_chain_id) != chain.value:
-            raise ValueError(
-                f"RPC chain mismatched ({rpc_chain_id}). "
-                + f"Expected: {chain.name} "
-                + f"({chain.value})"
-            )
+        check_rpc_chain(chain, rpc_chain_id)
+
+        self.contract = get_contract(self.config.rpc_uri, chain, self.address, self.abi_location)
 
-        if chain in [Chains.FUJI, Chains.BSC, Chains.BSC_TESTNET]:
-            self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+    def aggregate(self, *calls: ContractFunction) -> list[Any]:
+        """
+        Method to execute read calls in a single request via Multicall3,
+        see sdk_commons.multicall.aggregate
 
-        abi = get_abi(self.abi_location)
+        Args:
+            calls (ContractFunction): Contract functions with arguments
 
-        self.contract = self.w3.eth.contract(self.address, abi=abi)
+        Returns:
+            results (list): Result of each call
+        """
+        return aggregate(self.w3, self.config.chain_id, calls)
@@ -8,15 +8,27 @@
 # ---------------------------------------------------------------------------
 
 import re
-from collections.abc import Callable
-from typing import Any, cast
+from collections.abc import Callable, Iterable, Iterator
+from copy import deepcopy
+from typing import Any
 
 # ---------------------------------------------------------------------------
 # Imports
 # ---------------------------------------------------------------------------
+from eth_hash.auto import keccak
+from eth_typing import HexStr
 from web3 import Web3
 
-from ribbon.utils import encode_type, get_address, hex_concat, hex_pad_right, hex_zero_pad, id
+from ribbon.utils import (
+    WORD_SIZE,
+    address_to_word,
+    encode_type,
+    hex_zero_pad,
+    int_to_word,
+    is_hex_string,
+    to_hex,
+)
+from sdk_commons.cache import LRUCache
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -34,13 +46,79 @@ HEX_TRUE = hex_zero_pad(Web3.to_hex(1), 32)
 HEX_FALSE = hex_zero_pad(Web3.to_hex(0), 32)
 ADDRESS_ZERO = hex_zero_pad(Web3.to_hex(0), 20)
 
+WORD_TRUE = int_to_word(1)
+WORD_FALSE = int_to_word(0)
+EIP712_PREFIX = bytes.fromhex('1901')
+
+UINT_TYPE_RE = re.compile(r'^(u?)int(\d*)$')
+BYTES_TYPE_RE = re.compile(r'^bytes(\d+)$')
+ARRAY_TYPE_RE = re.compile(r'\[[^()]*\]')
+
+# Maximum number of distinct type definitions kept compiled in memory
+ENCODER_CACHE_SIZE = 64
+# Compiled encoders, keyed by the fingerprint of their types
+ENCODER_CACHE: LRUCache[tuple, 'TypedDataEncoder'] = LRUCache(maxsize=ENCODER_CACHE_SIZE)
+# Maximum number of distinct domains with a memoized separator
+DOMAIN_SEPARATOR_CACHE_SIZE = 64
+# Domain separators, keyed by get_domain_key
+DOMAIN_SEPARATORS: LRUCache[tuple, bytes] = LRUCache(maxsize=DOMAIN_SEPARATOR_CACHE_SIZE)
+
 # TODO: to be improved by replacing Any with specific types
 EncoderType = Callable[[Any], str]
+# Encoders producing bytes, a word of 32 bytes for all non-struct types
+WordEncoderType = Callable[[Any], bytes]
+# Functions writing the encoded data of a struct into a given buffer
+StructWriterType = Callable[[bytearray, Any], None]
 
 
 # ---------------------------------------------------------------------------
 # Helper Functions
 # ---------------------------------------------------------------------------
+def to_hex_encoder(encoder: WordEncoderType) -> EncoderType:
+    """
+    Wrap a word encoder into an encoder producing hex strings
+
+    Args:
+        encoder (WordEncoderType): Word encoder
+
+    Returns:
+        encoder (EncoderType): Hex encoder
+    """
+    return lambda value: to_hex(encoder(value))
+
+
+def uint_word_encoder(data_type: str) -> WordEncoderType:
+    """
+    Word encoder for uint types
+
+    Args:
+        data_type (str): Data type in string
+
+    Returns:
+        encoder (WordEncoderType): Uint encoder
+    """
+    match = UINT_TYPE_RE.match(data_type)
+    if match is None:
+        raise ValueError(f'Invalid numeric type: {data_type}')
+
+    signed = match.group(1) == ''
+    width = int(match.group(2) or 256)
+
+    if width == 0 or width % 8 != 0 or width > 256 or match.group(2) not in ('', str(width)):
+        raise ValueError(f'Invalid numeric width: {data_type}')
+
+    boundsUpper = 2 ** (width - 1) - 1 if signed else 2**width - 1
+    boundsLower = -boundsUpper - 1 if signed else 0
+
+    def encoder(value: Any) -> bytes:
+        value = int(value)
+        if value > boundsUpper or value < boundsLower:
+            raise ValueError('Value out of bounds')
+        return int_to_word(value, signed)
+
+    return encoder
+
+
 def uint_encoder(data_type: str) -> EncoderType:
     """
     Encoder for uint types
@@ -51,26 +129,32 @@ def uint_encoder(data_type: str) -> EncoderType:
     Returns:
         encoder (EncoderType): Uint encoder
     """
-    match = re.findall(r'^(u?)int(\d*)$', data_type).pop()
-    signed = match[1] == ''
-    width = int(match[2]) if len(match) == 3 else 256
+    return to_hex_encoder(uint_word_encoder(data_type))
 
-    if width % 8 != 0 or width > 256 or (len(match) == 3 and match[2] != str(width)):
-        raise ValueError(f'Invalid numeric width: {data_type}')
 
-    boundsUpper = 2 ** (width - 1) - 1 if signed else 2 ** (width) - 1
-    boundsLower = -boundsUpper - 1
-    return cast(
-        EncoderType,
-        (
-            lambda value: hex_zero_pad(Web3.to_hex(int(value)), 32)
-            if int(value) < boundsUpper and int(value) > boundsLower
-            # TODO this is a return ValueError and not a raise,
-            # it is expected? (Please note that exception can't
-            # be directly raised from lambdas)
-            else ValueError('Value out of bounds')
-        ),
-    )
+def bytes_word_encoder(data_type: str) -> WordEncoderType:
+    """
+    Word encoder for bytes types, values are right padded
+
+    Args:
+        data_type (str): Data type in string
+
+    Returns:
+        encoder (WordEncoderType): Bytes encoder
+    """
+    match = BYTES_TYPE_RE.match(data_type)
+    width = int(match.group(1)) if match else 0
+
+    if width == 0 or width > WORD_SIZE or match is None or match.group(1) != str(width):
+        raise ValueError(f'Invalid bytes width: {data_type}')
+
+    def encoder(value: Any) -> bytes:
+        data = Web3.to_bytes(hexstr=HexStr(value)) if isinstance(value, str) else bytes(value)
+        if len(data) != width:
+            raise ValueError('Invalid bytes length')
+        return data.ljust(WORD_SIZE, b'\x00')
+
+    return encoder
 
 
 def bytes_encoder(data_type: str) -> EncoderType:
@@ -83,51 +167,120 @@ def bytes_encoder(data_type: str) -> EncoderType:
     Returns:
         encoder (EncoderType): Bytes encoder
     """
-    match = re.findall(r'^bytes(\d+)$', data_type).pop()
-    width = int(match[1])
+    return to_hex_encoder(bytes_word_encoder(data_type))
 
-    if width == 0 or width > 32 or match[1] != str(width):
-        raise ValueError(f'Invalid bytes width: {data_type}')
 
-    return cast(
-        EncoderType,
-        (
-            lambda value: hex_pad_right(value)
-            if len(value) == width
-            # TODO this is a return ValueError and not a raise,
-            # it is expected? (Please note that exception can't
-            # be directly raised from lambdas)
-            else ValueError('Invalid bytes length')
-        ),
-    )
+def dynamic_bytes_word_encoder(value: Any) -> bytes:
+    """
+    Word encoder for dynamic bytes, encoded as the hash of the content
 
+    Args:
+        value (str | bytes): Bytes or hex string with 0x prefix
 
-def get_base_encoder(data_type: str) -> EncoderType | None:
+    Returns:
+        word (bytes): Encoded value
     """
-    Get the encoder for base types
+    if isinstance(value, str):
+        return keccak(Web3.to_bytes(hexstr=HexStr(value)))
+    return keccak(value)
+
+
+def get_base_word_encoder(data_type: str) -> WordEncoderType | None:
+    """
+    Get the word encoder for base types
 
     Args:
         data_type (str): Data type in string
 
     Returns:
-        encoder (EncoderType): Encoder
+        encoder (WordEncoderType): Word encoder
     """
-    if re.match(r'^(u?)int(\d*)$', data_type):
-        return uint_encoder(data_type)
-    elif re.match(r'^bytes(\d+)$', data_type):
-        return bytes_encoder(data_type)
+    if UINT_TYPE_RE.match(data_type):
+        return uint_word_encoder(data_type)
+    elif BYTES_TYPE_RE.match(data_type):
+        return bytes_word_encoder(data_type)
     elif data_type == 'address':
-        return lambda value: hex_zero_pad(get_address(value), 32)
+        return address_to_word
     elif data_type == 'bool':
-        return lambda value: HEX_TRUE if value else HEX_FALSE
+        return lambda value: WORD_TRUE if value else WORD_FALSE
     elif data_type == 'bytes':
-        return lambda value: Web3.keccak(text=value).hex()
+        return dynamic_bytes_word_encoder
     elif data_type == 'string':
-        return lambda value: id(value)
+        return lambda value: keccak(value.encode())
     else:
         return None
 
 
+def get_base_encoder(data_type: str) -> EncoderType | None:
+    """
+    Get the encoder for base types
+
+    Args:
+        data_type (str): Data type in string
+
+    Returns:
+        encoder (EncoderType): Encoder
+    """
+    encoder = get_base_word_encoder(data_type)
+    if encoder is None:
+        return None
+    return to_hex_encoder(encoder)
+
+
+def get_typed_data_digest(domain_separator: bytes, struct_hash: bytes) -> bytes:
+    """
+    Generate the EIP712 digest given the domain separator and
+    the hash of the message struct
+
+    Args:
+        domain_separator (bytes): Hash of encoded domain data
+        struct_hash (bytes): Hash of encoded message data
+
+    Returns:
+        digest (bytes): Hash of message
+    """
+    return keccak(b''.join((EIP712_PREFIX, domain_separator, struct_hash)))
+
+
+def get_types_fingerprint(types: dict) -> tuple:
+    """
+    Canonical and hashable representation of a types dictionary,
+    independent from the order of the struct names
+
+    Args:
+        types (dict): Dictionary of data types
+
+    Returns:
+        fingerprint (tuple): Hashable fingerprint of the types
+    """
+    return tuple(
+        sorted(
+            (name, tuple((field['name'], field['type']) for field in fields))
+            for name, fields in types.items()
+        )
+    )
+
+
+def get_domain_key(domain: dict) -> tuple:
+    """
+    Hashable representation of a domain dictionary. The verifying
+    contract is case insensitive since addresses are checksummed
+    when encoded
+
+    Args:
+        domain (dict): Domain values in dictionary
+
+    Returns:
+        key (tuple): Hashable key of the domain
+    """
+    return tuple(
+        sorted(
+            (name, value.lower() if name == 'verifyingContract' else value)
+            for name, value in domain.items()
+        )
+    )
+
+
 class TypedDataEncoder:
     """
     Object to encode typed data
@@ -138,6 +291,8 @@ class TypedDataEncoder:
     Attributes:
         types (dict): Instance of signer to generate signature
         _encoderCache (dict): Dictionary to cache encoder
+        _wordEncoderCache (dict): Dictionary to cache word encoder
+        _structWriterCache (dict): Dictionary to cache struct writer
         _types (dict): Dictionary to cache struct names
         links (dict): Dictionary to store links between structs
         parents (dict): Dictionary to store parent of structs
@@ -148,16 +303,20 @@ class TypedDataEncoder:
     def __init__(self, types: dict) -> None:
         self.types = types
         self._encoderCache: dict[str, EncoderType] = {}
+        self._wordEncoderCache: dict[str, WordEncoderType] = {}
+        self._structWriterCache: dict[str, tuple[int, StructWriterType]] = {}
         self._types = {}
         self.links: dict[str, dict[str, bool]] = {}
         self.parents: dict[str, list[str]] = {}
         self.subtypes: dict[str, dict[str, bool]] = {}
 
+        # Structs may reference types defined after them
         for name in types:
             self.links.setdefault(name, {})
             self.parents.setdefault(name, [])
             self.subtypes.setdefault(name, {})
 
+        for name in types:
             uniqueNames = {}
 
             for field in types[name]:
@@ -168,16 +327,19 @@ class TypedDataEncoder:
 
                 uniqueNames[fieldName] = True
 
-                baseType = re.sub(r'\[[^()]*\]', '', field['type'])
+                baseType = ARRAY_TYPE_RE.sub('', field['type'])
 
                 if baseType == name:
                     raise ValueError(f'Circular type reference: {baseType}')
 
-                encoder = get_base_encoder(baseType)
+                encoder = get_base_word_encoder(baseType)
 
                 if encoder:
                     continue
 
+                if baseType not in self.parents:
+                    raise ValueError(f'Unknown type {baseType}')
+
                 self.parents[baseType].append(name)
                 self.links[name][baseType] = True
 
@@ -197,7 +359,7 @@ class TypedDataEncoder:
             found[data_type] = True
 
             for child in self.links[data_type]:
-                if child not in self.parents:
+                if child in self.parents:
                     checkCircular(child, found)
 
                     for subtype in found:
@@ -213,60 +375,111 @@ class TypedDataEncoder:
                 [encode_type(t, types[t]) for t in st]
             )
 
-    def _get_encoder(self, data_type: str) -> EncoderType | None:
+    def _get_word_encoder(self, data_type: str) -> WordEncoderType | None:
         """
-        Get the encoder for a given type
+        Get the word encoder for a given type
 
         Args:
             data_type (str): Data type in string
 
         Returns:
-            encoder (EncoderType): Encoder
+            encoder (WordEncoderType): Word encoder
         """
-        if encoder := get_base_encoder(data_type):
+        if encoder := get_base_word_encoder(data_type):
             return encoder
 
-        match = re.findall(r'\[[^()]*\]', data_type)
-        if len(match) > 0:
+        if ARRAY_TYPE_RE.search(data_type):
             match = data_type[:-1].split('[')
             subtype = match[0]
-            subEncoder = self.get_encoder(subtype)
-            length = 0 if len(match) == 1 else int(match[1])
-            return cast(
-                EncoderType,
-                (
-                    lambda values: Web3.keccak(
-                        text=hex_concat(
-                            [Web3.keccak(text=subEncoder(value)) for value in values]
-                            if subtype in self._types
-                            else [subEncoder(value) for value in values]
-                        )
-                    ).hex()
-                    if length >= 0 and len(values) == length
-                    # TODO this is a return ValueError and not a raise,
-                    # it is expected? (Please note that exception can't
-                    # be directly raised from lambdas)
-                    else ValueError('Array length mismatched')
-                ),
-            )
+            subEncoder = self.get_word_encoder(subtype)
+            isStruct = subtype in self._types
+            # Dynamic arrays, e.g. uint256[], accept any length
+            length = int(match[1]) if match[1] else -1
 
-        fields = self.types[data_type]
-        if fields is not None:
-            encodedType = id(self._types[data_type])
-            return lambda value: hex_concat(
-                [encodedType]
-                + [
-                    self.get_encoder(field['type'])(value[field['name']])
-                    if field['type'] not in self._types
-                    else Web3.keccak(
-                        text=self.get_encoder(field['type'])(value[field['name']])
-                    ).hex()
-                    for field in fields
-                ]
-            )
+            def encode_array(values: list) -> bytes:
+                if length >= 0 and len(values) != length:
+                    raise ValueError('Array length mismatched')
+                return keccak(
+                    b''.join(
+                        keccak(subEncoder(value)) if isStruct else subEncoder(value)
+                        for value in values
+                    )
+                )
+
+            return encode_array
+
+        if self.types.get(data_type) is not None:
+            size, writeStruct = self.get_struct_writer(data_type)
+
+            def encode_struct(value: dict) -> bytes:
+                data = bytearray(size)
+                writeStruct(data, value)
+                return bytes(data)
+
+            return encode_struct
 
         return None
 
+    def get_struct_writer(self, name: str) -> tuple[int, StructWriterType]:
+        """
+        Get the function writing the encoded data of a struct
+        into a buffer and store it in cache. The same buffer can be
+        reused across values since every word is overwritten
+
+        Args:
+            name (str): Struct name
+
+        Returns:
+            size (int): Size of the buffer in bytes
+            writer (StructWriterType): Struct writer
+        """
+        if name in self._structWriterCache:
+            return self._structWriterCache[name]
+
+        typeHash = keccak(self._types[name].encode())
+        # Field encoders are resolved once, values are then
+        # encoded without further lookups
+        fieldEncoders = [
+            (field['name'], self.get_word_encoder(field['type']), field['type'] in self._types)
+            for field in self.types[name]
+        ]
+        size = WORD_SIZE * (len(fieldEncoders) + 1)
+
+        def write_struct(data: bytearray, value: dict) -> None:
+            # Every field is encoded in a word of 32 bytes
+            data[:WORD_SIZE] = typeHash
+            offset = WORD_SIZE
+            for fieldName, encoder, isStruct in fieldEncoders:
+                word = encoder(value[fieldName])
+                data[offset : offset + WORD_SIZE] = keccak(word) if isStruct else word
+                offset += WORD_SIZE
+
+        self._structWriterCache[name] = (size, write_struct)
+
+        return size, write_struct
+
+    def get_word_encoder(self, data_type: str) -> WordEncoderType:
+        """
+        Get the word encoder for a given type and store it in cache
+
+        Args:
+            data_type (str): Data type in string
+
+        Returns:
+            encoder (WordEncoderType): Word encoder
+        """
+        if data_type in self._wordEncoderCache:
+            return self._wordEncoderCache[data_type]
+
+        encoder = self._get_word_encoder(data_type)
+
+        if not encoder:
+            raise ValueError(f"Can't find an encoder function for {data_type} type")
+
+        self._wordEncoderCache[data_type] = encoder
+
+        return encoder
+
     def get_encoder(self, data_type: str) -> EncoderType:
         """
         Get the base encoder for a given type and store it in cache
@@ -280,10 +493,7 @@ class TypedDataEncoder:
         if data_type in self._encoderCache:
             return self._encoderCache[data_type]
 
-        encoder = self._get_encoder(data_type)
-
-        if not encoder:
-            raise ValueError(f"Can't find an encoder function for {data_type} type")
+        encoder = to_hex_encoder(self.get_word_encoder(data_type))
 
         self._encoderCache[data_type] = encoder
 
@@ -302,6 +512,19 @@ class TypedDataEncoder:
         """
         return self.get_encoder(data_type)(value)
 
+    def digest_struct(self, name: str, value: dict) -> bytes:
+        """
+        Generate the hash of encoded data given a type and value
+
+        Args:
+            name (str): Data type in string
+            value (dict): Values corresponding to the type
+
+        Returns:
+            hash (bytes): Hash of encoded data
+        """
+        return keccak(self.get_word_encoder(name)(value))
+
     def hash_struct(self, name: str, value: dict) -> str:
         """
         Generate the hash of encoded data given a type and value
@@ -313,7 +536,20 @@ class TypedDataEncoder:
         Returns:
             hash (str): Hash of encoded data
         """
-        return Web3.keccak(hexstr=self.encode_data(name, value)).hex()
+        return to_hex(self.digest_struct(name, value))
+
+    def digest(self, value: dict) -> bytes:
+        """
+        Generate the hash of encoded data for the primary type
+        of the given a value
+
+        Args:
+            value (dict): Values corresponding to the primary type
+
+        Returns:
+            hash (bytes): Hash of encoded data
+        """
+        return self.digest_struct(self.primaryType, value)
 
     def hash(self, value: dict) -> str:
         """
@@ -326,20 +562,24 @@ class TypedDataEncoder:
         Returns:
             hash (str): Hash of encoded data
         """
-        return self.hash_struct(self.primaryType, value)
+        return to_hex(self.digest(value))
 
     @staticmethod
     def _from(types: dict) -> 'TypedDataEncoder':
         """
-        Create a new instance of TypedDataEncoder for a given types
+        Return the TypedDataEncoder for a given types. Encoders are
+        compiled once and shared across the process through
+        ENCODER_CACHE, so the instance must not be modified
 
         Args:
             types (dict): Dictionary of data types
 
         Returns:
-            TypedDataEncoder (str): A new instance of TypedDataEncoder
+            TypedDataEncoder (str): Compiled TypedDataEncoder
         """
-        return TypedDataEncoder(types)
+        return ENCODER_CACHE.get_or_create(
+            get_types_fingerprint(types), lambda: TypedDataEncoder(deepcopy(types))
+        )
 
     @staticmethod
     def _hash_struct(name: str, types: dict, value: dict) -> str:
@@ -357,15 +597,31 @@ class TypedDataEncoder:
         return TypedDataEncoder._from(types).hash_struct(name, value)
 
     @staticmethod
-    def hash_domain(domain: dict) -> str:
+    def domain_separator(domain: dict) -> bytes:
         """
-        Encode the domain dictionary
+        Encode the domain dictionary. Separators are memoized in
+        DOMAIN_SEPARATORS since domains rarely change
 
         Args:
             domain (dict): Domain values in dictionary
 
         Returns:
-            hash (str): Hash of encoded domain data
+            hash (bytes): Hash of encoded domain data
+        """
+        return DOMAIN_SEPARATORS.get_or_create(
+            get_domain_key(domain), lambda: TypedDataEncoder._domain_separator(domain)
+        )
+
+    @staticmethod
+    def _domain_separator(domain: dict) -> bytes:
+        """
+        Encode the domain dictionary, bypassing DOMAIN_SEPARATORS
+
+        Args:
+            domain (dict): Domain values in dictionary
+
+        Returns:
+            hash (bytes): Hash of encoded domain data
         """
         domainFields = []
         for name in domain:
@@ -376,10 +632,46 @@ class TypedDataEncoder:
 
         domainFields.sort(key=lambda x: DOMAIN_FIELD_NAMES.index(x['name']))
 
-        return TypedDataEncoder._hash_struct(
-            'EIP712Domain', {'EIP712Domain': domainFields}, domain
+        return TypedDataEncoder._from({'EIP712Domain': domainFields}).digest_struct(
+            'EIP712Domain', domain
         )
 
+    @staticmethod
+    def hash_domain(domain: dict) -> str:
+        """
+        Encode the domain dictionary
+
+        Args:
+            domain (dict): Domain values in dictionary
+
+        Returns:
+            hash (str): Hash of encoded domain data
+        """
+        return to_hex(TypedDataEncoder.domain_separator(domain))
+
+    @staticmethod
+    def register_domain_separator(domain: dict, separator: str | bytes) -> None:
+        """
+        Store a known separator for the domain, e.g. the one
+        exposed by the verifying contract
+
+        Args:
+            domain (dict): Domain values in dictionary
+            separator (str | bytes): Hash of encoded domain data
+        """
+        for name in domain:
+            if name not in DOMAIN_FIELD_NAMES:
+                raise ValueError('Invalid domain key')
+
+        if isinstance(separator, str):
+            if not is_hex_string(separator, WORD_SIZE):
+                raise ValueError(f'Invalid domain separator: {separator}')
+            separator = bytes.fromhex(separator[2:])
+        elif len(separator) != WORD_SIZE:
+            raise ValueError(f'Invalid domain separator: {separator!r}')
+
+        DOMAIN_SEPARATORS.put(get_domain_key(domain), bytes(separator))
+
     @staticmethod
     def encode(domain: dict, types: dict, value: dict) -> str:
         """
@@ -393,12 +685,32 @@ class TypedDataEncoder:
         Returns:
             data (str): Encoded message
         """
-        return hex_concat(
-            [
-                '0x1901',
-                TypedDataEncoder.hash_domain(domain),
-                TypedDataEncoder._from(types).hash(value),
-            ]
+        return to_hex(
+            b''.join(
+                (
+                    EIP712_PREFIX,
+                    TypedDataEncoder.domain_separator(domain),
+                    TypedDataEncoder._from(types).digest(value),
+                )
+            )
+        )
+
+    @staticmethod
+    def _digest(domain: dict, types: dict, value: dict) -> bytes:
+        """
+        Generate a hash of a message following the EIP712 convention:
+        https://eips.ethereum.org/EIPS/eip-712
+
+        Args:
+            domain (dict): Domain values in dictionary
+            types (dict): Dictionary of data types
+            value (dict): Values corresponding to the types
+
+        Returns:
+            hash (bytes): Hash of message
+        """
+        return get_typed_data_digest(
+            TypedDataEncoder.domain_separator(domain), TypedDataEncoder._from(types).digest(value)
         )
 
     @staticmethod
@@ -415,4 +727,67 @@ class TypedDataEncoder:
         Returns:
             hash (str): Hash of message
         """
-        return Web3.keccak(hexstr=TypedDataEncoder.encode(domain, types, value)).hex()
+        return to_hex(TypedDataEncoder._digest(domain, types, value))
+
+    @staticmethod
+    def _iter_digests(domain: dict, types: dict, values: Iterable[Any]) -> Iterator[bytes]:
+        """
+        Generate the hashes of many messages sharing domain and types,
+        following the EIP712 convention. Type hash, domain separator
+        and buffers are shared across the values
+
+        Args:
+            domain (dict): Domain values in dictionary
+            types (dict): Dictionary of data types
+            values (Iterable): Values corresponding to the types,
+                               as dictionaries or dataclass instances
+
+        Returns:
+            hashes (Iterator[bytes]): Hashes of messages
+        """
+        encoder = TypedDataEncoder._from(types)
+        size, writeStruct = encoder.get_struct_writer(encoder.primaryType)
+
+        data = bytearray(size)
+        message = bytearray(EIP712_PREFIX + TypedDataEncoder.domain_separator(domain))
+        message.extend(bytes(WORD_SIZE))
+
+        for value in values:
+            # dataclasses are read through their attributes dictionary,
+            # avoiding the deep copy of dataclasses.asdict
+            writeStruct(data, value if isinstance(value, dict) else vars(value))
+            message[-WORD_SIZE:] = keccak(data)
+            yield keccak(message)
+
+    @staticmethod
+    def iter_hash_many(domain: dict, types: dict, values: Iterable[Any]) -> Iterator[str]:
+        """
+        Lazily generate the hashes of many messages, see hash_many
+
+        Args:
+            domain (dict): Domain values in dictionary
+            types (dict): Dictionary of data types
+            values (Iterable): Values corresponding to the types
+
+        Returns:
+            hashes (Iterator[str]): Hashes of messages
+        """
+        for digest in TypedDataEncoder._iter_digests(domain, types, values):
+            yield to_hex(digest)
+
+    @staticmethod
+    def hash_many(domain: dict, types: dict, values: Iterable[Any]) -> list[str]:
+        """
+        Generate the hashes of many messages sharing domain and types,
+        following the EIP712 convention
+
+        Args:
+            domain (dict): Domain values in dictionary
+            types (dict): Dictionary of data types
+            values (Iterable): Values corresponding to the types,
+                               as dictionaries or dataclass instances
+
+        Returns:
+            hashes (list[str]): Hashes of messages, in the same order
+        """
+        return list(TypedDataEncoder.iter_hash_many(domain, types, values))
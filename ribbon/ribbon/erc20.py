@@ -13,9 +13,9 @@ from typing import cast
 # Imports
 # ---------------------------------------------------------------------------
 from ribbon.contract import ContractConnection
-from ribbon.definitions import ContractConfig
 from ribbon.utils import get_address
 from sdk_commons.helpers import get_abi_path
+from sdk_commons.tokens import TokenMetadata, token_metadata
 
 
 # ---------------------------------------------------------------------------
@@ -31,12 +31,36 @@ class ERC20Contract(ContractConnection):
 
     abi_location = get_abi_path("ERC20")
 
-    def __init__(self, config: ContractConfig):
-        super().__init__(config)
-        self.name = self.contract.functions.name().call()
-        self.symbol = self.contract.functions.symbol().call()
+    def _fetch_metadata(self) -> TokenMetadata:
+        name, symbol, decimals = self.aggregate(
+            self.contract.functions.name(),
+            self.contract.functions.symbol(),
+            self.contract.functions.decimals(),
+        )
+        return TokenMetadata(name=name, symbol=symbol, decimals=decimals)
+
+    def _get_metadata(self) -> TokenMetadata:
+        """
+        Method to load name, symbol and decimals in a single request
+        on first access, shared by all contracts of the token through
+        sdk_commons.tokens.token_metadata
+        """
+        return token_metadata.get_or_create(
+            self.config.chain_id, self.address, self._fetch_metadata
+        )
+
+    @property
+    def name(self) -> str:
+        return self._get_metadata().name
+
+    @property
+    def symbol(self) -> str:
+        return self._get_metadata().symbol
+
+    @property
+    def decimals(self) -> float:
         # TODO: Which is the correct type here? int? Decimal? float?
-        self.decimals = cast(float, self.contract.functions.decimals().call())
+        return self._get_metadata().decimals
 
     def get_allowance(self, owner: str | None, spender: str) -> int:
         """
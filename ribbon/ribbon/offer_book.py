@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+# Created By: Paradigm
+# Created Date: 18/10/2026
+# version ='0.1.0'
+# ---------------------------------------------------------------------------
+""" Module to index the offers of a Swap contract from its events """
+# ---------------------------------------------------------------------------
+
+import json
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# ---------------------------------------------------------------------------
+# Imports
+# ---------------------------------------------------------------------------
+from web3 import Web3
+from web3.types import FilterParams, LogReceipt
+
+from ribbon.definitions import ContractConfig
+from ribbon.swap import SwapContract
+from ribbon.utils import get_address
+from sdk_commons.chains import Chains
+from sdk_commons.config import OfferDetails
+from sdk_commons.helpers import dump_json_atomic, get_abi_topics
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+# Events changing the live offers, by canonical signature
+OFFER_EVENTS = {
+    "NewOffer(uint256,address,address,address,uint256,uint256,uint256)": "NewOffer",
+    "Swap(uint256,uint256,address,uint256,uint256,address,uint256)": "Swap",
+    "SettleOffer(uint256)": "SettleOffer",
+    "Cancel(uint256,address)": "Cancel",
+}
+OFFER_TOPICS = {
+    Web3.to_hex(topic): OFFER_EVENTS[signature]
+    for signature, topic in get_abi_topics("Ribbon_Swap").items()
+    if signature in OFFER_EVENTS
+}
+
+# Maximum number of blocks requested by each eth_getLogs
+DEFAULT_BLOCK_RANGE = 2000
+# Blocks behind the latest one that are indexed, logs of more
+# recent blocks may still be removed by a reorganization
+DEFAULT_CONFIRMATIONS = 2
+DEFAULT_POLL_INTERVAL = 2.0
+# Seconds after the last successful sync the offer book is stale,
+# its lookups are then answered by the contract
+DEFAULT_MAX_SYNC_AGE = 30.0
+
+_offer_books: dict[tuple[Chains, str], "OfferBook"] = {}
+
+
+# ---------------------------------------------------------------------------
+# Helper Functions
+# ---------------------------------------------------------------------------
+def register_offer_book(offer_book: "OfferBook") -> None:
+    """
+    Answer get_offer_details of RibbonSDKConfig from the offer book
+
+    Args:
+        offer_book (OfferBook): Offer book of a Swap contract
+    """
+    _offer_books[(offer_book.chain, offer_book.address)] = offer_book
+
+
+def unregister_offer_book(chain: Chains, address: str) -> None:
+    """
+    Stop answering get_offer_details from the offer book
+
+    Args:
+        chain (Chains): Chain of the Swap contract
+        address (str): Address of the Swap contract
+    """
+    _offer_books.pop((chain, get_address(address)), None)
+
+
+def get_offer_book(chain: Chains, address: str) -> "OfferBook | None":
+    """
+    Return the registered offer book of a Swap contract
+
+    Args:
+        chain (Chains): Chain of the Swap contract
+        address (str): Address of the Swap contract
+
+    Returns:
+        offer_book (OfferBook): Offer book, None if not registered
+    """
+    return _offer_books.get((chain, get_address(address)))
+
+
+# ---------------------------------------------------------------------------
+# Offer Book
+# ---------------------------------------------------------------------------
+class OfferBook:
+    """
+    In-memory index of the live offers of a Swap contract, maintained
+    from its NewOffer, Swap, SettleOffer and Cancel logs. Offers are
+    added by NewOffer, their available size is reduced by the oToken
+    amount of each Swap and they are removed by SettleOffer. Used and
+    cancelled nonces of each signer wallet are tracked as well.
+
+    Args:
+        config (ContractConfig): Configuration of the Swap contract
+        from_block (int): First block to index, e.g. the block
+                          the Swap contract was deployed at
+        checkpoint_path (str): JSON file to save the indexed state to,
+                               loaded on creation when it exists
+        confirmations (int): Blocks behind the latest one to index
+        block_range (int): Maximum blocks requested by eth_getLogs
+        max_sync_age (float): Seconds after the last successful sync
+                              the offer book is stale
+
+    Attributes:
+        block (int): Last indexed block
+        synced_at (float): time.monotonic() of the last successful
+                           sync, None before the first one
+        last_error (Exception): Error of the last background sync,
+                                None if it succeeded
+    """
+
+    def __init__(
+        self,
+        config: ContractConfig,
+        from_block: int = 0,
+        checkpoint_path: str | Path | None = None,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        block_range: int = DEFAULT_BLOCK_RANGE,
+        max_sync_age: float = DEFAULT_MAX_SYNC_AGE,
+    ):
+        self.swap_contract = SwapContract(config)
+        self.chain = config.chain_id
+        self.address = self.swap_contract.address
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.confirmations = confirmations
+        self.block_range = block_range
+        self.max_sync_age = max_sync_age
+
+        # Last indexed block
+        self.block = from_block - 1
+        self.synced_at: float | None = None
+        self.last_error: Exception | None = None
+        self._offers: dict[int, OfferDetails] = {}
+        self._used_nonces: dict[str, set[int]] = {}
+        self._cancelled_nonces: dict[str, set[int]] = {}
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.load_checkpoint()
+
+    # -----------------------------------------------------------------------
+    # Indexing
+    # -----------------------------------------------------------------------
+    def apply_logs(self, logs: Iterable[LogReceipt]) -> int:
+        """
+        Method to update the offers from logs of the Swap contract,
+        in the order they have been emitted
+
+        Args:
+            logs (list): Logs emitted by the Swap contract
+
+        Returns:
+            applied (int): Number of logs changing the offer book
+        """
+        logs = list(logs)
+        applied = 0
+        events = self.swap_contract.contract.events
+        with self._lock:
+            for log in logs:
+                if not log["topics"] or get_address(log["address"]) != self.address:
+                    continue
+                event_name = OFFER_TOPICS.get(Web3.to_hex(log["topics"][0]))
+                if event_name is None:
+                    continue
+
+                args = getattr(events, event_name)().process_log(log)["args"]
+                if event_name == "NewOffer":
+                    self._offers[args["swapId"]] = {
+                        "seller": args["seller"],
+                        "oToken": args["oToken"],
+                        "biddingToken": args["biddingToken"],
+                        "minPrice": args["minPrice"],
+                        "minBidSize": args["minBidSize"],
+                        "totalSize": args["totalSize"],
+                        "availableSize": args["totalSize"],
+                    }
+                elif event_name == "Swap":
+                    # sellerAmount is the oToken amount bought
+                    offer = self._offers.get(args["swapId"])
+                    if offer is not None:
+                        offer["availableSize"] -= args["sellerAmount"]
+                    self._used_nonces.setdefault(args["signerWallet"], set()).add(args["nonce"])
+                elif event_name == "SettleOffer":
+                    self._offers.pop(args["swapId"], None)
+                else:
+                    self._cancelled_nonces.setdefault(args["signerWallet"], set()).add(
+                        args["nonce"]
+                    )
+                applied += 1
+
+        # Keep the offer details cache consistent with the offer book
+        self.swap_contract.invalidate_offer_details(logs)
+
+        return applied
+
+    def sync(self, to_block: int | None = None) -> int:
+        """
+        Method to index the logs emitted since the last indexed block
+
+        Args:
+            to_block (int) (optional): Last block to index, defaults to
+                                       the latest confirmed block
+
+        Returns:
+            applied (int): Number of logs changing the offer book
+        """
+        if to_block is None:
+            to_block = self.swap_contract.w3.eth.block_number - self.confirmations
+
+        applied = 0
+        start_block = self.block
+        while True:
+            with self._lock:
+                from_block = self.block + 1
+            if from_block > to_block:
+                break
+
+            end_block = min(from_block + self.block_range - 1, to_block)
+            logs = self.swap_contract.w3.eth.get_logs(
+                FilterParams(
+                    address=self.address,
+                    fromBlock=from_block,
+                    toBlock=end_block,
+                    topics=[list(OFFER_TOPICS)],
+                )
+            )
+            with self._lock:
+                # Logs are not applied twice when a concurrent sync,
+                # e.g. the background one, indexed these blocks
+                if self.block != from_block - 1:
+                    continue
+                applied += self.apply_logs(logs)
+                self.block = end_block
+
+        if self.block != start_block and self.checkpoint_path is not None:
+            self.save_checkpoint()
+
+        self.synced_at = time.monotonic()
+        return applied
+
+    def start(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """
+        Method to sync the offer book in a background thread
+
+        Args:
+            poll_interval (float): Seconds between two syncs
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(poll_interval,), name="ribbon-offer-book", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Method to stop the background thread started by start()
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, poll_interval: float) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+                self.last_error = None
+            except Exception as e:
+                # Retried on the next poll, lookups fall back to the
+                # contract once the offer book is stale
+                self.last_error = e
+            self._stop_event.wait(poll_interval)
+
+    # -----------------------------------------------------------------------
+    # Lookups
+    # -----------------------------------------------------------------------
+    @property
+    def is_stale(self) -> bool:
+        """
+        Whether the last successful sync is older than max_sync_age
+        """
+        synced_at = self.synced_at
+        return synced_at is None or time.monotonic() - synced_at > self.max_sync_age
+
+    @property
+    def offers(self) -> dict[int, OfferDetails]:
+        """
+        Live offers by offer ID
+        """
+        with self._lock:
+            return {offer_id: offer.copy() for offer_id, offer in self._offers.items()}
+
+    def get_offer_details(self, offer_id: int) -> OfferDetails:
+        """
+        Method to get the details of a live offer
+
+        Args:
+            offer_id (int): Offer ID
+
+        Raises:
+            ValueError: The offer does not exist or has been settled
+
+        Returns:
+            details (dict): Offer details
+        """
+        with self._lock:
+            offer = self._offers.get(offer_id)
+            if offer is None:
+                raise ValueError(f'Offer does not exist: {offer_id}')
+            return offer.copy()
+
+    def find_offer_details(
+        self, offer_id: int, block_number: int | None = None
+    ) -> OfferDetails | None:
+        """
+        Method to get the details of a live offer, if known by an
+        up-to-date offer book. Offers created after the last indexed
+        block are not known yet
+
+        Args:
+            offer_id (int): Offer ID
+            block_number (int) (optional): Block the details have to be
+                                           current at, e.g. the latest
+
+        Returns:
+            details (dict): Offer details, None when missing, stale or
+                            not indexed up to block_number
+        """
+        if self.is_stale:
+            return None
+        with self._lock:
+            if block_number is not None and self.block < block_number:
+                return None
+            offer = self._offers.get(offer_id)
+            return offer.copy() if offer is not None else None
+
+    def is_nonce_available(self, signer_wallet: str, nonce: int) -> bool:
+        """
+        Method to check if a bid nonce has neither been used
+        nor cancelled by the signer wallet
+
+        Args:
+            signer_wallet (str): Address of the signer wallet
+            nonce (int): Bid nonce
+
+        Returns:
+            available (bool): True if the nonce can be used
+        """
+        signer_wallet = get_address(signer_wallet)
+        with self._lock:
+            return nonce not in self._used_nonces.get(
+                signer_wallet, ()
+            ) and nonce not in self._cancelled_nonces.get(signer_wallet, ())
+
+    # -----------------------------------------------------------------------
+    # Checkpoints
+    # -----------------------------------------------------------------------
+    def save_checkpoint(self, path: str | Path | None = None) -> None:
+        """
+        Method to save the indexed state, to resume from it later
+
+        Args:
+            path (str) (optional): JSON file, defaults to
+                                  checkpoint_path
+        """
+        path = Path(path) if path else self.checkpoint_path
+        if path is None:
+            raise ValueError("Missing checkpoint path")
+
+        with self._lock:
+            data: dict[str, Any] = {
+                "chainId": self.chain.value,
+                "address": self.address,
+                "block": self.block,
+                "offers": {str(offer_id): offer for offer_id, offer in self._offers.items()},
+                "usedNonces": {k: sorted(v) for k, v in self._used_nonces.items()},
+                "cancelledNonces": {k: sorted(v) for k, v in self._cancelled_nonces.items()},
+            }
+            dump_json_atomic(path, data)
+
+    def load_checkpoint(self, path: str | Path | None = None) -> None:
+        """
+        Method to resume from a saved state
+
+        Args:
+            path (str) (optional): JSON file, defaults to
+                                  checkpoint_path
+
+        Raises:
+            ValueError: The checkpoint belongs to another Swap contract
+        """
+        path = Path(path) if path else self.checkpoint_path
+        if path is None:
+            raise ValueError("Missing checkpoint path")
+
+        with open(path) as f:
+            data = json.load(f)
+
+        if data["chainId"] != self.chain.value or get_address(data["address"]) != self.address:
+            raise ValueError(f'Checkpoint of another Swap contract: {path}')
+
+        with self._lock:
+            self.block = data["block"]
+            self._offers = {int(offer_id): offer for offer_id, offer in data["offers"].items()}
+            self._used_nonces = {k: set(v) for k, v in data["usedNonces"].items()}
+            self._cancelled_nonces = {k: set(v) for k, v in data["cancelledNonces"].items()}
@@ -15,6 +15,29 @@ from sdk_commons.config import OfferTokenDetails
 from sdk_commons.helpers import get_abi_path
 
 
+# ---------------------------------------------------------------------------
+# Helper Functions
+# ---------------------------------------------------------------------------
+def parse_otoken_details(details: list) -> OfferTokenDetails:
+    """
+    Convert the getOtokenDetails response of the oToken contract
+
+    Args:
+        details (list): getOtokenDetails response
+
+    Returns:
+        response (dict): Dictionary oToken details
+    """
+    return {
+        "collateralAsset": details[0],
+        "underlyingAsset": details[1],
+        "strikeAsset": details[2],
+        "strikePrice": details[3],
+        "expiryTimestamp": details[4],
+        "isPut": details[5],
+    }
+
+
 # ---------------------------------------------------------------------------
 # oToken Contract
 # ---------------------------------------------------------------------------
@@ -39,11 +62,4 @@ class oTokenContract(ERC20Contract):
         """
         details = self.contract.functions.getOtokenDetails().call()
 
-        return {
-            "collateralAsset": details[0],
-            "underlyingAsset": details[1],
-            "strikeAsset": details[2],
-            "strikePrice": details[3],
-            "expiryTimestamp": details[4],
-            "isPut": details[5],
-        }
+        return parse_otoken_details(details)
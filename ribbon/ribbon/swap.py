@@ -7,20 +7,32 @@
 """ Module to call Swap contract """
 # ---------------------------------------------------------------------------
 
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import asdict
 from shutil import ExecError
 from typing import cast
 
+from hexbytes import HexBytes
 from web3 import Web3
-from web3.types import TxParams
+from web3.contract import Contract
+from web3.types import BlockIdentifier, LogReceipt, TxParams, TxReceipt
 
 from ribbon.contract import ContractConnection
-from ribbon.definitions import Offer, SignedBid
-from ribbon.encode import ADDRESS_ZERO
+from ribbon.definitions import Domain, Offer, SignedBid
+from ribbon.encode import ADDRESS_ZERO, TypedDataEncoder
 from ribbon.utils import get_address
-from ribbon.wallet import Wallet
+from ribbon.wallet import Wallet, get_bid_digest
+from sdk_commons.cache import LRUCache
 from sdk_commons.chains import Chains
 from sdk_commons.config import BidValidation, OfferDetails
+from sdk_commons.fees import get_fee_params
+from sdk_commons.gas import get_gas_limit
+from sdk_commons.helpers import get_abi_topics
+from sdk_commons.nonces import nonce_manager
+from sdk_commons.offers import offer_details_cache
+from sdk_commons.receipts import PendingTransaction, chain_future, track_transaction
+from sdk_commons.signing import recover_signer
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -46,8 +58,230 @@ DETAILED_ERROR_MESSAGES = {
     ),
 }
 
+# Gas limit of createOffer when it can't be estimated
 GAS_LIMIT = 200000
 
+DOMAIN_NAME = "RIBBON SWAP"
+DOMAIN_VERSION = "1"
+
+# Events changing the details of an offer, swapId is
+# indexed in Swap and part of the data in SettleOffer
+SWAP_TOPIC = get_abi_topics("Ribbon_Swap")[
+    "Swap(uint256,uint256,address,uint256,uint256,address,uint256)"
+]
+SETTLE_OFFER_TOPIC = get_abi_topics("Ribbon_Swap")["SettleOffer(uint256)"]
+
+# Seconds an authorized delegate is reused by the bid precheck, a
+# newly authorized delegate may be rejected locally until then
+DELEGATE_CACHE_TTL = 60.0
+DELEGATE_CACHE_SIZE = 1024
+# Delegates by chain, Swap contract and signer wallet,
+# with the time they expire at
+_delegates: LRUCache[tuple[Chains, str, str], tuple[str, float]] = LRUCache(
+    maxsize=DELEGATE_CACHE_SIZE
+)
+
+
+# ---------------------------------------------------------------------------
+# Helper Functions
+# ---------------------------------------------------------------------------
+def get_swap_domain(chain: Chains, address: str) -> Domain:
+    """
+    Domain used to sign bids for a Swap contract
+
+    Args:
+        chain (Chains): Chain of the Swap contract
+        address (str): Address of the Swap contract
+
+    Returns:
+        domain (Domain): Signing domain
+    """
+    return Domain(
+        name=DOMAIN_NAME,
+        version=DOMAIN_VERSION,
+        chainId=chain.value,
+        verifyingContract=address,
+    )
+
+
+def parse_offer_details(offer_id: int, details: list) -> OfferDetails:
+    """
+    Convert the swapOffers response of the Swap contract
+
+    Args:
+        offer_id (int): Offer ID
+        details (list): swapOffers response
+
+    Raises:
+        ValueError: The argument is not a valid offer
+
+    Returns:
+        details (dict): Offer details
+    """
+    seller = details[0]
+
+    if seller == ADDRESS_ZERO:
+        raise ValueError(f'Offer does not exist: {offer_id}')
+
+    return {
+        'seller': details[0],
+        'oToken': details[1],
+        'biddingToken': details[3],
+        'minPrice': details[2],
+        'minBidSize': details[4],
+        'totalSize': details[5],
+        'availableSize': details[6],
+    }
+
+
+def get_offer_ids_from_logs(logs: Iterable[LogReceipt]) -> set[int]:
+    """
+    Extract the IDs of the offers changed by Swap and SettleOffer logs
+
+    Args:
+        logs (list): Logs emitted by the Swap contract
+
+    Returns:
+        offer_ids (set): IDs of the changed offers
+    """
+    offer_ids = set()
+    for log in logs:
+        topics = log["topics"]
+        if not topics:
+            continue
+        if topics[0] == SWAP_TOPIC and len(topics) > 1:
+            offer_ids.add(int.from_bytes(topics[1], "big"))
+        elif topics[0] == SETTLE_OFFER_TOPIC:
+            offer_ids.add(int.from_bytes(HexBytes(log["data"])[:32], "big"))
+    return offer_ids
+
+
+def normalize_signed_bid(bid: SignedBid) -> SignedBid:
+    """
+    Validate a signed bid and normalize it in place as expected
+    by the Swap contract: checksum addresses and v of 27 or 28
+
+    Args:
+        bid (dict): Bid dictionary containing swapId, nonce,
+                    signerWallet, sellAmount, buyAmount,
+                    referrer, v, r, and s
+
+    Raises:
+        TypeError: Bid argument is not an instance of SignedBid
+
+    Returns:
+        bid (SignedBid): The normalized bid
+    """
+    if not isinstance(bid, SignedBid):
+        raise TypeError("Invalid signed bid")
+
+    if bid.v is None:
+        raise TypeError("Invalid signed bid, missing v")
+
+    bid.signerWallet = get_address(bid.signerWallet)
+    bid.referrer = get_address(bid.referrer)
+    bid.v = bid.v + (bid.v < 27) * 27
+
+    return bid
+
+
+def get_authorized_delegate(contract: Contract, chain: Chains, signer_wallet: str) -> str:
+    """
+    Function to get the delegate authorized by a signer wallet,
+    cached for DELEGATE_CACHE_TTL seconds
+
+    Args:
+        contract (Contract): Swap contract
+        chain (Chains): Chain of the Swap contract
+        signer_wallet (str): Address of the signer wallet
+
+    Returns:
+        delegate (str): Delegate address, zero address if none
+    """
+    key = (chain, get_address(contract.address), get_address(signer_wallet))
+    entry = _delegates.get(key)
+    if entry is not None and entry[1] >= time.monotonic():
+        return entry[0]
+
+    delegate = get_address(contract.functions.authorized(key[2]).call())
+    _delegates.put(key, (delegate, time.monotonic() + DELEGATE_CACHE_TTL))
+    return delegate
+
+
+def precheck_signed_bid(
+    domain: Domain,
+    bid: SignedBid,
+    allow_delegates: bool = True,
+    get_delegate: Callable[[str], str] | None = None,
+) -> BidValidation | None:
+    """
+    Validate the signature of a normalized bid locally, recovering
+    the signatory as done by the Swap contract check
+
+    Args:
+        domain (Domain): Domain of the Swap contract
+        bid (dict): Bid dictionary containing swapId, nonce,
+                    signerWallet, sellAmount, buyAmount,
+                    referrer, v, r, and s
+        allow_delegates (bool): Whether a signatory different from
+                                signerWallet may be its authorized
+                                delegate
+        get_delegate (Callable) (optional): Function returning the
+                                            delegate of a signer
+                                            wallet. Without it, any
+                                            other signatory is left
+                                            to the on-chain check
+
+    Returns:
+        response (dict): Dictionary containing the signature error,
+          None if the bid has to be checked on-chain
+    """
+    try:
+        r = int(cast(str, bid.r), 16)
+        s = int(cast(str, bid.s), 16)
+    except (TypeError, ValueError):
+        r = s = 0
+
+    domain_dict = {k: v for k, v in asdict(domain).items() if v is not None}
+    signatory = recover_signer(get_bid_digest(domain_dict, asdict(bid)), cast(int, bid.v), r, s)
+
+    if signatory is None:
+        error = "SIGNATURE_INVALID"
+    elif signatory == bid.signerWallet:
+        return None
+    elif not allow_delegates:
+        error = "UNAUTHORIZED"
+    elif get_delegate is None or get_delegate(bid.signerWallet) == signatory:
+        return None
+    else:
+        error = "UNAUTHORIZED"
+
+    return {"errors": 1, "messages": [DETAILED_ERROR_MESSAGES[error]]}
+
+
+def parse_check_response(response: list) -> BidValidation:
+    """
+    Convert the check response of the Swap contract
+
+    Args:
+        response (list): Number of errors and error codes
+
+    Returns:
+        response (dict): Dictionary containing number of errors
+          and the corresponding error messages
+    """
+    errors = response[0]
+    if errors == 0:
+        return {"errors": 0}
+    else:
+        return {
+            "errors": errors,
+            "messages": [
+                DETAILED_ERROR_MESSAGES[Web3.to_text(msg).replace("\x00", "")]
+                for msg in response[1][:errors]
+            ],
+        }
+
 
 # ---------------------------------------------------------------------------
 # Swap Contract
@@ -60,6 +294,54 @@ class SwapContract(ContractConnection):
         config (ContractConfig): Configuration to setup the Contract
     """
 
+    @property
+    def domain(self) -> Domain:
+        """
+        Domain used to sign bids for this Swap contract
+        """
+        return get_swap_domain(self.config.chain_id, self.address)
+
+    def get_domain_separator(self) -> str:
+        """
+        Method to get the EIP712 domain separator from the contract
+
+        Returns:
+            separator (str): Domain separator in hex format
+        """
+        separator = self.contract.functions.DOMAIN_SEPARATOR().call()
+
+        return Web3.to_hex(separator)
+
+    def prewarm_domain_separator(self, domain: Domain | None = None) -> str:
+        """
+        Method to store the on-chain domain separator, so that
+        signing bids for this contract only hashes the bid itself
+
+        Args:
+            domain (Domain): Domain used to sign bids,
+                             defaults to the Swap contract domain
+
+        Raises:
+            ValueError: Domain does not belong to this contract
+
+        Returns:
+            separator (str): Domain separator in hex format
+        """
+        if domain is None:
+            domain = self.domain
+
+        if (
+            get_address(domain.verifyingContract) != self.address
+            or domain.chainId != self.config.chain_id.value
+        ):
+            raise ValueError("Domain does not match the Swap contract")
+
+        separator = self.get_domain_separator()
+        domain_dict = {k: v for k, v in asdict(domain).items() if v is not None}
+        TypedDataEncoder.register_domain_separator(domain_dict, separator)
+
+        return separator
+
     def get_offer_details(self, offer_id: int) -> OfferDetails:
         """
         Method to get bid details
@@ -73,23 +355,91 @@ class SwapContract(ContractConnection):
         Returns:
             details (dict): Offer details
         """
-        details = self.contract.functions.swapOffers(offer_id).call()
-        seller = details[0]
+        return offer_details_cache.get_or_fetch(
+            self.config.rpc_uri,
+            self.config.chain_id,
+            self.address,
+            offer_id,
+            lambda block_number: self.fetch_offer_details(offer_id, block_number),
+        )
 
-        if seller == ADDRESS_ZERO:
-            raise ValueError(f'Offer does not exist: {offer_id}')
+    def fetch_offer_details(
+        self, offer_id: int, block_number: BlockIdentifier | None = None
+    ) -> OfferDetails:
+        """
+        Method to get bid details from the contract, bypassing the
+        offer details cache
 
-        return {
-            'seller': details[0],
-            'oToken': details[1],
-            'biddingToken': details[3],
-            'minPrice': details[2],
-            'minBidSize': details[4],
-            'totalSize': details[5],
-            'availableSize': details[6],
-        }
+        Args:
+            offer_id (int): Offer ID
+            block_number (int) (optional): Block to read the offer at,
+                                           defaults to the latest one
+
+        Raises:
+            ValueError: The argument is not a valid offer
+
+        Returns:
+            details (dict): Offer details
+        """
+        details = self.contract.functions.swapOffers(offer_id).call(
+            block_identifier="latest" if block_number is None else block_number
+        )
+
+        return parse_offer_details(offer_id, details)
+
+    def invalidate_offer_details(self, logs: Iterable[LogReceipt]) -> int:
+        """
+        Method to remove from the offer details cache the offers
+        changed by Swap and SettleOffer logs of this contract
+
+        Args:
+            logs (list): Logs emitted by the Swap contract
+
+        Returns:
+            removed (int): Number of offers removed from the cache
+        """
+        logs = [log for log in logs if get_address(log["address"]) == self.address]
+
+        return sum(
+            offer_details_cache.invalidate(self.config.chain_id, self.address, offer_id)
+            for offer_id in get_offer_ids_from_logs(logs)
+        )
+
+    def precheck_bid(self, bid: SignedBid, allow_delegates: bool = True) -> BidValidation | None:
+        """
+        Method to validate the bid signature locally, recovering the
+        signatory as done by the Swap contract check
+
+        Args:
+            bid (dict): Bid dictionary containing swapId, nonce,
+                        signerWallet, sellAmount, buyAmount,
+                        referrer, v, r, and s
+            allow_delegates (bool): Whether a signatory different from
+                                    signerWallet may be its authorized
+                                    delegate, see get_delegate
+
+        Returns:
+            response (dict): Dictionary containing the signature error,
+              None if the bid has to be checked on-chain
+        """
+        return precheck_signed_bid(self.domain, bid, allow_delegates, self.get_delegate)
+
+    def get_delegate(self, signer_wallet: str) -> str:
+        """
+        Method to get the delegate authorized by a signer wallet,
+        cached for DELEGATE_CACHE_TTL seconds
+
+        Args:
+            signer_wallet (str): Address of the signer wallet
 
-    def validate_bid(self, bid: SignedBid) -> BidValidation:
+        Returns:
+            delegate (str): Delegate address, zero address if none
+        """
+        return get_authorized_delegate(self.contract, self.config.chain_id, signer_wallet)
+
+    def validate_bid(
+        self, bid: SignedBid, precheck: bool = False, allow_delegates: bool = True
+    ) -> BidValidation:
         """
         Method to validate bid
 
@@ -97,6 +447,11 @@ class SwapContract(ContractConnection):
             bid (dict): Bid dictionary containing swapId, nonce,
                         signerWallet, sellAmount, buyAmount,
                         referrer, v, r, and s
+            precheck (bool): Validate the signature locally first,
+                             skipping the contract call when invalid
+            allow_delegates (bool): Whether the bid may be signed by
+                                    an authorized delegate, see
+                                    precheck_bid
 
         Raises:
             TypeError: Bid argument is not an instance of SignedBid
@@ -105,29 +460,16 @@ class SwapContract(ContractConnection):
             response (dict): Dictionary containing number of errors
               and the corresponding error messages
         """
-        if not isinstance(bid, SignedBid):
-            raise TypeError("Invalid signed bid")
+        normalize_signed_bid(bid)
 
-        if bid.v is None:
-            raise TypeError("Invalid signed bid, missing v")
-
-        bid.signerWallet = get_address(bid.signerWallet)
-        bid.referrer = get_address(bid.referrer)
-        bid.v = bid.v + (bid.v < 27) * 27
+        if precheck:
+            result = self.precheck_bid(bid, allow_delegates)
+            if result is not None:
+                return result
 
         response = self.contract.functions.check(asdict(bid)).call()
 
-        errors = response[0]
-        if errors == 0:
-            return {"errors": 0}
-        else:
-            return {
-                "errors": errors,
-                "messages": [
-                    DETAILED_ERROR_MESSAGES[Web3.to_text(msg).replace("\x00", "")]
-                    for msg in response[1][:errors]
-                ],
-            }
+        return parse_check_response(response)
 
     def validate_authority(self, wallet: Wallet, authority_address: str) -> bool:
         """
@@ -143,9 +485,10 @@ class SwapContract(ContractConnection):
         authorized = cast(str, self.contract.functions.authorized(wallet.public_key).call())
         return authorized == authority_address
 
-    def create_offer(self, offer: Offer, wallet: Wallet) -> str:
+    def submit_offer(self, offer: Offer, wallet: Wallet) -> PendingTransaction[str]:
         """
-        Method to create offer
+        Method to create offer without waiting for the transaction,
+        whose receipt is tracked by the shared receipt poller
 
         Args:
             offer (dict): Offer dictionary containing necessary
@@ -154,10 +497,11 @@ class SwapContract(ContractConnection):
 
         Raises:
             TypeError: Offer argument is not an Offer class instance
-            ExecError: Transaction reverted
 
         Returns:
-            offerId (int): OfferId of the created order
+            pending (PendingTransaction): Transaction hash and future
+              resolved with the offerId of the created order, or
+              failing with ExecError when the transaction reverts
         """
         if not isinstance(offer, Offer):
             raise TypeError("Invalid offer")
@@ -165,31 +509,76 @@ class SwapContract(ContractConnection):
         offer.oToken = get_address(offer.oToken)
         offer.biddingToken = get_address(offer.biddingToken)
 
-        nonce = self.w3.eth.get_transaction_count(
-            self.w3.to_checksum_address(cast(str, wallet.public_key))
+        function = self.contract.functions.createOffer(*list(asdict(offer).values()))
+        # Estimated once per contract and refreshed periodically,
+        # GAS_LIMIT is used when the estimate fails
+        gas_limit = get_gas_limit(
+            self.config.chain_id,
+            function,
+            {"from": cast(str, wallet.public_key)},
+            fallback=GAS_LIMIT,
         )
-        tx_params: TxParams = {}
-        if self.config.chain_id in [Chains.BSC, Chains.BSC_TESTNET]:
-            # BSC transactions require the gasPrice parameter
-            tx_params = {
+
+        # Nonces are assigned locally, concurrent offers from the same
+        # wallet don't collide
+        with nonce_manager.reserve(
+            self.config.rpc_uri, self.config.chain_id, cast(str, wallet.public_key)
+        ) as nonce:
+            # BSC transactions require the gasPrice parameter, the fee
+            # oracle returns it instead of the EIP-1559 fees there
+            tx_params: TxParams = {
                 "nonce": nonce,
-                "gas": GAS_LIMIT,
-                'gasPrice': self.w3.eth.gas_price,
+                "gas": gas_limit,
+                **get_fee_params(self.config.rpc_uri, self.config.chain_id),
             }
-        else:
-            tx_params = {"nonce": nonce, "gas": GAS_LIMIT}
-        tx = self.contract.functions.createOffer(*list(asdict(offer).values())).build_transaction(
-            tx_params
+            tx = function.build_transaction(tx_params)
+
+            signed_tx = self.w3.eth.account.sign_transaction(tx, private_key=wallet.private_key)
+
+            self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+
+        receipt = track_transaction(self.config.rpc_uri, self.config.chain_id, signed_tx.hash)
+        nonce_manager.resync_on_timeout(
+            receipt, self.config.chain_id, cast(str, wallet.public_key)
         )
 
-        signed_tx = self.w3.eth.account.sign_transaction(tx, private_key=wallet.private_key)
+        return PendingTransaction(signed_tx.hash, chain_future(receipt, self.get_new_offer_id))
+
+    def create_offer(self, offer: Offer, wallet: Wallet) -> str:
+        """
+        Method to create offer
+
+        Args:
+            offer (dict): Offer dictionary containing necessary
+                          parameters to create a new offer
+            wallet (Wallet): Wallet class instance
+
+        Raises:
+            TypeError: Offer argument is not an Offer class instance
+            ExecError: Transaction reverted
+            TimeExhausted: Transaction not included within the receipt
+                           timeout
 
-        self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        Returns:
+            offerId (int): OfferId of the created order
+        """
+        return self.submit_offer(offer, wallet).result()
 
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(signed_tx.hash, timeout=600)
+    def get_new_offer_id(self, tx_receipt: TxReceipt) -> str:
+        """
+        Method to get the offerId from the receipt of createOffer
+
+        Args:
+            tx_receipt (dict): Receipt of the createOffer transaction
 
+        Raises:
+            ExecError: Transaction reverted
+
+        Returns:
+            offerId (int): OfferId of the created order
+        """
         if tx_receipt["status"] == 0:
-            raise ExecError(f'Transaction reverted: {signed_tx.hash.hex()}')
+            raise ExecError(f'Transaction reverted: {tx_receipt["transactionHash"].hex()}')
 
         return cast(
             str, self.contract.events.NewOffer().process_receipt(tx_receipt)[0]["args"]["swapId"]
@@ -20,6 +20,10 @@ from web3 import Web3
 # Constants
 # ---------------------------------------------------------------------------
 PADDING = bytearray([0] * 32)
+WORD_SIZE = 32
+ADDRESS_SIZE = 20
+
+HEX_STRING_RE = re.compile('^0x[0-9A-Fa-f]*$')
 
 
 # ---------------------------------------------------------------------------
@@ -83,7 +87,7 @@ def is_hex_string(value: str, length: int | None = None) -> bool:
         isHex (bool): Boolean whether the given value is
           hex of a given length
     """
-    if not isinstance(value, str) or not re.match('^0x[0-9A-Fa-f]*$', value):
+    if not isinstance(value, str) or not HEX_STRING_RE.match(value):
         return False
     if length and len(value) != (2 + 2 * length):
         return False
@@ -106,10 +110,7 @@ def hex_zero_pad(value: str, length: int) -> str:
     elif len(value) > 2 * length + 2:
         raise ValueError(f'Value out of range: {value}, {length}')
 
-    while len(value) < 2 * length + 2:
-        value = '0x0' + value[2:]
-
-    return value
+    return '0x' + value[2:].rjust(2 * length, '0')
 
 
 def hex_pad_right(value: str) -> str:
@@ -141,3 +142,71 @@ def encode_type(name: str, fields: list) -> str:
     """
     joined_fields = ','.join([i['type'] + ' ' + i['name'] for i in fields])
     return f'{name}({joined_fields})'
+
+
+def to_hex(data: bytes) -> str:
+    """
+    Convert bytes to a hex string with 0x prefix
+
+    Args:
+        data (bytes): Bytes to convert
+
+    Returns:
+        hex (str): Hex string
+    """
+    return '0x' + bytes.hex(data)
+
+
+def int_to_word(value: int, signed: bool = False) -> bytes:
+    """
+    Encode an integer as a big endian word of 32 bytes
+
+    Args:
+        value (int): Integer to encode
+        signed (bool) (optional): Use two's complement for negatives
+
+    Returns:
+        word (bytes): Encoded integer
+    """
+    try:
+        return int(value).to_bytes(WORD_SIZE, 'big', signed=signed)
+    except OverflowError:
+        raise ValueError(f'Value out of range: {value}')
+
+
+def address_to_bytes(address: str | None) -> bytes:
+    """
+    Validate an address and return its 20 bytes,
+    without computing the checksum address
+
+    Args:
+        address (str): Address in hex format
+
+    Returns:
+        address (bytes): Address bytes
+    """
+    if not isinstance(address, str):
+        raise ValueError(f'Invalid address: {address}')
+
+    try:
+        data = bytes.fromhex(address[2:] if address[:2] in ('0x', '0X') else address)
+    except ValueError:
+        raise ValueError(f'Invalid address: {address}')
+
+    if len(data) != ADDRESS_SIZE:
+        raise ValueError(f'Invalid address: {address}')
+
+    return data
+
+
+def address_to_word(address: str | None) -> bytes:
+    """
+    Encode an address as a word of 32 bytes, zero padded on the left
+
+    Args:
+        address (str): Address with 0x prefix
+
+    Returns:
+        word (bytes): Encoded address
+    """
+    return bytes(WORD_SIZE - ADDRESS_SIZE) + address_to_bytes(address)
@@ -7,20 +7,28 @@
 """ Module for wallet utilities """
 # ---------------------------------------------------------------------------
 
+import atexit
+import multiprocessing
+import os
+import threading
+import weakref
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import asdict
-from typing import Any
+from itertools import chain
+from typing import Any, cast
 
 # ---------------------------------------------------------------------------
 # Imports
 # ---------------------------------------------------------------------------
-# TODO: waiting new version to fix type hints
-# https://github.com/ethereum/eth-keys/pull/90
-import eth_keys  # type: ignore
+from eth_hash.auto import keccak
 
 from ribbon.definitions import Bid, ContractConfig, Domain, SignedBid
-from ribbon.encode import TypedDataEncoder
+from ribbon.encode import TypedDataEncoder, get_typed_data_digest
 from ribbon.erc20 import ERC20Contract
-from ribbon.utils import get_address, hex_zero_pad
+from ribbon.utils import WORD_SIZE, address_to_bytes, encode_type, get_address, int_to_word, to_hex
+from sdk_commons.signing import SignerCache, get_ecc_backend_name, get_private_key
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -35,7 +43,113 @@ BID_TYPES = {
         {"name": "referrer", "type": "address"},
     ]
 }
+# Bid struct layout: type hash followed by one word per field
+BID_TYPEHASH = keccak(encode_type("Bid", BID_TYPES["Bid"]).encode())
+BID_STRUCT_SIZE = WORD_SIZE * (len(BID_TYPES["Bid"]) + 1)
 MIN_ALLOWANCE = 1
+# Batches smaller than this are signed on the calling thread,
+# as process pool startup and IPC would cost more than signing
+SIGN_BIDS_INLINE_THRESHOLD = 256
+
+# Signer of the processes of the Wallet.sign_bids pool
+_process_signer: Any = None
+# Wallets returned by Wallet.cached, keyed by private key fingerprint
+_wallet_cache: SignerCache["Wallet"] = SignerCache()
+# Wallets with a running Wallet.sign_bids pool, closed at exit
+_pool_wallets: "weakref.WeakSet[Wallet]" = weakref.WeakSet()
+
+
+# ---------------------------------------------------------------------------
+# Helper Functions
+# ---------------------------------------------------------------------------
+def hash_bid(value: dict, data: bytearray | None = None) -> bytes:
+    """Hash a bid following the fixed layout of BID_TYPES,
+    without walking the types as TypedDataEncoder does
+
+    Args:
+        value (dict): Dictionary of values for each field in BID_TYPES
+        data (bytearray) (optional): Buffer of BID_STRUCT_SIZE bytes
+                                     to reuse across bids
+
+    Returns:
+        hash (bytes): Hash of encoded bid
+    """
+    if data is None:
+        data = bytearray(BID_STRUCT_SIZE)
+    data[0:32] = BID_TYPEHASH
+    data[32:64] = int_to_word(value["swapId"])
+    data[64:96] = int_to_word(value["nonce"])
+    # Addresses are left padded with 12 zero bytes
+    data[108:128] = address_to_bytes(value["signerWallet"])
+    data[128:160] = int_to_word(value["sellAmount"])
+    data[160:192] = int_to_word(value["buyAmount"])
+    data[204:224] = address_to_bytes(value["referrer"])
+
+    return keccak(data)
+
+
+def get_bid_digest(domain: dict, value: dict, types: dict = BID_TYPES) -> bytes:
+    """Generate the EIP712 hash of a bid, using hash_bid when types
+    match BID_TYPES and TypedDataEncoder otherwise
+
+    Args:
+        domain (dict): Domain values in dictionary
+        value (dict): Dictionary of values for each field in types
+        types (dict): Dictionary of types and their fields
+
+    Returns:
+        hash (bytes): Hash of message
+    """
+    if types is not BID_TYPES and types != BID_TYPES:
+        return TypedDataEncoder._digest(domain, types, value)
+
+    return get_typed_data_digest(TypedDataEncoder.domain_separator(domain), hash_bid(value))
+
+
+def iter_bid_digests(
+    domain: dict, values: Iterable[Any], types: dict = BID_TYPES
+) -> Iterator[bytes]:
+    """Generate the EIP712 hashes of many bids sharing the domain,
+    see get_bid_digest
+
+    Args:
+        domain (dict): Domain values in dictionary
+        values (Iterable): Values for each field in types,
+                           as dictionaries or Bid instances
+        types (dict): Dictionary of types and their fields
+
+    Returns:
+        hashes (Iterator[bytes]): Hashes of messages
+    """
+    if types is not BID_TYPES and types != BID_TYPES:
+        yield from TypedDataEncoder._iter_digests(domain, types, values)
+        return
+
+    domain_separator = TypedDataEncoder.domain_separator(domain)
+    data = bytearray(BID_STRUCT_SIZE)
+    for value in values:
+        struct_hash = hash_bid(value if isinstance(value, dict) else vars(value), data)
+        yield get_typed_data_digest(domain_separator, struct_hash)
+
+
+def _init_signer_process(private_key: str, backend: str) -> None:
+    """Create the signer of a process of the Wallet.sign_bids pool"""
+    global _process_signer
+    _process_signer = get_private_key(private_key, backend)
+
+
+def _sign_digests(digests: list[bytes]) -> list[tuple[int, int, int]]:
+    """Sign hashes with the signer of the current process of the
+    Wallet.sign_bids pool, returning the v, r, s components"""
+    signatures = [_process_signer.sign_msg_hash(digest) for digest in digests]
+    return [(signature.v, signature.r, signature.s) for signature in signatures]
+
+
+@atexit.register
+def _close_pools() -> None:
+    """Shut down the Wallet.sign_bids pools still running"""
+    for wallet in list(_pool_wallets):
+        wallet.close()
 
 
 # ---------------------------------------------------------------------------
@@ -50,23 +164,112 @@ class Wallet:
                           in hex format with 0x prefix
         private_key (str): Private key of the user
                            in hex format with 0x prefix
+        backend (str): secp256k1 backend used to sign, see
+                       sdk_commons.signing.ECC_BACKENDS
+                       (defaults to the selected backend)
 
     Attributes:
         signer (object): Instance of signer to generate signature
     """
 
-    def __init__(self, public_key: str | None = None, private_key: str | None = None):
+    def __init__(
+        self,
+        public_key: str | None = None,
+        private_key: str | None = None,
+        backend: str | None = None,
+    ):
         if not private_key and not public_key:
             raise ValueError("Can't instanciate a Wallet without a public or private key")
 
         self.private_key = private_key
         self.public_key = public_key
+        self.backend = backend or get_ecc_backend_name()
+
+        # Process pool of sign_bids, started on the first large batch
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
 
         if self.private_key:
-            self.signer = eth_keys.keys.PrivateKey(bytes.fromhex(self.private_key[2:]))
+            self.signer = get_private_key(self.private_key, self.backend)
             if not self.public_key:
                 self.public_key = get_address(self.signer.public_key.to_address())
 
+    @classmethod
+    def cached(cls, public_key: str | None = None, private_key: str | None = None) -> "Wallet":
+        """Return a Wallet shared across calls with the same keys,
+        to avoid deriving the signer on every signature
+
+        Args:
+            public_key (str): Public key of the user
+                              in hex format with 0x prefix
+            private_key (str): Private key of the user
+                               in hex format with 0x prefix
+
+        Returns:
+            wallet (Wallet): Cached wallet for the keys
+        """
+        if not private_key:
+            return cls(public_key=public_key)
+
+        return _wallet_cache.get(
+            private_key, public_key, lambda: cls(public_key=public_key, private_key=private_key)
+        )
+
+    @staticmethod
+    def evict_cached(private_key: str | None = None) -> None:
+        """Remove cached wallets for the private key,
+        or all cached wallets when not given
+
+        Args:
+            private_key (str) (optional): Private key of the user
+                                          in hex format with 0x prefix
+        """
+        if private_key:
+            _wallet_cache.evict(private_key)
+        else:
+            _wallet_cache.clear()
+
+    def close(self) -> None:
+        """Shut down the process pool of sign_bids, if started.
+        The pool is started again by the next large batch"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            _pool_wallets.discard(self)
+        if pool is not None:
+            pool.shutdown()
+
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Return the process pool of sign_bids, whose processes
+        create the signer once and are reused across batches
+
+        Args:
+            workers (int): Number of processes
+
+        Returns:
+            pool (ProcessPoolExecutor): Pool of signer processes
+        """
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers == workers:
+                return self._pool
+
+            previous_pool = self._pool
+            # Forked workers could inherit locks held by the SDK
+            # threads, spawned ones only get the initializer arguments
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_signer_process,
+                initargs=(cast(str, self.private_key), self.backend),
+            )
+            self._pool_workers = workers
+            _pool_wallets.add(self)
+            pool = self._pool
+
+        if previous_pool is not None:
+            previous_pool.shutdown(wait=False)
+        return pool
+
     def sign_msg(self, messageHash: str) -> dict[str, Any]:
         """Sign a hash message using the signer object
 
@@ -77,12 +280,23 @@ class Wallet:
         Returns:
             signature (dict): Signature split into v, r, s components
         """
-        signature = self.signer.sign_msg_hash(bytes.fromhex(messageHash[2:]))
+        return self.sign_msg_hash(bytes.fromhex(messageHash[2:]))
+
+    def sign_msg_hash(self, messageHash: bytes) -> dict[str, Any]:
+        """Sign a hash message using the signer object
+
+        Args:
+            messageHash (bytes): Message to be signed
+
+        Returns:
+            signature (dict): Signature split into v, r, s components
+        """
+        signature = self.signer.sign_msg_hash(messageHash)
 
         return {
             "v": signature.v + 27,
-            "r": hex_zero_pad(hex(signature.r), 32),
-            "s": hex_zero_pad(hex(signature.s), 32),
+            "r": to_hex(int_to_word(signature.r)),
+            "s": to_hex(int_to_word(signature.s)),
         }
 
     def _sign_type_data_v4(self, domain: Domain, value: dict, types: dict) -> dict[str, Any]:
@@ -107,7 +321,7 @@ class Wallet:
 
         domain_dict = {k: v for k, v in asdict(domain).items() if v is not None}
 
-        return self.sign_msg(TypedDataEncoder._hash(domain_dict, types, value))
+        return self.sign_msg_hash(get_bid_digest(domain_dict, value, types))
 
     def sign_bid(self, domain: Domain, bid: Bid, types: dict = BID_TYPES) -> SignedBid:
         """Sign a bid using _sign_type_data_v4
@@ -151,6 +365,89 @@ class Wallet:
             s=signature["s"],
         )
 
+    def sign_bids(
+        self,
+        domain: Domain,
+        bids: Iterable[Bid],
+        types: dict = BID_TYPES,
+        workers: int | None = None,
+    ) -> list[SignedBid]:
+        """Sign many bids sharing the same domain. Large batches
+        are split across a pool of processes, each one creating
+        its own signer once. The pool is kept for the next batches,
+        until close() or exit
+
+        Args:
+            domain (dict): Dictionary containing domain parameters
+                           including name, version, chainId,
+                           verifyingContract and salt (optional)
+            bids (Iterable): Bids to be signed
+            types (dict): Dictionary of types and their fields
+            workers (int) (optional): Number of processes,
+                                      defaults to the number of CPUs
+
+        Raises:
+            TypeError: Bid argument is not an instance of Bid class
+
+        Returns:
+            signedBids (list): Signed bids, in the same order of bids
+        """
+        if not isinstance(domain, Domain):
+            raise TypeError("Invalid domain parameters")
+
+        if not self.private_key:
+            raise ValueError("Unable to sign. Create the Wallet with the private key argument.")
+
+        bids = list(bids)
+        addresses: dict[str, str] = {}
+        for bid in bids:
+            if not isinstance(bid, Bid):
+                raise TypeError("Invalid bid")
+
+            # Bids of a batch usually share signer and referrer
+            for address in (bid.signerWallet, bid.referrer):
+                if address not in addresses:
+                    addresses[address] = get_address(address)
+
+            if addresses[bid.signerWallet] != self.public_key:
+                raise ValueError("Signer wallet address mismatch")
+
+        domain_dict = {k: v for k, v in asdict(domain).items() if v is not None}
+        digests = list(iter_bid_digests(domain_dict, bids, types))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(digests) < SIGN_BIDS_INLINE_THRESHOLD:
+            signatures = [self.signer.sign_msg_hash(digest) for digest in digests]
+            components = [(signature.v, signature.r, signature.s) for signature in signatures]
+        else:
+            chunk_size = -(-len(digests) // workers)
+            chunks = [digests[i : i + chunk_size] for i in range(0, len(digests), chunk_size)]
+            try:
+                components = list(
+                    chain.from_iterable(self._get_pool(workers).map(_sign_digests, chunks))
+                )
+            except BrokenProcessPool:
+                # A process died, the next batch starts a new pool
+                self.close()
+                raise
+
+        return [
+            SignedBid(
+                swapId=bid.swapId,
+                nonce=bid.nonce,
+                signerWallet=addresses[bid.signerWallet],
+                sellAmount=bid.sellAmount,
+                buyAmount=bid.buyAmount,
+                referrer=addresses[bid.referrer],
+                v=v + 27,
+                r=to_hex(int_to_word(r)),
+                s=to_hex(int_to_word(s)),
+            )
+            for bid, (v, r, s) in zip(bids, components)
+        ]
+
     def verify_allowance(self, swap_config: ContractConfig, token_address: str) -> bool:
         """Verify wallet's allowance for a given token
 
@@ -169,9 +466,8 @@ class Wallet:
         )
         bidding_token = ERC20Contract(token_config)
 
-        allowance = (
-            bidding_token.get_allowance(self.public_key, swap_config.address)
-            / 10**bidding_token.decimals
-        )
+        # Decimals are cached, only the allowance is requested
+        decimals = bidding_token.decimals
+        allowance = bidding_token.get_allowance(self.public_key, swap_config.address)
 
-        return allowance > MIN_ALLOWANCE
+        return bool(allowance / 10**decimals > MIN_ALLOWANCE)
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, NamedTuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe, bounded mapping that evicts the least recently used
+    entry once maxsize is reached. Hits, misses and evictions are
+    counted and exposed via info(), similarly to functools.lru_cache.
+    on_evict is called with the key and the value of each evicted
+    entry, outside of the lock, e.g. to release resources
+    """
+
+    def __init__(self, maxsize: int = 128, on_evict: Callable[[K, V], None] | None = None) -> None:
+        if maxsize <= 0:
+            raise ValueError(f'Invalid cache size: {maxsize}')
+
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def keys(self) -> list[K]:
+        """
+        Return a snapshot of the keys, from the least recently used
+        """
+        with self._lock:
+            return list(self._data)
+
+    def get(self, key: K) -> V | None:
+        """
+        Return the value stored for key, or None when missing
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Store value for key, evicting the least recently used entries
+        """
+        evicted = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+                self._evictions += 1
+
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """
+        Return the value stored for key, creating it with factory
+        when missing. The factory is executed outside of the lock,
+        concurrent misses on the same key may create the value twice
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+
+        value = factory()
+        self.put(key, value)
+        return value
+
+    def pop(self, key: K) -> V | None:
+        """
+        Remove key from the cache and return its value, if any
+        """
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self.maxsize,
+                currsize=len(self._data),
+            )
@@ -1,9 +1,15 @@
 import abc
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import Executor
 from decimal import Decimal
-from typing import Any, TypedDict
+from typing import Any, TypedDict, TypeVar
 
 from sdk_commons.chains import Chains
 
+T = TypeVar('T')
+
 
 class OfferDetails(TypedDict):
     # TODO: enforce specific types?
@@ -173,3 +179,148 @@ class SDKConfig(abc.ABC):
         Verify if the contract is allowed to access
         the given token on the wallet
         """
+
+
+class AsyncSDKConfig(abc.ABC):
+    """
+    asyncio counterpart of SDKConfig: the same interface, with every
+    method being a coroutine. Implementations are expected to await
+    network calls instead of blocking, and to offload CPU bound work
+    (e.g. signing) with run_in_executor.
+    """
+
+    # Executor used by run_in_executor,
+    # None for the default executor of the event loop
+    executor: Executor | None = None
+
+    @property
+    @abc.abstractmethod
+    def authorization_pages(self):
+        """
+        Set this property with a class containing
+        mainnet and testnet properties
+        """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def supported_chains(self) -> list[Chains]:
+        """
+        Set this property with a list
+        of all supported chains
+        """
+        pass
+
+    async def run_in_executor(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func in the executor, without blocking the event loop
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    @abc.abstractmethod
+    async def create_offer(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        # TODO: rename into offer_token
+        oToken: str,
+        bidding_token: str,
+        min_price: int,
+        min_bid_size: int,
+        offer_amount: int,
+        public_key: str,
+        private_key: str,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Create an offer
+        """
+
+    # TODO: rename into get_offered_token_details
+    @abc.abstractmethod
+    async def get_otoken_details(
+        self,
+        *,
+        # TODO: to be renamed into token_address
+        contract_address: str,
+        # TODO: to be normalized with the other methods
+        swap_contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        offer_id: int,
+        seller: str,
+        **kwargs: Any,
+    ) -> OfferTokenDetails:
+        """
+        Return details about the offer token
+        """
+
+    @abc.abstractmethod
+    async def get_offer_details(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        offer_id: int,
+        seller: str,
+        **kwargs: Any,
+    ) -> OfferDetails:
+        """Return details for a given offer"""
+
+    @abc.abstractmethod
+    async def sign_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        public_key: str,
+        private_key: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        **kwargs: Any,
+    ) -> str:
+        """Sign a bid and return the signature"""
+
+    @abc.abstractmethod
+    async def validate_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        seller: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        signature: str,
+        **kwargs: Any,
+    ) -> BidValidation:
+        """Validate the signing bid"""
+
+    @abc.abstractmethod
+    async def verify_allowance(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        public_key: str,
+        token_address: str,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Verify if the contract is allowed to access
+        the given token on the wallet
+        """
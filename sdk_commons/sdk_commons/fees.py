@@ -0,0 +1,178 @@
+import statistics
+import threading
+import time
+from enum import Enum
+from typing import NamedTuple
+
+from web3 import Web3
+from web3.exceptions import MethodUnavailable
+from web3.types import TxParams, Wei
+
+from sdk_commons.chains import Chains
+from sdk_commons.providers import get_web3
+
+# Chains whose transactions are sent with a legacy gasPrice
+LEGACY_FEE_CHAINS = {Chains.BSC, Chains.BSC_TESTNET}
+
+# Blocks of history used to estimate the priority fee
+FEE_HISTORY_BLOCKS = 10
+# Seconds between two blocks, the fees of an RPC URI are reused for
+# about a block
+BLOCK_TIMES = {
+    Chains.ETHEREUM: 12.0,
+    Chains.ROPSTEN: 12.0,
+    Chains.GOERLI: 12.0,
+    Chains.KOVAN: 4.0,
+    Chains.BSC: 3.0,
+    Chains.BSC_TESTNET: 3.0,
+    Chains.AVALANCHE: 2.0,
+    Chains.FUJI: 2.0,
+    Chains.MATIC: 2.0,
+}
+# Seconds the fees are reused on other chains
+DEFAULT_FEE_TTL = 2.0
+# The max fee covers the base fee doubling, i.e. 6 full blocks
+BASE_FEE_MULTIPLIER = 2
+
+
+class FeeStrategy(Enum):
+    """
+    Percentile of the priority fees paid in the recent blocks
+    """
+
+    CHEAP = 10
+    NORMAL = 50
+    FAST = 90
+
+
+class FeeEstimate(NamedTuple):
+    # Base fee of the next block, 0 on chains without EIP-1559
+    base_fee: int
+    # Priority fee by strategy
+    priority_fees: dict[FeeStrategy, int]
+    gas_price: int | None = None
+
+    def get_max_fee(self, strategy: FeeStrategy = FeeStrategy.NORMAL) -> int:
+        return self.base_fee * BASE_FEE_MULTIPLIER + self.priority_fees[strategy]
+
+
+class FeeOracle:
+    """
+    Fee estimates of each RPC URI, computed from eth_feeHistory and
+    reused for ttl seconds, by default the block time of the chain,
+    so that fees follow the market and most transactions don't request
+    them. Chains in LEGACY_FEE_CHAINS use the eth_gasPrice estimate
+    instead
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        # None for the block time of each chain
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._estimates: dict[tuple[str, Chains], tuple[FeeEstimate, float]] = {}
+
+    def _fetch(self, rpc_uri: str, chain: Chains) -> FeeEstimate:
+        w3 = get_web3(rpc_uri, chain)
+
+        if chain not in LEGACY_FEE_CHAINS:
+            try:
+                return self._fetch_fee_history(w3)
+            except (MethodUnavailable, ValueError):
+                # Nodes without eth_feeHistory get the legacy estimate
+                pass
+
+        gas_price = w3.eth.gas_price
+        return FeeEstimate(
+            base_fee=0,
+            priority_fees={strategy: gas_price for strategy in FeeStrategy},
+            gas_price=gas_price,
+        )
+
+    def _fetch_fee_history(self, w3: Web3) -> FeeEstimate:
+        strategies = list(FeeStrategy)
+        history = w3.eth.fee_history(
+            FEE_HISTORY_BLOCKS, 'latest', [float(strategy.value) for strategy in strategies]
+        )
+        rewards = history['reward']
+        # Empty blocks report 0 for all percentiles
+        rewards = [block_rewards for block_rewards in rewards if any(block_rewards)] or rewards
+
+        return FeeEstimate(
+            base_fee=history['baseFeePerGas'][-1],
+            priority_fees={
+                strategy: int(statistics.median(block_rewards[i] for block_rewards in rewards))
+                for i, strategy in enumerate(strategies)
+            },
+        )
+
+    def get_ttl(self, chain: Chains) -> float:
+        """
+        Return the seconds the estimates of the chain are reused
+        """
+        if self.ttl is not None:
+            return self.ttl
+        return BLOCK_TIMES.get(chain, DEFAULT_FEE_TTL)
+
+    def get_estimate(self, rpc_uri: str, chain: Chains) -> FeeEstimate:
+        """
+        Return the fee estimate of the RPC URI, requested when
+        not computed within ttl seconds
+        """
+        with self._lock:
+            entry = self._estimates.get((rpc_uri, chain))
+        if entry is not None and entry[1] >= time.monotonic():
+            return entry[0]
+
+        estimate = self._fetch(rpc_uri, chain)
+        with self._lock:
+            self._estimates[(rpc_uri, chain)] = (estimate, time.monotonic() + self.get_ttl(chain))
+        return estimate
+
+    def get_tx_params(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        strategy: FeeStrategy = FeeStrategy.NORMAL,
+        min_priority_fee: int = 0,
+    ) -> TxParams:
+        """
+        Return the fee parameters of a transaction: maxFeePerGas and
+        maxPriorityFeePerGas, or gasPrice on legacy chains. The priority
+        fee is at least min_priority_fee, e.g. a minimum of the chain
+        """
+        estimate = self.get_estimate(rpc_uri, chain)
+
+        if estimate.gas_price is not None:
+            return {'gasPrice': Wei(estimate.gas_price)}
+
+        priority_fee = max(estimate.priority_fees[strategy], min_priority_fee)
+        return {
+            'maxPriorityFeePerGas': Wei(priority_fee),
+            'maxFeePerGas': Wei(estimate.base_fee * BASE_FEE_MULTIPLIER + priority_fee),
+        }
+
+    def invalidate(self, rpc_uri: str | None = None) -> None:
+        """
+        Forget the estimates of rpc_uri, or of all RPC URIs
+        """
+        with self._lock:
+            if rpc_uri is None:
+                self._estimates.clear()
+            else:
+                for key in [key for key in self._estimates if key[0] == rpc_uri]:
+                    del self._estimates[key]
+
+
+fee_oracle = FeeOracle()
+
+
+def get_fee_params(
+    rpc_uri: str,
+    chain: Chains,
+    strategy: FeeStrategy = FeeStrategy.NORMAL,
+    min_priority_fee: int = 0,
+) -> TxParams:
+    """
+    Return the fee parameters of a transaction from the shared oracle
+    """
+    return fee_oracle.get_tx_params(rpc_uri, chain, strategy, min_priority_fee)
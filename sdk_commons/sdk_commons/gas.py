@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Any, NamedTuple, cast
+
+from eth_utils import function_abi_to_4byte_selector
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+from web3.exceptions import ContractLogicError
+from web3.types import TxParams
+
+from sdk_commons.chains import Chains
+
+# Gas limit of a transaction relative to the estimate
+DEFAULT_GAS_MARGIN = 1.2
+# Seconds an estimate is reused before estimating the gas again
+DEFAULT_GAS_TTL = 600.0
+
+
+class GasEstimatorInfo(NamedTuple):
+    hits: int
+    misses: int
+    fallbacks: int
+    currsize: int
+
+
+class GasEstimator:
+    """
+    Gas limits of contract functions, estimated with estimate_gas
+    and cached by chain, contract address and function selector,
+    so that most transactions don't request an estimate. The limit is
+    the estimate increased by margin, estimated again after ttl seconds
+    in case the contract path changed.
+    When the estimate fails, e.g. because the transaction depends on
+    a previous one not included yet, the fallback limit is returned
+    """
+
+    def __init__(self, margin: float = DEFAULT_GAS_MARGIN, ttl: float = DEFAULT_GAS_TTL) -> None:
+        self.margin = margin
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._limits: dict[tuple[Chains, str, bytes], tuple[int, float]] = {}
+        self._hits = self._misses = self._fallbacks = 0
+
+    def get_gas_limit(
+        self,
+        chain: Chains,
+        function: ContractFunction,
+        tx_params: TxParams | None = None,
+        fallback: int | None = None,
+    ) -> int:
+        """
+        Return the gas limit of the contract function, estimated with
+        tx_params (e.g. its sender) when not cached. Raise the estimate
+        error when no fallback is given
+        """
+        key = (
+            chain,
+            Web3.to_checksum_address(function.address),
+            function_abi_to_4byte_selector(cast(dict[str, Any], function.abi)),
+        )
+        with self._lock:
+            entry = self._limits.get(key)
+            if entry is not None and entry[1] >= time.monotonic():
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        try:
+            estimate = function.estimate_gas(tx_params)
+        except (ContractLogicError, ValueError):
+            if fallback is None:
+                raise
+            with self._lock:
+                self._fallbacks += 1
+            return fallback
+
+        gas_limit = int(estimate * self.margin)
+        with self._lock:
+            self._limits[key] = (gas_limit, time.monotonic() + self.ttl)
+        return gas_limit
+
+    def invalidate(self, chain: Chains, address: str) -> None:
+        """
+        Forget the gas limits of the functions of a contract
+        """
+        address = Web3.to_checksum_address(address)
+        with self._lock:
+            for key in [key for key in self._limits if key[:2] == (chain, address)]:
+                del self._limits[key]
+
+    def clear(self) -> None:
+        """
+        Forget all the gas limits
+        """
+        with self._lock:
+            self._limits.clear()
+            self._hits = self._misses = self._fallbacks = 0
+
+    def info(self) -> GasEstimatorInfo:
+        with self._lock:
+            return GasEstimatorInfo(self._hits, self._misses, self._fallbacks, len(self._limits))
+
+
+gas_estimator = GasEstimator()
+
+
+def get_gas_limit(
+    chain: Chains,
+    function: ContractFunction,
+    tx_params: TxParams | None = None,
+    fallback: int | None = None,
+) -> int:
+    """
+    Return the gas limit of the contract function from the shared
+    gas estimator
+    """
+    return gas_estimator.get_gas_limit(chain, function, tx_params, fallback)
@@ -1,7 +1,14 @@
 import json
+import os
+import tempfile
+from collections.abc import Mapping
+from functools import cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+from eth_hash.auto import keccak
+
 EVM_SIGNATURE_LEN = 130
 
 
@@ -25,11 +32,124 @@ def get_abi_path(abi_name: str | Path) -> Path:
     return Path(__file__).parent.joinpath('abis', abi_name).with_suffix('.json')
 
 
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@cache
+def _read_abi(abi_path: Path) -> str:
+    with open(abi_path) as f:
+        return f.read()
+
+
+@cache
+def _load_abi(abi_path: Path) -> Any:
+    return _freeze(json.loads(_read_abi(abi_path)))
+
+
 def get_abi(abi_name: str | Path) -> Any:
     """
-    Resolve an abi name to the content of the abi json
+    Resolve an abi name to the content of the abi json.
+    Each abi file is read once, every call returns a new
+    copy of plain lists and dicts the caller may modify
     """
-    abi_path = get_abi_path(abi_name)
+    return json.loads(_read_abi(get_abi_path(abi_name)))
 
-    with open(abi_path) as f:
-        return json.load(f)
+
+def get_frozen_abi(abi_name: str | Path) -> Any:
+    """
+    Resolve an abi name to the content of the abi json.
+    Each abi is loaded once and shared by every caller
+    as read-only tuples and mappings
+    """
+    return _load_abi(get_abi_path(abi_name))
+
+
+def preload_abis() -> None:
+    """
+    Load all the abis shipped with sdk_commons
+    """
+    for abi_path in get_abi_path('').parent.glob('*.json'):
+        get_frozen_abi(abi_path)
+        get_abi_selectors(abi_path)
+        get_abi_topics(abi_path)
+
+
+def get_abi_type(param: Mapping[str, Any]) -> str:
+    """
+    Return the canonical type of an abi input,
+    expanding tuples into their components
+    """
+    abi_type = param['type']
+    if not abi_type.startswith('tuple'):
+        return str(abi_type)
+
+    components = ','.join(get_abi_type(component) for component in param['components'])
+    return f'({components}){abi_type[len("tuple"):]}'
+
+
+def get_abi_signature(element: Mapping[str, Any]) -> str:
+    """
+    Return the canonical signature of an abi function or event,
+    e.g. transfer(address,uint256)
+    """
+    inputs = ','.join(get_abi_type(param) for param in element.get('inputs', ()))
+    return f'{element["name"]}({inputs})'
+
+
+def _get_abi_hashes(abi_path: Path, element_type: str, size: int) -> Mapping[str, bytes]:
+    return MappingProxyType(
+        {
+            signature: keccak(signature.encode())[:size]
+            for signature in (
+                get_abi_signature(element)
+                for element in _load_abi(abi_path)
+                if element['type'] == element_type
+            )
+        }
+    )
+
+
+@cache
+def _get_abi_selectors(abi_path: Path) -> Mapping[str, bytes]:
+    return _get_abi_hashes(abi_path, 'function', 4)
+
+
+@cache
+def _get_abi_topics(abi_path: Path) -> Mapping[str, bytes]:
+    return _get_abi_hashes(abi_path, 'event', 32)
+
+
+def get_abi_selectors(abi_name: str | Path) -> Mapping[str, bytes]:
+    """
+    Return the 4 bytes selectors of the abi functions,
+    by canonical signature
+    """
+    return _get_abi_selectors(get_abi_path(abi_name))
+
+
+def get_abi_topics(abi_name: str | Path) -> Mapping[str, bytes]:
+    """
+    Return the topics of the abi events, by canonical signature
+    """
+    return _get_abi_topics(get_abi_path(abi_name))
+
+
+def dump_json_atomic(path: Path, data: Any) -> None:
+    """
+    Write data as json to path through a temporary file,
+    readers never see a partially written file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,84 @@
+import itertools
+from collections.abc import Sequence
+from typing import Any
+
+from eth_abi import decode, encode
+from eth_abi.exceptions import DecodingError
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract.contract import ContractFunction
+from web3.types import BlockIdentifier
+
+from sdk_commons.chains import Chains
+from sdk_commons.helpers import get_abi_selectors
+
+# Multicall3 is deployed at the same address on all supported chains
+# https://github.com/mds1/multicall
+MULTICALL3_ADDRESS = Web3.to_checksum_address('0xcA11bde05977b3631167028862bE2a173976CA11')
+MULTICALL3_CHAINS = {
+    Chains.ETHEREUM,
+    Chains.ROPSTEN,
+    Chains.GOERLI,
+    Chains.KOVAN,
+    Chains.BSC,
+    Chains.BSC_TESTNET,
+    Chains.AVALANCHE,
+    Chains.FUJI,
+    Chains.MATIC,
+}
+AGGREGATE3_SELECTOR = get_abi_selectors('Multicall3')['aggregate3((address,bool,bytes)[])']
+
+
+def decode_call_result(function: ContractFunction, data: bytes) -> Any:
+    """
+    Decode the return data of a contract function as done by its call()
+    """
+    output_types = get_abi_output_types(function.abi)
+    normalizers = itertools.chain(
+        BASE_RETURN_NORMALIZERS, getattr(function, '_return_data_normalizers', ())
+    )
+    result = map_abi_data(normalizers, output_types, function.w3.codec.decode(output_types, data))
+
+    if len(result) == 1:
+        return result[0]
+    return result
+
+
+def aggregate(
+    w3: Web3,
+    chain: Chains,
+    calls: Sequence[ContractFunction],
+    block_identifier: BlockIdentifier = 'latest',
+) -> list[Any]:
+    """
+    Execute read calls in a single eth_call through Multicall3,
+    returning their results in the same order as calls() would.
+    Calls are executed one by one on chains without Multicall3,
+    calls failing in the batch are repeated alone to raise their error
+    """
+    if len(calls) == 1 or chain not in MULTICALL3_CHAINS:
+        return [call.call(block_identifier=block_identifier) for call in calls]
+
+    call_data = AGGREGATE3_SELECTOR + encode(
+        ['(address,bool,bytes)[]'],
+        [
+            [
+                (call.address, True, Web3.to_bytes(hexstr=call._encode_transaction_data()))
+                for call in calls
+            ]
+        ],
+    )
+    try:
+        return_data = w3.eth.call(
+            {'to': MULTICALL3_ADDRESS, 'data': Web3.to_hex(call_data)}, block_identifier
+        )
+        (results,) = decode(['(bool,bytes)[]'], return_data)
+    except DecodingError:
+        # Multicall3 is not deployed on the node chain
+        return [call.call(block_identifier=block_identifier) for call in calls]
+
+    return [
+        decode_call_result(call, data) if success else call.call(block_identifier=block_identifier)
+        for call, (success, data) in zip(calls, results)
+    ]
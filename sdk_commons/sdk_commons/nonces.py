@@ -0,0 +1,180 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+from web3.types import Nonce
+
+from sdk_commons.chains import Chains
+from sdk_commons.providers import get_async_web3, get_web3
+
+
+class _AccountNonce:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Next nonce to assign, None when it has to be synced
+        self.next_nonce: int | None = None
+        # Sync in progress of the threads, set once done
+        self.sync: threading.Event | None = None
+        # Syncs in progress by event loop
+        self.syncs: dict[asyncio.AbstractEventLoop, asyncio.Future[None]] = {}
+
+
+class NonceManager:
+    """
+    Assign transaction nonces locally for each chain and account, so
+    that concurrent transactions from the same key (threads or asyncio
+    tasks) never share a nonce and only the first one requests the
+    transaction count. The counter is synced again with the pending
+    transaction count after an error, e.g. when a transaction could not
+    be broadcast, or was not included in time, and left a gap
+    """
+
+    def __init__(self) -> None:
+        self._accounts: dict[tuple[Chains, str], _AccountNonce] = {}
+        self._lock = threading.Lock()
+
+    def _get_account(self, chain: Chains, address: str) -> _AccountNonce:
+        key = (chain, Web3.to_checksum_address(address))
+        with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                account = self._accounts[key] = _AccountNonce()
+            return account
+
+    def get_nonce(self, rpc_uri: str, chain: Chains, address: str) -> Nonce:
+        """
+        Assign the next nonce of the account. Concurrent threads wait
+        for a single sync and the lock is never held while waiting for
+        the RPC, it is shared with the event loops
+        """
+        account = self._get_account(chain, address)
+
+        while True:
+            with account.lock:
+                if account.next_nonce is not None:
+                    nonce = account.next_nonce
+                    account.next_nonce += 1
+                    return Nonce(nonce)
+
+                sync = account.sync
+                is_owner = sync is None
+                if sync is None:
+                    sync = account.sync = threading.Event()
+
+            if not is_owner:
+                sync.wait()
+                continue
+
+            try:
+                count = get_web3(rpc_uri, chain).eth.get_transaction_count(
+                    Web3.to_checksum_address(address), 'pending'
+                )
+                with account.lock:
+                    if account.next_nonce is None:
+                        account.next_nonce = count
+            finally:
+                with account.lock:
+                    account.sync = None
+                # Waiting threads retry the sync if this one failed
+                sync.set()
+
+    async def get_nonce_async(self, rpc_uri: str, chain: Chains, address: str) -> Nonce:
+        """
+        Assign the next nonce of the account, syncing it with AsyncWeb3.
+        Concurrent tasks wait for a single sync and the lock is never
+        held while waiting for the RPC
+        """
+        account = self._get_account(chain, address)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with account.lock:
+                if account.next_nonce is not None:
+                    nonce = account.next_nonce
+                    account.next_nonce += 1
+                    return Nonce(nonce)
+
+                sync = account.syncs.get(loop)
+                is_owner = sync is None
+                if sync is None:
+                    sync = account.syncs[loop] = loop.create_future()
+
+            if not is_owner:
+                await sync
+                continue
+
+            try:
+                count = await get_async_web3(rpc_uri, chain).eth.get_transaction_count(
+                    Web3.to_checksum_address(address), 'pending'
+                )
+                with account.lock:
+                    if account.next_nonce is None:
+                        account.next_nonce = count
+            finally:
+                with account.lock:
+                    account.syncs.pop(loop, None)
+                # Waiting tasks retry the sync if this one failed
+                sync.set_result(None)
+
+    def resync(self, chain: Chains, address: str) -> None:
+        """
+        Sync the nonce of the account before assigning the next one
+        """
+        account = self._get_account(chain, address)
+        with account.lock:
+            account.next_nonce = None
+
+    def resync_on_timeout(self, future: 'Future[Any]', chain: Chains, address: str) -> None:
+        """
+        Sync the nonce of the account again when the transaction of
+        future is not included in time, e.g. dropped from the mempool,
+        so that the next transaction fills the gap
+        """
+
+        def callback(done: 'Future[Any]') -> None:
+            if not done.cancelled() and isinstance(done.exception(), TimeExhausted):
+                self.resync(chain, address)
+
+        future.add_done_callback(callback)
+
+    @contextmanager
+    def reserve(self, rpc_uri: str, chain: Chains, address: str) -> Iterator[Nonce]:
+        """
+        Assign the next nonce of the account, syncing it again
+        when the block raises, e.g. because the broadcast failed
+        """
+        nonce = self.get_nonce(rpc_uri, chain, address)
+        try:
+            yield nonce
+        except BaseException:
+            self.resync(chain, address)
+            raise
+
+    @asynccontextmanager
+    async def reserve_async(
+        self, rpc_uri: str, chain: Chains, address: str
+    ) -> AsyncIterator[Nonce]:
+        """
+        Async version of reserve
+        """
+        nonce = await self.get_nonce_async(rpc_uri, chain, address)
+        try:
+            yield nonce
+        except BaseException:
+            self.resync(chain, address)
+            raise
+
+    def clear(self) -> None:
+        """
+        Forget the nonces of all accounts
+        """
+        with self._lock:
+            self._accounts.clear()
+
+
+nonce_manager = NonceManager()
@@ -0,0 +1,263 @@
+import threading
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import NamedTuple
+
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+from web3.types import BlockIdentifier
+
+from sdk_commons.cache import LRUCache
+from sdk_commons.chains import Chains
+from sdk_commons.config import OfferDetails
+from sdk_commons.providers import get_async_web3, get_web3
+
+# Number of blocks after which cached offer details are refreshed,
+# with 0 the details are served until a new block is seen
+DEFAULT_MAX_BLOCK_AGE = 0
+# Seconds the latest block number of an RPC URI is trusted, i.e. how
+# long it can take to notice a new block
+DEFAULT_BLOCK_NUMBER_TTL = 1.0
+DEFAULT_OFFER_CACHE_SIZE = 1024
+# Errors of nodes without the requested block, e.g. a node behind a
+# load balancer lagging the one that returned the latest block number
+MISSING_BLOCK_ERRORS = ('header not found', 'unknown block', 'block not found')
+
+OfferKey = tuple[int, str, Hashable]
+
+
+def is_missing_block_error(error: BaseException) -> bool:
+    """
+    Return whether the node does not have the requested block yet
+    """
+    if not isinstance(error, ValueError) or isinstance(error, ContractLogicError):
+        return False
+    message = str(error).lower()
+    return any(missing_block in message for missing_block in MISSING_BLOCK_ERRORS)
+
+
+class OfferCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    stale: int
+    invalidations: int
+    maxsize: int
+    currsize: int
+
+
+class OfferDetailsCache:
+    """
+    Thread-safe cache of offer details keyed by chain, swap contract
+    address and offer id. Each entry records the block it was read at
+    and is served while the latest block is at most max_block_age
+    blocks ahead, or until the offer is invalidated, e.g. when a
+    settlement event for the offer is seen.
+
+    The latest block number is requested at most once per
+    block_number_ttl seconds for each RPC URI
+    """
+
+    def __init__(
+        self,
+        max_block_age: int = DEFAULT_MAX_BLOCK_AGE,
+        block_number_ttl: float = DEFAULT_BLOCK_NUMBER_TTL,
+        maxsize: int = DEFAULT_OFFER_CACHE_SIZE,
+    ) -> None:
+        self.max_block_age = max_block_age
+        self.block_number_ttl = block_number_ttl
+        self._offers: LRUCache[OfferKey, tuple[int, OfferDetails]] = LRUCache(maxsize=maxsize)
+        self._block_numbers: dict[tuple[str, Chains], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._invalidations = 0
+
+    def configure(
+        self, max_block_age: int | None = None, block_number_ttl: float | None = None
+    ) -> None:
+        """
+        Change the staleness window of the cached offers
+        """
+        if max_block_age is not None:
+            if max_block_age < 0:
+                raise ValueError(f'Invalid max block age: {max_block_age}')
+            self.max_block_age = max_block_age
+        if block_number_ttl is not None:
+            self.block_number_ttl = block_number_ttl
+
+    @staticmethod
+    def _get_key(chain: Chains, address: str, offer_id: Hashable) -> OfferKey:
+        return (chain.value, Web3.to_checksum_address(address), offer_id)
+
+    def _get_cached_block_number(self, rpc_uri: str, chain: Chains) -> int | None:
+        with self._lock:
+            entry = self._block_numbers.get((rpc_uri, chain))
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def _put_block_number(self, rpc_uri: str, chain: Chains, block_number: int) -> None:
+        with self._lock:
+            self._block_numbers[(rpc_uri, chain)] = (
+                block_number,
+                time.monotonic() + self.block_number_ttl,
+            )
+
+    def get_block_number(self, rpc_uri: str, chain: Chains) -> int:
+        """
+        Return the latest block number of the RPC URI
+        """
+        block_number = self._get_cached_block_number(rpc_uri, chain)
+        if block_number is None:
+            block_number = get_web3(rpc_uri, chain).eth.block_number
+            self._put_block_number(rpc_uri, chain, block_number)
+        return block_number
+
+    async def get_async_block_number(self, rpc_uri: str, chain: Chains) -> int:
+        """
+        Return the latest block number of the RPC URI, using AsyncWeb3
+        """
+        block_number = self._get_cached_block_number(rpc_uri, chain)
+        if block_number is None:
+            block_number = await get_async_web3(rpc_uri, chain).eth.block_number
+            self._put_block_number(rpc_uri, chain, block_number)
+        return block_number
+
+    def get(
+        self, chain: Chains, address: str, offer_id: Hashable, block_number: int
+    ) -> OfferDetails | None:
+        """
+        Return the details of the offer if still fresh at block_number,
+        None otherwise
+        """
+        entry = self._offers.get(self._get_key(chain, address, offer_id))
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            if block_number - entry[0] > self.max_block_age:
+                self._stale += 1
+                self._misses += 1
+                return None
+            self._hits += 1
+        # Copied, callers may change the returned details
+        return entry[1].copy()
+
+    def put(
+        self,
+        chain: Chains,
+        address: str,
+        offer_id: Hashable,
+        block_number: int,
+        details: OfferDetails,
+    ) -> None:
+        """
+        Store the details of the offer, read at block_number
+        """
+        self._offers.put(self._get_key(chain, address, offer_id), (block_number, details.copy()))
+
+    def get_or_fetch(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        address: str,
+        offer_id: Hashable,
+        fetch: Callable[[BlockIdentifier], OfferDetails],
+    ) -> OfferDetails:
+        """
+        Return the details of the offer, calling fetch with the latest
+        block number when missing or stale. When the node does not have
+        that block yet, fetch is called again with 'latest'
+        """
+        block_number = self.get_block_number(rpc_uri, chain)
+        details = self.get(chain, address, offer_id, block_number)
+        if details is None:
+            try:
+                details = fetch(block_number)
+            except ValueError as e:
+                if not is_missing_block_error(e):
+                    raise
+                details = fetch('latest')
+            self.put(chain, address, offer_id, block_number, details)
+        return details
+
+    async def get_or_fetch_async(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        address: str,
+        offer_id: Hashable,
+        fetch: Callable[[BlockIdentifier], Awaitable[OfferDetails]],
+    ) -> OfferDetails:
+        """
+        Return the details of the offer, awaiting fetch with the latest
+        block number when missing or stale, see get_or_fetch
+        """
+        block_number = await self.get_async_block_number(rpc_uri, chain)
+        details = self.get(chain, address, offer_id, block_number)
+        if details is None:
+            try:
+                details = await fetch(block_number)
+            except ValueError as e:
+                if not is_missing_block_error(e):
+                    raise
+                details = await fetch('latest')
+            self.put(chain, address, offer_id, block_number, details)
+        return details
+
+    def invalidate(
+        self,
+        chain: Chains,
+        address: str,
+        offer_id: Hashable | None = None,
+        predicate: Callable[[OfferDetails], bool] | None = None,
+    ) -> int:
+        """
+        Remove the offer from the cache, or all offers of the contract
+        when offer_id is None, optionally only the ones whose details
+        match predicate. Return the number of removed offers
+        """
+        if offer_id is not None:
+            keys = [self._get_key(chain, address, offer_id)]
+        else:
+            prefix = self._get_key(chain, address, None)[:2]
+            keys = [key for key in self._offers.keys() if key[:2] == prefix]
+
+        removed = 0
+        for key in keys:
+            entry = self._offers.pop(key)
+            if entry is None:
+                continue
+            if predicate is not None and not predicate(entry[1]):
+                self._offers.put(key, entry)
+                continue
+            removed += 1
+
+        with self._lock:
+            self._invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """
+        Remove all offers and block numbers and reset the counters
+        """
+        self._offers.clear()
+        with self._lock:
+            self._block_numbers.clear()
+            self._hits = self._misses = self._stale = self._invalidations = 0
+
+    def info(self) -> OfferCacheInfo:
+        offers = self._offers.info()
+        with self._lock:
+            return OfferCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                stale=self._stale,
+                invalidations=self._invalidations,
+                maxsize=offers.maxsize,
+                currsize=offers.currsize,
+            )
+
+
+offer_details_cache = OfferDetailsCache()
@@ -0,0 +1,605 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, cast
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from web3._utils.method_formatters import raise_contract_logic_error_on_revert
+from web3.contract import AsyncContract, Contract
+from web3.contract.contract import ContractFunction
+from web3.exceptions import BadResponseFormat, ContractLogicError
+from web3.middleware import async_geth_poa_middleware, geth_poa_middleware
+from web3.providers.rpc import HTTPProvider
+from web3.types import AsyncMiddleware, BlockIdentifier, Middleware, RPCEndpoint, RPCResponse
+
+from sdk_commons.cache import CacheInfo, LRUCache
+from sdk_commons.chains import Chains
+from sdk_commons.helpers import get_abi_path, get_frozen_abi
+from sdk_commons.multicall import decode_call_result
+
+# Chains whose blocks need the geth POA middleware
+# (extraData longer than 32 bytes)
+POA_CHAINS = {Chains.BSC, Chains.BSC_TESTNET, Chains.FUJI, Chains.MATIC}
+
+# Number of hosts and of keep-alive connections per host
+# kept by the HTTP session of each RPC URI
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+# Maximum number of RPC URIs and Web3 instances kept in the pool
+DEFAULT_PROVIDER_POOL_SIZE = 32
+# Maximum number of contract handles kept in the pool
+DEFAULT_CONTRACT_CACHE_SIZE = 256
+# Seconds to wait for an RPC response, as web3's default
+REQUEST_TIMEOUT = 10
+# Seconds after which the chain behind an RPC URI is verified again
+DEFAULT_CHAIN_ID_TTL = 600
+
+
+class BatchResponseError(BadResponseFormat, ValueError):
+    """
+    Invalid JSON-RPC batch response, e.g. a single error object
+    returned by a node or a proxy without batch support
+    """
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider posting through the given session, shared by all
+    threads, instead of the per thread sessions of web3.
+    on_connection_error is called with the endpoint when a request
+    fails, before raising
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        session: requests.Session,
+        request_kwargs: Any = None,
+        on_connection_error: Callable[[str], None] | None = None,
+    ) -> None:
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self.session = session
+        self.on_connection_error = on_connection_error
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        request_kwargs = self.get_request_kwargs()
+        request_kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+
+        try:
+            response = self.session.post(
+                str(self.endpoint_uri), data=request_data, **request_kwargs
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            if self.on_connection_error is not None:
+                self.on_connection_error(str(self.endpoint_uri))
+            raise
+
+        return self.decode_rpc_response(response.content)
+
+    def make_batch_request(self, requests_: Sequence[tuple[RPCEndpoint, Any]]) -> list[Any]:
+        """
+        Send the requests in a single JSON-RPC batch, returning
+        the raw responses in the same order. Raise BatchResponseError
+        when the response is not a list answering every request
+        """
+        encoded = [self.encode_rpc_request(method, params) for method, params in requests_]
+        ids = [json.loads(request)['id'] for request in encoded]
+        request_kwargs = self.get_request_kwargs()
+        request_kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+
+        try:
+            response = self.session.post(
+                str(self.endpoint_uri), data=b'[' + b','.join(encoded) + b']', **request_kwargs
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            if self.on_connection_error is not None:
+                self.on_connection_error(str(self.endpoint_uri))
+            raise
+
+        try:
+            items = json.loads(response.content)
+        except ValueError as e:
+            raise BatchResponseError(f'Invalid batch response from {self.endpoint_uri}') from e
+        if not isinstance(items, list):
+            raise BatchResponseError(
+                f'Batch requests not supported by {self.endpoint_uri}: {str(items)[:200]}'
+            )
+
+        responses = {item.get('id'): item for item in items if isinstance(item, dict)}
+        missing = [request_id for request_id in ids if request_id not in responses]
+        if missing:
+            raise BatchResponseError(
+                f'Missing batch responses from {self.endpoint_uri}: {len(missing)}/{len(ids)}'
+            )
+        return [responses[request_id] for request_id in ids]
+
+
+class ChainRegistry:
+    """
+    Chain ids returned by RPC URIs, verified again once ttl seconds
+    have passed or after a connection error
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CHAIN_ID_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._chain_ids: dict[str, tuple[int, float]] = {}
+
+    def get(self, rpc_uri: str) -> int | None:
+        """
+        Return the verified chain id of rpc_uri, None when unknown
+        or expired
+        """
+        with self._lock:
+            entry = self._chain_ids.get(rpc_uri)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def put(self, rpc_uri: str, chain_id: int) -> None:
+        with self._lock:
+            self._chain_ids[rpc_uri] = (chain_id, time.monotonic() + self.ttl)
+
+    def invalidate(self, rpc_uri: str | None = None) -> None:
+        """
+        Forget the chain id of rpc_uri, or of all RPC URIs
+        """
+        with self._lock:
+            if rpc_uri is None:
+                self._chain_ids.clear()
+            else:
+                self._chain_ids.pop(rpc_uri, None)
+
+
+def construct_chain_id_middleware(chain_ids: ChainRegistry, rpc_uri: str) -> Middleware:
+    """
+    Answer eth_chainId requests from the chain registry, including
+    the ones made by web3 to validate each eth_call and transaction
+    """
+
+    def chain_id_middleware(
+        make_request: Callable[[RPCEndpoint, Any], RPCResponse], w3: Web3
+    ) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            if method != 'eth_chainId':
+                return make_request(method, params)
+
+            chain_id = chain_ids.get(rpc_uri)
+            if chain_id is not None:
+                return {'jsonrpc': '2.0', 'id': 0, 'result': hex(chain_id)}
+
+            response = make_request(method, params)
+            if 'result' in response:
+                result = response['result']
+                chain_ids.put(rpc_uri, int(result, 16) if isinstance(result, str) else result)
+            return response
+
+        return middleware
+
+    return chain_id_middleware
+
+
+class ProviderPool:
+    """
+    Process-wide pool of Web3 instances keyed by RPC URI and chain.
+    Instances of the same RPC URI share a keep-alive HTTP session,
+    the POA middleware is injected once when the instance is created
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_PROVIDER_POOL_SIZE,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        chain_id_ttl: float = DEFAULT_CHAIN_ID_TTL,
+        contract_cache_size: int = DEFAULT_CONTRACT_CACHE_SIZE,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.chain_ids = ChainRegistry(ttl=chain_id_ttl)
+        self._lock = threading.Lock()
+        # Evicted sessions are closed, their Web3 instances
+        # reopen connections if still in use
+        self._sessions: LRUCache[str, requests.Session] = LRUCache(
+            maxsize=maxsize, on_evict=lambda rpc_uri, session: session.close()
+        )
+        self._web3: LRUCache[tuple[str, Chains], Web3] = LRUCache(maxsize=maxsize)
+        self._contracts: LRUCache[tuple[str, Chains, str, Path], Contract] = LRUCache(
+            maxsize=contract_cache_size
+        )
+
+    def configure(
+        self, pool_connections: int | None = None, pool_maxsize: int | None = None
+    ) -> None:
+        """
+        Change the HTTP connection pool sizes, sessions and Web3
+        instances created before are dropped from the pool
+        """
+        if pool_connections is not None:
+            self.pool_connections = pool_connections
+        if pool_maxsize is not None:
+            self.pool_maxsize = pool_maxsize
+        self.clear()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get_session(self, rpc_uri: str) -> requests.Session:
+        """
+        Return the HTTP session shared by the Web3 instances of rpc_uri
+        """
+        with self._lock:
+            return self._sessions.get_or_create(rpc_uri, self._create_session)
+
+    def _create_web3(self, rpc_uri: str, chain: Chains) -> Web3:
+        provider = PooledHTTPProvider(
+            rpc_uri, self.get_session(rpc_uri), on_connection_error=self.chain_ids.invalidate
+        )
+        w3 = Web3(provider)
+        w3.middleware_onion.add(
+            construct_chain_id_middleware(self.chain_ids, rpc_uri), 'chain_id_cache'
+        )
+        if chain in POA_CHAINS:
+            w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        return w3
+
+    def get_web3(self, rpc_uri: str, chain: Chains) -> Web3:
+        """
+        Return the Web3 instance for the RPC URI and the chain
+        """
+        return self._web3.get_or_create(
+            (rpc_uri, chain), lambda: self._create_web3(rpc_uri, chain)
+        )
+
+    def get_contract(
+        self, rpc_uri: str, chain: Chains, address: str, abi_name: str | Path
+    ) -> Contract:
+        """
+        Return the contract handle for the address and the ABI,
+        bound to the Web3 instance of the RPC URI and the chain
+        """
+        checksum_address = Web3.to_checksum_address(address)
+        abi_path = get_abi_path(abi_name)
+
+        return self._contracts.get_or_create(
+            (rpc_uri, chain, checksum_address, abi_path),
+            lambda: self.get_web3(rpc_uri, chain).eth.contract(
+                checksum_address, abi=get_frozen_abi(abi_path)
+            ),
+        )
+
+    def batch_call(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        calls: Sequence[ContractFunction],
+        block_identifier: BlockIdentifier = 'latest',
+    ) -> list[Any]:
+        """
+        Execute read calls in a single JSON-RPC batch request.
+        Results are returned in the same order as the calls, reverted
+        calls are returned as ContractLogicError instances. Other
+        errors of the node are raised. Without batch support, the
+        calls are executed one by one
+        """
+        provider = cast(PooledHTTPProvider, self.get_web3(rpc_uri, chain).provider)
+        block = hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+        try:
+            responses = provider.make_batch_request(
+                [
+                    (
+                        RPCEndpoint('eth_call'),
+                        [{'to': call.address, 'data': call._encode_transaction_data()}, block],
+                    )
+                    for call in calls
+                ]
+            )
+        except BatchResponseError:
+            return self._call_sequentially(calls, block_identifier)
+
+        results: list[Any] = []
+        for call, response in zip(calls, responses):
+            if 'error' in response:
+                try:
+                    raise_contract_logic_error_on_revert(response)
+                except ContractLogicError as e:
+                    results.append(e)
+                    continue
+                raise ValueError(response['error'])
+
+            data = Web3.to_bytes(hexstr=response['result'])
+            results.append(decode_call_result(call, data))
+        return results
+
+    @staticmethod
+    def _call_sequentially(
+        calls: Sequence[ContractFunction], block_identifier: BlockIdentifier
+    ) -> list[Any]:
+        results: list[Any] = []
+        for call in calls:
+            try:
+                results.append(call.call(block_identifier=block_identifier))
+            except ContractLogicError as e:
+                results.append(e)
+        return results
+
+    def get_chain_id(self, rpc_uri: str, chain: Chains) -> int:
+        """
+        Return the chain id of rpc_uri, only requested when not
+        verified within the TTL of the chain registry
+        """
+        return int(self.get_web3(rpc_uri, chain).eth.chain_id)
+
+    def clear(self) -> None:
+        """
+        Drop all Web3 instances and close their HTTP sessions
+        """
+        with self._lock:
+            sessions = [self._sessions.pop(uri) for uri in self._sessions.keys()]
+            self._web3.clear()
+            self._contracts.clear()
+        self.chain_ids.invalidate()
+        for session in sessions:
+            if session is not None:
+                session.close()
+
+    def info(self) -> CacheInfo:
+        return self._web3.info()
+
+    def contract_info(self) -> CacheInfo:
+        return self._contracts.info()
+
+
+provider_pool = ProviderPool()
+
+
+def get_web3(rpc_uri: str, chain: Chains) -> Web3:
+    """
+    Return the pooled Web3 instance for the RPC URI and the chain
+    """
+    return provider_pool.get_web3(rpc_uri, chain)
+
+
+def get_chain_id(rpc_uri: str, chain: Chains) -> int:
+    """
+    Return the chain id of the RPC URI, see ProviderPool.get_chain_id
+    """
+    return provider_pool.get_chain_id(rpc_uri, chain)
+
+
+def get_contract(rpc_uri: str, chain: Chains, address: str, abi_name: str | Path) -> Contract:
+    """
+    Return the pooled contract handle, see ProviderPool.get_contract
+    """
+    return provider_pool.get_contract(rpc_uri, chain, address, abi_name)
+
+
+def batch_call(
+    rpc_uri: str,
+    chain: Chains,
+    calls: Sequence[ContractFunction],
+    block_identifier: BlockIdentifier = 'latest',
+) -> list[Any]:
+    """
+    Execute read calls in a single JSON-RPC batch request,
+    see ProviderPool.batch_call
+    """
+    return provider_pool.batch_call(rpc_uri, chain, calls, block_identifier)
+
+
+class AsyncPooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider posting through the sessions of the pool,
+    see PooledHTTPProvider
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        pool: 'AsyncProviderPool',
+        request_kwargs: Any = None,
+        on_connection_error: Callable[[str], None] | None = None,
+    ) -> None:
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self.pool = pool
+        self.on_connection_error = on_connection_error
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        session = self.pool.get_session(str(self.endpoint_uri))
+
+        try:
+            async with session.post(
+                str(self.endpoint_uri), data=request_data, **self.get_request_kwargs()
+            ) as response:
+                response.raise_for_status()
+                raw_response = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if self.on_connection_error is not None:
+                self.on_connection_error(str(self.endpoint_uri))
+            raise
+
+        return self.decode_rpc_response(raw_response)
+
+
+def construct_async_chain_id_middleware(chain_ids: ChainRegistry, rpc_uri: str) -> AsyncMiddleware:
+    """
+    Answer eth_chainId requests from the chain registry,
+    see construct_chain_id_middleware
+    """
+
+    async def chain_id_middleware(make_request: Callable[[RPCEndpoint, Any], Any], w3: Any) -> Any:
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            if method != 'eth_chainId':
+                return cast(RPCResponse, await make_request(method, params))
+
+            chain_id = chain_ids.get(rpc_uri)
+            if chain_id is not None:
+                return {'jsonrpc': '2.0', 'id': 0, 'result': hex(chain_id)}
+
+            response = await make_request(method, params)
+            if 'result' in response:
+                result = response['result']
+                chain_ids.put(rpc_uri, int(result, 16) if isinstance(result, str) else result)
+            return cast(RPCResponse, response)
+
+        return middleware
+
+    return chain_id_middleware
+
+
+class AsyncProviderPool:
+    """
+    Process-wide pool of AsyncWeb3 instances keyed by RPC URI and chain,
+    the asyncio counterpart of ProviderPool. aiohttp sessions are bound
+    to their event loop, so they are shared per RPC URI and loop.
+    Chain ids are verified through the registry of the sync pool
+    """
+
+    def __init__(
+        self,
+        chain_ids: ChainRegistry,
+        maxsize: int = DEFAULT_PROVIDER_POOL_SIZE,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        contract_cache_size: int = DEFAULT_CONTRACT_CACHE_SIZE,
+    ) -> None:
+        self.pool_maxsize = pool_maxsize
+        self.chain_ids = chain_ids
+        # Seconds before closing an evicted session
+        self.session_close_delay: float = REQUEST_TIMEOUT
+        self._sessions: LRUCache[
+            tuple[str, asyncio.AbstractEventLoop], aiohttp.ClientSession
+        ] = LRUCache(maxsize=maxsize, on_evict=self._close_session)
+        self._web3: LRUCache[tuple[str, Chains], AsyncWeb3] = LRUCache(maxsize=maxsize)
+        self._contracts: LRUCache[tuple[str, Chains, str, Path], AsyncContract] = LRUCache(
+            maxsize=contract_cache_size
+        )
+
+    def _close_session(
+        self, key: tuple[str, asyncio.AbstractEventLoop], session: aiohttp.ClientSession
+    ) -> None:
+        """
+        Close an evicted session on its event loop, which may run in
+        another thread, once the requests in progress timed out
+        """
+        loop = key[1]
+        if session.closed or loop.is_closed():
+            return
+
+        def close() -> None:
+            loop.create_task(session.close())
+
+        try:
+            loop.call_soon_threadsafe(loop.call_later, self.session_close_delay, close)
+        except RuntimeError:
+            # The loop has been closed meanwhile
+            pass
+
+    def get_session(self, rpc_uri: str) -> aiohttp.ClientSession:
+        """
+        Return the HTTP session of rpc_uri for the running event loop
+        """
+        key = (rpc_uri, asyncio.get_running_loop())
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+            self._sessions.put(key, session)
+        return session
+
+    def _create_web3(self, rpc_uri: str, chain: Chains) -> AsyncWeb3:
+        provider = AsyncPooledHTTPProvider(
+            rpc_uri, self, on_connection_error=self.chain_ids.invalidate
+        )
+        w3 = AsyncWeb3(provider)
+        w3.middleware_onion.add(
+            construct_async_chain_id_middleware(self.chain_ids, rpc_uri), 'chain_id_cache'
+        )
+        if chain in POA_CHAINS:
+            w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        return w3
+
+    def get_web3(self, rpc_uri: str, chain: Chains) -> AsyncWeb3:
+        """
+        Return the AsyncWeb3 instance for the RPC URI and the chain
+        """
+        return self._web3.get_or_create(
+            (rpc_uri, chain), lambda: self._create_web3(rpc_uri, chain)
+        )
+
+    def get_contract(
+        self, rpc_uri: str, chain: Chains, address: str, abi_name: str | Path
+    ) -> AsyncContract:
+        """
+        Return the async contract handle, see ProviderPool.get_contract
+        """
+        checksum_address = Web3.to_checksum_address(address)
+        abi_path = get_abi_path(abi_name)
+
+        return self._contracts.get_or_create(
+            (rpc_uri, chain, checksum_address, abi_path),
+            lambda: self.get_web3(rpc_uri, chain).eth.contract(
+                checksum_address, abi=get_frozen_abi(abi_path)
+            ),
+        )
+
+    async def get_chain_id(self, rpc_uri: str, chain: Chains) -> int:
+        """
+        Return the chain id of rpc_uri, see ProviderPool.get_chain_id
+        """
+        return int(await self.get_web3(rpc_uri, chain).eth.chain_id)
+
+    async def close(self) -> None:
+        """
+        Close the HTTP sessions of the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        for key in self._sessions.keys():
+            if key[1] is loop:
+                session = self._sessions.pop(key)
+                if session is not None:
+                    await session.close()
+
+
+async_provider_pool = AsyncProviderPool(provider_pool.chain_ids)
+
+
+def get_async_web3(rpc_uri: str, chain: Chains) -> AsyncWeb3:
+    """
+    Return the pooled AsyncWeb3 instance for the RPC URI and the chain
+    """
+    return async_provider_pool.get_web3(rpc_uri, chain)
+
+
+def get_async_contract(
+    rpc_uri: str, chain: Chains, address: str, abi_name: str | Path
+) -> AsyncContract:
+    """
+    Return the pooled async contract handle,
+    see ProviderPool.get_contract
+    """
+    return async_provider_pool.get_contract(rpc_uri, chain, address, abi_name)
+
+
+async def get_async_chain_id(rpc_uri: str, chain: Chains) -> int:
+    """
+    Return the chain id of the RPC URI, see ProviderPool.get_chain_id
+    """
+    return await async_provider_pool.get_chain_id(rpc_uri, chain)
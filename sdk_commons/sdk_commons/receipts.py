@@ -0,0 +1,295 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Generic, TypeVar, cast
+
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import RPCEndpoint, TxReceipt
+
+from sdk_commons.chains import Chains
+from sdk_commons.providers import PooledHTTPProvider, get_web3
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Seconds between two receipt requests for the pending transactions
+DEFAULT_POLL_INTERVAL = 1.0
+# Seconds after which a transaction not included is given up
+DEFAULT_RECEIPT_TIMEOUT = 600.0
+# Seconds waited by PendingTransaction beyond the receipt timeout,
+# in case the poller stops resolving the transactions
+RESULT_TIMEOUT_MARGIN = 60.0
+
+
+def chain_future(future: 'Future[T]', func: Callable[[T], R]) -> 'Future[R]':
+    """
+    Return a future resolved with func applied to the result of future,
+    or with the exception raised by either of them
+    """
+    chained: Future[R] = Future()
+
+    def callback(done: 'Future[T]') -> None:
+        if chained.cancelled():
+            return
+        try:
+            chained.set_result(func(done.result()))
+        except BaseException as e:
+            chained.set_exception(e)
+
+    future.add_done_callback(callback)
+    return chained
+
+
+class PendingTransaction(Generic[T]):
+    """
+    Handle of a broadcast transaction, resolved once it is included.
+    The result can be waited with result() or awaited in asyncio, both
+    raising TimeExhausted after timeout seconds, by default the receipt
+    timeout of the shared poller plus RESULT_TIMEOUT_MARGIN
+    """
+
+    def __init__(
+        self, tx_hash: HexBytes, future: 'Future[T]', timeout: float | None = None
+    ) -> None:
+        self.tx_hash = tx_hash
+        self.future = future
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f'PendingTransaction({self.tx_hash.hex()})'
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self._wait().__await__()
+
+    def _get_timeout(self, timeout: float | None) -> float:
+        if timeout is not None:
+            return timeout
+        if self.timeout is not None:
+            return self.timeout
+        return receipt_poller.timeout + RESULT_TIMEOUT_MARGIN
+
+    def _time_exhausted(self, timeout: float) -> TimeExhausted:
+        return TimeExhausted(
+            f'Transaction {self.tx_hash.hex()} is not resolved after {timeout} seconds'
+        )
+
+    async def _wait(self) -> T:
+        timeout = self._get_timeout(None)
+        try:
+            # Shielded, the shared future must not be cancelled
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self.future)), timeout
+            )
+        except asyncio.TimeoutError:
+            raise self._time_exhausted(timeout) from None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float | None = None) -> T:
+        """
+        Block until the transaction is included and return the result
+        """
+        timeout = self._get_timeout(timeout)
+        try:
+            return self.future.result(timeout)
+        except FutureTimeoutError:
+            raise self._time_exhausted(timeout) from None
+
+
+class _TrackedTransaction:
+    def __init__(self, tx_hash: HexBytes, timeout: float, confirmations: int) -> None:
+        self.tx_hash = tx_hash
+        self.timeout = timeout
+        self.confirmations = confirmations
+        self.deadline = time.monotonic() + timeout
+        self.future: Future[TxReceipt] = Future()
+
+
+class ReceiptPoller:
+    """
+    Track the receipts of many pending transactions from a single
+    background thread. Every poll_interval seconds, the receipts of the
+    transactions pending on each RPC URI are requested in one JSON-RPC
+    batch, together with the latest block number to count the
+    confirmations. The thread is started on demand and exits once no
+    transaction is pending
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._pending: dict[
+            tuple[str, Chains], dict[tuple[HexBytes, int], _TrackedTransaction]
+        ] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def track(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        tx_hash: HexBytes,
+        timeout: float | None = None,
+        confirmations: int = 1,
+    ) -> 'Future[TxReceipt]':
+        """
+        Return a future resolved with the receipt of the transaction
+        once included in confirmations blocks, or failing with
+        TimeExhausted when not included within timeout
+        """
+        if confirmations < 1:
+            raise ValueError(f'Invalid confirmations: {confirmations}')
+
+        tx_hash = HexBytes(tx_hash)
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._lock:
+            # Transactions tracked twice share the same future
+            transactions = self._pending.setdefault((rpc_uri, chain), {})
+            tracked = transactions.get((tx_hash, confirmations))
+            if tracked is None:
+                tracked = _TrackedTransaction(tx_hash, timeout, confirmations)
+                transactions[(tx_hash, confirmations)] = tracked
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='sdk-receipt-poller', daemon=True
+                )
+                self._thread.start()
+
+        return tracked.future
+
+    def pending(self) -> int:
+        """
+        Return the number of transactions waiting for their receipt
+        """
+        with self._lock:
+            return sum(len(transactions) for transactions in self._pending.values())
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+                    pending = {key: list(txs.values()) for key, txs in self._pending.items()}
+
+                for (rpc_uri, chain), transactions in pending.items():
+                    self._poll(rpc_uri, chain, transactions)
+
+                time.sleep(self.poll_interval)
+        except BaseException as e:
+            # Nothing would resolve the pending transactions anymore
+            self._fail_pending(e)
+            raise
+        finally:
+            with self._lock:
+                # The next tracked transaction starts a new thread
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _fail_pending(self, error: BaseException) -> None:
+        with self._lock:
+            pending = [tracked for txs in self._pending.values() for tracked in txs.values()]
+            self._pending.clear()
+        for tracked in pending:
+            self._set_result(tracked, error=error)
+
+    @staticmethod
+    def _set_result(
+        tracked: _TrackedTransaction,
+        receipt: TxReceipt | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        try:
+            if error is not None:
+                tracked.future.set_exception(error)
+            else:
+                tracked.future.set_result(cast(TxReceipt, receipt))
+        except InvalidStateError:
+            # Cancelled by the caller
+            pass
+
+    def _poll(self, rpc_uri: str, chain: Chains, transactions: list[_TrackedTransaction]) -> None:
+        provider = cast(PooledHTTPProvider, get_web3(rpc_uri, chain).provider)
+        try:
+            block_response, *responses = provider.make_batch_request(
+                [
+                    (RPCEndpoint('eth_blockNumber'), []),
+                    *(
+                        (RPCEndpoint('eth_getTransactionReceipt'), [tracked.tx_hash.hex()])
+                        for tracked in transactions
+                    ),
+                ]
+            )
+            block_number = int(block_response['result'], 16)
+        except Exception:
+            # Retried on the next poll, e.g. connection errors or
+            # invalid responses, the deadlines are still enforced
+            block_number = 0
+            responses = [{} for _ in transactions]
+
+        now = time.monotonic()
+        for tracked, response in zip(transactions, responses):
+            receipt = response.get('result') if isinstance(response, dict) else None
+            formatted: TxReceipt | None = None
+            try:
+                if (
+                    receipt is not None
+                    and block_number - int(receipt['blockNumber'], 16) + 1 >= tracked.confirmations
+                ):
+                    formatted = cast(
+                        TxReceipt, AttributeDict.recursive(receipt_formatter(receipt))
+                    )
+            except Exception:
+                # Invalid receipt, requested again on the next poll
+                pass
+
+            if formatted is not None:
+                self._resolve(rpc_uri, chain, tracked)
+                self._set_result(tracked, receipt=formatted)
+            elif tracked.deadline < now:
+                self._resolve(rpc_uri, chain, tracked)
+                self._set_result(
+                    tracked,
+                    error=TimeExhausted(
+                        f'Transaction {tracked.tx_hash.hex()} is not in the chain '
+                        f'after {tracked.timeout} seconds'
+                    ),
+                )
+
+    def _resolve(self, rpc_uri: str, chain: Chains, tracked: _TrackedTransaction) -> None:
+        with self._lock:
+            transactions = self._pending.get((rpc_uri, chain), {})
+            transactions.pop((tracked.tx_hash, tracked.confirmations), None)
+            if not transactions:
+                self._pending.pop((rpc_uri, chain), None)
+
+
+receipt_poller = ReceiptPoller()
+
+
+def track_transaction(
+    rpc_uri: str,
+    chain: Chains,
+    tx_hash: HexBytes,
+    timeout: float | None = None,
+    confirmations: int = 1,
+) -> 'Future[TxReceipt]':
+    """
+    Return a future resolved with the receipt of the transaction,
+    tracked by the shared receipt poller
+    """
+    return receipt_poller.track(rpc_uri, chain, tx_hash, timeout, confirmations)
@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Generator
+from concurrent.futures import Executor
+from typing import Any, TypeVar, cast
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+from web3.types import TxParams, TxReceipt
+
+from sdk_commons.chains import Chains
+from sdk_commons.nonces import nonce_manager
+from sdk_commons.providers import get_web3
+from sdk_commons.receipts import PendingTransaction, chain_future, track_transaction
+
+T = TypeVar('T')
+
+# Steps of a transaction sequence, yielding the transactions
+# to wait for and sent back their receipts
+Steps = Generator[PendingTransaction[TxReceipt], TxReceipt, T]
+
+# Blocks including or built on top of a transaction before the next
+# dependent step, 1 means as soon as the transaction is included
+DEFAULT_CONFIRMATIONS = 1
+
+
+def check_receipt_status(tx_receipt: TxReceipt) -> TxReceipt:
+    """
+    Return the receipt, raising ValueError when the transaction reverted
+    """
+    if tx_receipt['status'] == 0:
+        raise ValueError(f'Transaction reverted: {tx_receipt["transactionHash"].hex()}')
+    return tx_receipt
+
+
+class TransactionSequencer:
+    """
+    Send the transactions of an account with consecutive nonces,
+    assigned locally by the shared nonce manager, so that transactions
+    executed in order by the chain can be broadcast back-to-back
+    without waiting for each other.
+    Transactions depending on the state left by a previous one (e.g. on
+    its gas estimate or on calls) have to wait() for it first, which
+    waits for the confirmations instead of a fixed delay
+    """
+
+    def __init__(
+        self,
+        rpc_uri: str,
+        chain: Chains,
+        public_key: str,
+        private_key: str,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+    ) -> None:
+        self.rpc_uri = rpc_uri
+        self.chain = chain
+        self.w3 = get_web3(rpc_uri, chain)
+        self.address: ChecksumAddress = Web3.to_checksum_address(public_key)
+        self.confirmations = confirmations
+        self._private_key = private_key
+
+    def send(
+        self, function: ContractFunction, tx_params: TxParams | None = None
+    ) -> PendingTransaction[TxReceipt]:
+        """
+        Build, sign and broadcast a contract transaction with the next
+        nonce, returning a handle resolved with its receipt once
+        confirmed. Without gas in tx_params, the gas is estimated on
+        the current state
+        """
+        with nonce_manager.reserve(self.rpc_uri, self.chain, self.address) as nonce:
+            params: TxParams = {**(tx_params or {}), 'nonce': nonce, 'from': self.address}
+            signed_tx = self.w3.eth.account.sign_transaction(
+                function.build_transaction(params), self._private_key
+            )
+            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+
+        receipt = track_transaction(
+            self.rpc_uri, self.chain, tx_hash, confirmations=self.confirmations
+        )
+        nonce_manager.resync_on_timeout(receipt, self.chain, self.address)
+        return PendingTransaction(tx_hash, chain_future(receipt, check_receipt_status))
+
+    def wait(self, *pending: PendingTransaction[TxReceipt]) -> list[TxReceipt]:
+        """
+        Wait for the confirmation of the transactions, raising
+        ValueError when any of them reverted
+        """
+        return [transaction.result() for transaction in pending]
+
+
+def run_steps(steps: Steps[T]) -> T:
+    """
+    Run the steps, blocking on each transaction they wait for,
+    and return their result
+    """
+    try:
+        pending = next(steps)
+        while True:
+            pending = steps.send(pending.result())
+    except StopIteration as e:
+        return cast(T, e.value)
+
+
+async def run_steps_async(steps: Steps[T], executor: Executor | None = None) -> T:
+    """
+    Run the steps in the executor, awaiting the transactions they
+    wait for on the event loop, so that no thread of the executor is
+    blocked on a receipt
+    """
+    loop = asyncio.get_running_loop()
+
+    def advance(receipt: TxReceipt | None) -> tuple[bool, Any]:
+        try:
+            return False, steps.send(receipt)  # type: ignore[arg-type]
+        except StopIteration as e:
+            return True, e.value
+
+    done, value = await loop.run_in_executor(executor, advance, None)
+    while not done:
+        receipt = await value
+        done, value = await loop.run_in_executor(executor, advance, receipt)
+    return cast(T, value)
@@ -0,0 +1,159 @@
+import hashlib
+import hmac
+import os
+from collections.abc import Callable
+from functools import cache
+from typing import Any, Generic, TypeVar
+
+# TODO: waiting new version to fix type hints
+# https://github.com/ethereum/eth-keys/pull/90
+import eth_keys  # type: ignore
+from eth_keys.backends import get_backend, is_coincurve_available  # type: ignore
+from eth_keys.exceptions import BadSignature, ValidationError  # type: ignore
+
+from sdk_commons.cache import CacheInfo, LRUCache
+
+W = TypeVar('W')
+
+# secp256k1 implementations that can be used to sign
+ECC_BACKENDS = {
+    # libsecp256k1 bindings, requires coincurve to be installed
+    'coincurve': 'eth_keys.backends.CoinCurveECCBackend',
+    # pure python implementation
+    'native': 'eth_keys.backends.NativeECCBackend',
+}
+# Environment variable to select the backend, one of ECC_BACKENDS
+# or auto to use coincurve when installed and native otherwise
+ECC_BACKEND_ENV = 'SDK_ECC_BACKEND'
+
+# Order of the secp256k1 curve, signature r and s must be lower
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Maximum number of signers kept in memory by each SignerCache
+SIGNER_CACHE_SIZE = 32
+
+_selected_backend: str | None = None
+# Process-local secret, fingerprints can't be matched against keys
+# outside of this process
+_fingerprint_secret = os.urandom(32)
+
+
+def set_ecc_backend(name: str | None) -> None:
+    """
+    Select the secp256k1 backend used by wallets created afterwards.
+    With None the backend is selected from the environment
+    """
+    if name is not None and name != 'auto' and name not in ECC_BACKENDS:
+        raise ValueError(f'Invalid ECC backend: {name}')
+
+    global _selected_backend
+    _selected_backend = name
+
+
+def get_ecc_backend_name() -> str:
+    """
+    Return the name of the selected secp256k1 backend
+    """
+    name = _selected_backend or os.getenv(ECC_BACKEND_ENV) or 'auto'
+
+    if name == 'auto':
+        return 'coincurve' if is_coincurve_available() else 'native'
+
+    if name not in ECC_BACKENDS:
+        raise ValueError(f'Invalid ECC backend: {name}')
+
+    return name
+
+
+@cache
+def _get_ecc_backend(name: str) -> Any:
+    try:
+        return get_backend(ECC_BACKENDS[name])
+    except ImportError:
+        raise ValueError(f'ECC backend {name} is not available, is {name} installed?')
+
+
+def get_ecc_backend(name: str | None = None) -> Any:
+    """
+    Return the secp256k1 backend, by default the selected one
+    """
+    return _get_ecc_backend(name or get_ecc_backend_name())
+
+
+def get_private_key(private_key: str, backend: str | None = None) -> Any:
+    """
+    Create an eth_keys private key from a hex string with 0x prefix,
+    signing through the given or the selected secp256k1 backend
+    """
+    return eth_keys.keys.PrivateKey(
+        bytes.fromhex(private_key[2:]), backend=get_ecc_backend(backend)
+    )
+
+
+def get_key_fingerprint(private_key: str) -> str:
+    """
+    Identify a private key without exposing it, e.g. to use it
+    as a cache key. Fingerprints are only valid within the process
+    """
+    normalized = private_key.lower().removeprefix('0x').encode()
+    return hmac.new(_fingerprint_secret, normalized, hashlib.sha256).hexdigest()
+
+
+class SignerCache(Generic[W]):
+    """
+    Bounded, process-local cache of signers (e.g. wallets) keyed by
+    the fingerprint of their private key, so that repeated signing
+    with the same key skips key parsing and public key derivation.
+    Private keys are never stored as keys nor logged
+    """
+
+    def __init__(self, maxsize: int = SIGNER_CACHE_SIZE) -> None:
+        self._cache: LRUCache[tuple[str, str | None, str], W] = LRUCache(maxsize=maxsize)
+
+    def _get_key(self, private_key: str, public_key: str | None) -> tuple[str, str | None, str]:
+        return (get_key_fingerprint(private_key), public_key, get_ecc_backend_name())
+
+    def get(self, private_key: str, public_key: str | None, factory: Callable[[], W]) -> W:
+        """
+        Return the signer for the keys, creating it with factory
+        when missing
+        """
+        return self._cache.get_or_create(self._get_key(private_key, public_key), factory)
+
+    def evict(self, private_key: str) -> int:
+        """
+        Remove all signers created for the private key,
+        returning how many have been removed
+        """
+        fingerprint = get_key_fingerprint(private_key)
+        keys = [key for key in self._cache.keys() if key[0] == fingerprint]
+        for key in keys:
+            self._cache.pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Remove all signers
+        """
+        self._cache.clear()
+
+    def info(self) -> CacheInfo:
+        return self._cache.info()
+
+
+def recover_signer(message_hash: bytes, v: int, r: int, s: int) -> str | None:
+    """
+    Recover the checksum address that signed message_hash, mirroring
+    the ecrecover precompile: v must be 27 or 28, r and s must be in
+    the curve order. Return None when the signature is malformed
+    """
+    if v not in (27, 28) or not 0 < r < SECP256K1_N or not 0 < s < SECP256K1_N:
+        return None
+
+    try:
+        signature = eth_keys.keys.Signature(vrs=(v - 27, r, s), backend=get_ecc_backend())
+        public_key = signature.recover_public_key_from_msg_hash(message_hash)
+    except (BadSignature, ValidationError):
+        return None
+
+    return str(public_key.to_checksum_address())
@@ -0,0 +1,229 @@
+import asyncio
+import atexit
+import json
+import os
+import threading
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from web3 import Web3
+
+from sdk_commons.chains import Chains
+from sdk_commons.helpers import dump_json_atomic
+from sdk_commons.multicall import aggregate
+from sdk_commons.providers import get_async_contract, get_contract, get_web3
+
+# Environment variable with the path of the JSON file used to persist
+# token metadata across restarts, metadata is kept in memory when unset
+TOKEN_METADATA_PATH_ENV = 'SDK_TOKEN_METADATA_PATH'
+# Seconds new tokens are batched before writing the JSON file
+DEFAULT_SAVE_DELAY = 1.0
+
+
+class TokenMetadata(NamedTuple):
+    name: str
+    symbol: str
+    decimals: int
+
+
+class TokenMetadataCache:
+    """
+    Thread-safe cache of ERC20 name, symbol and decimals keyed by chain
+    and token address. These values are immutable, so entries never
+    expire. When a path is set, the cache is loaded from and written to
+    a JSON file, formatted as:
+
+        {"<chain id>": {"<token address>": {"name": ..., "symbol": ...,
+                                            "decimals": ...}}}
+
+    Tokens added by put are written together save_delay seconds later,
+    or by save(), which is also called at exit
+    """
+
+    def __init__(
+        self, path: str | Path | None = None, save_delay: float = DEFAULT_SAVE_DELAY
+    ) -> None:
+        self.save_delay = save_delay
+        self._data: dict[tuple[int, str], TokenMetadata] = {}
+        self._lock = threading.RLock()
+        self._path: Path | None = None
+        self._loaded = False
+        self._dirty = False
+        self._save_timer: threading.Timer | None = None
+        if path is not None:
+            self.configure(path)
+
+    @staticmethod
+    def _get_key(chain: Chains | int, address: str) -> tuple[int, str]:
+        chain_id = chain.value if isinstance(chain, Chains) else int(chain)
+        return (chain_id, Web3.to_checksum_address(address))
+
+    @property
+    def path(self) -> Path | None:
+        """
+        Path of the JSON file, by default taken from the environment
+        """
+        if self._path is not None:
+            return self._path
+        path = os.getenv(TOKEN_METADATA_PATH_ENV)
+        return Path(path) if path else None
+
+    def configure(self, path: str | Path | None) -> None:
+        """
+        Set the JSON file used to persist the cache and load it,
+        with None the path is taken from the environment
+        """
+        with self._lock:
+            self._path = Path(path) if path is not None else None
+            self._loaded = False
+            self._load_file()
+
+    def _load_file(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            path = self.path
+            if path is None or not path.exists():
+                return
+
+            with open(path) as f:
+                self.seed(json.load(f), persist=False)
+
+    def _write_file(self) -> None:
+        with self._lock:
+            self._dirty = False
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+            path = self.path
+            if path is None:
+                return
+
+            data: dict[str, dict[str, dict[str, Any]]] = {}
+            for (chain, address), metadata in sorted(self._data.items()):
+                data.setdefault(str(chain), {})[address] = metadata._asdict()
+            dump_json_atomic(path, data)
+
+    def save(self) -> None:
+        """
+        Write the tokens added since the last write to the JSON file
+        """
+        with self._lock:
+            if self._dirty:
+                self._write_file()
+
+    def seed(
+        self, tokens: Mapping[str | int, Mapping[str, Mapping[str, Any]]], persist: bool = True
+    ) -> None:
+        """
+        Add the metadata of known tokens, e.g. from a config file,
+        using the same format as the JSON file
+        """
+        with self._lock:
+            for chain, chain_tokens in tokens.items():
+                for address, metadata in chain_tokens.items():
+                    self._data[self._get_key(int(chain), address)] = TokenMetadata(
+                        name=str(metadata['name']),
+                        symbol=str(metadata['symbol']),
+                        decimals=int(metadata['decimals']),
+                    )
+            if persist:
+                self._write_file()
+
+    def get(self, chain: Chains | int, address: str) -> TokenMetadata | None:
+        """
+        Return the metadata of the token, or None when missing
+        """
+        with self._lock:
+            self._load_file()
+            return self._data.get(self._get_key(chain, address))
+
+    def put(self, chain: Chains | int, address: str, metadata: TokenMetadata) -> None:
+        """
+        Store the metadata of the token, the JSON file if any
+        is written save_delay seconds later
+        """
+        with self._lock:
+            self._load_file()
+            self._data[self._get_key(chain, address)] = metadata
+            if self.path is None:
+                return
+
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def get_or_create(
+        self, chain: Chains | int, address: str, factory: Callable[[], TokenMetadata]
+    ) -> TokenMetadata:
+        """
+        Return the metadata of the token, fetching it with factory
+        when missing. The factory is executed outside of the lock
+        """
+        metadata = self.get(chain, address)
+        if metadata is None:
+            metadata = factory()
+            self.put(chain, address, metadata)
+        return metadata
+
+    def clear(self) -> None:
+        """
+        Remove all tokens from memory, the JSON file is left untouched
+        """
+        with self._lock:
+            self._data.clear()
+            self._loaded = True
+            self._dirty = False
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+token_metadata = TokenMetadataCache()
+atexit.register(token_metadata.save)
+
+
+def get_token_metadata(rpc_uri: str, chain: Chains, address: str) -> TokenMetadata:
+    """
+    Return name, symbol and decimals of an ERC20 token, fetched
+    in a single request on first access
+    """
+
+    def fetch() -> TokenMetadata:
+        token = get_contract(rpc_uri, chain, address, 'ERC20')
+        name, symbol, decimals = aggregate(
+            get_web3(rpc_uri, chain),
+            chain,
+            [token.functions.name(), token.functions.symbol(), token.functions.decimals()],
+        )
+        return TokenMetadata(name=name, symbol=symbol, decimals=decimals)
+
+    return token_metadata.get_or_create(chain, address, fetch)
+
+
+async def get_async_token_metadata(rpc_uri: str, chain: Chains, address: str) -> TokenMetadata:
+    """
+    Return name, symbol and decimals of an ERC20 token, fetched
+    concurrently on first access
+    """
+    metadata = token_metadata.get(chain, address)
+    if metadata is None:
+        token = get_async_contract(rpc_uri, chain, address, 'ERC20')
+        name, symbol, decimals = await asyncio.gather(
+            token.functions.name().call(),
+            token.functions.symbol().call(),
+            token.functions.decimals().call(),
+        )
+        metadata = TokenMetadata(name=name, symbol=symbol, decimals=decimals)
+        token_metadata.put(chain, address, metadata)
+    return metadata
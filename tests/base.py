@@ -2,7 +2,7 @@ from enum import Enum
 from importlib import import_module
 from inspect import Parameter, signature
 
-from sdk_commons.config import SDKConfig
+from sdk_commons.config import AsyncSDKConfig, SDKConfig
 
 
 class VenuePackages(Enum):
@@ -17,6 +17,12 @@ VENUES = [
     VenuePackages.THETANUTS.value,
 ]
 
+# Venues implementing the asyncio interface
+ASYNC_VENUES = [
+    VenuePackages.RIBBON.value,
+    VenuePackages.THETANUTS.value,
+]
+
 
 class TestsBase:
     def setUp(self):
@@ -37,10 +43,10 @@ class TestsBase:
 
         return c
 
-    def get_config_class(self, venue: str):
+    def get_config_class(self, venue: str, base: type = SDKConfig):
         """
         Scan the venue.config module to search
-        a class inheriting SDKConfig
+        a class inheriting base (SDKConfig by default)
         """
         module = self.import_module(venue, "config")
         config_class = None
@@ -55,17 +61,26 @@ class TestsBase:
             if module.__name__ not in cls.__module__:
                 continue
 
-            # exclude all classes not children of SDKConfig
-            if not issubclass(cls, SDKConfig):
+            # exclude all classes not children of base
+            if not issubclass(cls, base):
                 continue
 
             config_class = name
             break
 
-        assert config_class is not None, f"Can't any class inheriting SDKConfig in {venue}.config"
+        assert (
+            config_class is not None
+        ), f"Can't any class inheriting {base.__name__} in {venue}.config"
 
         return config_class
 
+    def get_async_config_class(self, venue: str):
+        """
+        Scan the venue.config module to search
+        a class inheriting AsyncSDKConfig
+        """
+        return self.get_config_class(venue, base=AsyncSDKConfig)
+
     @staticmethod
     def inspect_method_signature(method: callable, reference: callable):
         """
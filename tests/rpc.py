@@ -0,0 +1,107 @@
+import json
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+import requests
+from hexbytes import HexBytes
+
+from sdk_commons.chains import Chains
+from sdk_commons.providers import provider_pool
+
+
+class RPCError(Exception):
+    """
+    Raised by handlers to answer with a JSON-RPC error
+    """
+
+    def __init__(self, code: int, message: str, data: Any = None) -> None:
+        super().__init__(message)
+        self.error = {'code': code, 'message': message}
+        if data is not None:
+            self.error['data'] = data
+
+
+def make_receipt(tx_hash: HexBytes, block: int, status: int = 1) -> dict:
+    """
+    Return a receipt in JSON-RPC format
+    """
+    return {
+        'transactionHash': tx_hash.hex(),
+        'transactionIndex': '0x0',
+        'blockHash': '0x' + '00' * 32,
+        'blockNumber': hex(block),
+        'from': '0x' + '11' * 20,
+        'to': '0x' + '22' * 20,
+        'cumulativeGasUsed': '0x5208',
+        'gasUsed': '0x5208',
+        'effectiveGasPrice': '0x1',
+        'contractAddress': None,
+        'logs': [],
+        'logsBloom': '0x' + '00' * 256,
+        'status': hex(status),
+        'type': '0x2',
+    }
+
+
+class FakeRPCSession(requests.Session):
+    """
+    Session answering JSON-RPC requests with handlers by method,
+    called with the params. Batches are answered request by request,
+    or with batch_response when set
+    """
+
+    def __init__(self, handlers: dict[str, Callable[[list], Any]] | None = None) -> None:
+        super().__init__()
+        self.handlers = dict(handlers or {})
+        self.batch_response: Any = None
+        # Every request, including the ones of batches
+        self.requests: list[dict] = []
+        self.batches = 0
+
+    def calls(self, method: str) -> list[list]:
+        return [request['params'] for request in self.requests if request['method'] == method]
+
+    def _answer(self, request: dict) -> dict:
+        self.requests.append(request)
+        response = {'jsonrpc': '2.0', 'id': request['id']}
+        handler = self.handlers.get(request['method'])
+        if handler is None:
+            response['error'] = {'code': -32601, 'message': 'method not found'}
+            return response
+
+        try:
+            response['result'] = handler(request['params'])
+        except RPCError as e:
+            response['error'] = e.error
+        return response
+
+    def post(self, url: Any, data: Any = None, **kwargs: Any) -> Any:
+        payload = json.loads(data)
+        if isinstance(payload, list):
+            self.batches += 1
+            if self.batch_response is not None:
+                body = self.batch_response
+            else:
+                body = [self._answer(request) for request in payload]
+        else:
+            body = self._answer(payload)
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        return response
+
+
+def connect(
+    chain: Chains, handlers: dict[str, Callable[[list], Any]] | None = None
+) -> tuple[str, FakeRPCSession]:
+    """
+    Return a new RPC URI of the shared provider pool, answered by
+    a fake session with the chain id already verified
+    """
+    rpc_uri = f'http://fake-rpc/{uuid4().hex}'
+    session = FakeRPCSession(handlers)
+    provider_pool._sessions.put(rpc_uri, session)
+    provider_pool.chain_ids.put(rpc_uri, chain.value)
+    return rpc_uri, session
@@ -0,0 +1,61 @@
+from inspect import iscoroutinefunction
+
+import pytest
+
+from sdk_commons.config import AsyncSDKConfig
+from tests.base import ASYNC_VENUES, TestsBase
+
+ASYNC_METHODS = [
+    "create_offer",
+    "get_otoken_details",
+    "get_offer_details",
+    "sign_bid",
+    "validate_bid",
+    "verify_allowance",
+]
+
+
+class TestAsyncConfig(TestsBase):
+    @pytest.mark.parametrize("venue", ASYNC_VENUES)
+    def test_can_import_async_config_class(self, venue: str):
+        """Verify that venue.config contains an async config class"""
+
+        config_class = self.get_async_config_class(venue)
+
+        self.import_class(venue, "config", config_class)
+
+    @pytest.mark.parametrize("venue", ASYNC_VENUES)
+    def test_can_instantiate_async_config_class(self, venue: str):
+        """
+        Verify that the async config class can be instantiated.
+        This test can fail if the config class does not
+        correctly implement all abstract methods
+        """
+
+        config_class = self.import_class(venue, "config", self.get_async_config_class(venue))
+        config_class()
+
+    @pytest.mark.parametrize("method", ASYNC_METHODS)
+    @pytest.mark.parametrize("venue", ASYNC_VENUES)
+    def test_async_method_signature(self, venue: str, method: str):
+        """Verify the method is a coroutine matching the interface"""
+
+        config_class = self.import_class(venue, "config", self.get_async_config_class(venue))
+        c = config_class()
+
+        assert iscoroutinefunction(getattr(c, method)), f"{venue} {method} is not async"
+
+        self.inspect_method_signature(
+            getattr(c, method),
+            reference=getattr(AsyncSDKConfig, method),
+        )
+
+    @pytest.mark.parametrize("venue", ASYNC_VENUES)
+    def test_async_config_matches_sync_config(self, venue: str):
+        """Verify the async config class supports the same chains"""
+
+        config_class = self.import_class(venue, "config", self.get_config_class(venue))
+        async_config_class = self.import_class(venue, "config", self.get_async_config_class(venue))
+
+        assert async_config_class.supported_chains == config_class.supported_chains
+        assert async_config_class.authorization_pages == config_class.authorization_pages
@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from sdk_commons.cache import LRUCache
+from sdk_commons.providers import AsyncProviderPool, ChainRegistry, ProviderPool
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+
+        assert cache.keys() == ['a', 'c']
+        assert cache.info().evictions == 1
+
+    def test_on_evict(self):
+        on_evict = MagicMock()
+        cache: LRUCache[str, int] = LRUCache(maxsize=1, on_evict=on_evict)
+        cache.put('a', 1)
+        cache.put('a', 2)
+        on_evict.assert_not_called()
+
+        cache.put('b', 3)
+        on_evict.assert_called_once_with('a', 2)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestProviderPool:
+    def test_evicted_sessions_are_closed(self):
+        pool = ProviderPool(maxsize=1)
+        session = pool.get_session('http://localhost:1')
+        session.close = MagicMock()
+
+        assert pool.get_session('http://localhost:1') is session
+        session.close.assert_not_called()
+
+        pool.get_session('http://localhost:2')
+        session.close.assert_called_once_with()
+
+
+class TestAsyncProviderPool:
+    def test_evicted_sessions_are_closed(self):
+        pool = AsyncProviderPool(ChainRegistry(), maxsize=1)
+        pool.session_close_delay = 0
+
+        async def run():
+            session = pool.get_session('http://localhost:1')
+            assert pool.get_session('http://localhost:1') is session
+
+            other_session = pool.get_session('http://localhost:2')
+            await asyncio.sleep(0.1)
+            assert session.closed
+            assert not other_session.closed
+
+            await pool.close()
+            assert other_session.closed
+
+        asyncio.run(run())
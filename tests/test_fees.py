@@ -0,0 +1,88 @@
+from sdk_commons.chains import Chains
+from sdk_commons.fees import FeeOracle, FeeStrategy
+from tests.rpc import RPCError, connect
+
+FEE_HISTORY = {
+    'oldestBlock': hex(0x10),
+    'baseFeePerGas': [hex(90), hex(100), hex(110), hex(120)],
+    'gasUsedRatio': [0.5, 0.5, 0.5],
+    # Rewards of the 10th, 50th and 90th percentiles, the empty
+    # block is ignored
+    'reward': [
+        [hex(1), hex(5), hex(9)],
+        [hex(0), hex(0), hex(0)],
+        [hex(3), hex(7), hex(11)],
+    ],
+}
+
+
+def method_not_found(params):
+    raise RPCError(-32601, 'method not found')
+
+
+class TestFeeOracle:
+    def test_fee_history(self):
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_feeHistory': lambda params: FEE_HISTORY})
+        oracle = FeeOracle()
+
+        estimate = oracle.get_estimate(rpc_uri, Chains.ETHEREUM)
+        assert estimate.base_fee == 120
+        assert estimate.priority_fees == {
+            FeeStrategy.CHEAP: 2,
+            FeeStrategy.NORMAL: 6,
+            FeeStrategy.FAST: 10,
+        }
+
+        assert oracle.get_tx_params(rpc_uri, Chains.ETHEREUM, FeeStrategy.FAST) == {
+            'maxPriorityFeePerGas': 10,
+            'maxFeePerGas': 250,
+        }
+        # At least the minimum priority fee
+        assert oracle.get_tx_params(rpc_uri, Chains.ETHEREUM, min_priority_fee=20) == {
+            'maxPriorityFeePerGas': 20,
+            'maxFeePerGas': 260,
+        }
+        assert len(session.calls('eth_feeHistory')) == 1
+
+    def test_cache(self):
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_feeHistory': lambda params: FEE_HISTORY})
+        oracle = FeeOracle(ttl=60)
+
+        oracle.get_tx_params(rpc_uri, Chains.ETHEREUM)
+        oracle.get_tx_params(rpc_uri, Chains.ETHEREUM)
+        assert len(session.calls('eth_feeHistory')) == 1
+
+        oracle.invalidate(rpc_uri)
+        oracle.get_tx_params(rpc_uri, Chains.ETHEREUM)
+        assert len(session.calls('eth_feeHistory')) == 2
+
+    def test_ttl(self):
+        # Reused for about a block by default
+        assert FeeOracle().get_ttl(Chains.ETHEREUM) == 12
+        assert FeeOracle().get_ttl(Chains.MATIC) == 2
+        assert FeeOracle(ttl=5).get_ttl(Chains.ETHEREUM) == 5
+
+    def test_legacy_chain(self):
+        rpc_uri, session = connect(
+            Chains.BSC,
+            {
+                'eth_feeHistory': lambda params: FEE_HISTORY,
+                'eth_gasPrice': lambda params: hex(5000),
+            },
+        )
+
+        assert FeeOracle().get_tx_params(rpc_uri, Chains.BSC) == {'gasPrice': 5000}
+        assert session.calls('eth_feeHistory') == []
+
+    def test_fee_history_not_supported(self):
+        rpc_uri, _ = connect(
+            Chains.ETHEREUM,
+            {
+                'eth_feeHistory': method_not_found,
+                'eth_gasPrice': lambda params: hex(5000),
+            },
+        )
+
+        estimate = FeeOracle().get_estimate(rpc_uri, Chains.ETHEREUM)
+        assert estimate.gas_price == 5000
+        assert FeeOracle().get_tx_params(rpc_uri, Chains.ETHEREUM) == {'gasPrice': 5000}
@@ -0,0 +1,57 @@
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from sdk_commons.chains import Chains
+from sdk_commons.gas import GasEstimator
+from sdk_commons.providers import get_contract
+from tests.rpc import RPCError, connect
+
+TOKEN = '0x' + '11' * 20
+SPENDER = Web3.to_checksum_address('0x' + '22' * 20)
+
+
+def connect_token(estimate_gas):
+    rpc_uri, session = connect(Chains.ETHEREUM, {'eth_estimateGas': estimate_gas})
+    return get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20'), session
+
+
+class TestGasEstimator:
+    def test_cached_with_margin(self):
+        token, session = connect_token(lambda params: hex(50000))
+        estimator = GasEstimator(margin=1.5)
+
+        for amount in (1, 2):
+            gas_limit = estimator.get_gas_limit(
+                Chains.ETHEREUM, token.functions.approve(SPENDER, amount)
+            )
+            assert gas_limit == 75000
+        assert len(session.calls('eth_estimateGas')) == 1
+        assert estimator.info() == (1, 1, 0, 1)
+
+        estimator.invalidate(Chains.ETHEREUM, TOKEN)
+        estimator.get_gas_limit(Chains.ETHEREUM, token.functions.approve(SPENDER, 1))
+        assert len(session.calls('eth_estimateGas')) == 2
+
+    def test_estimated_again_after_ttl(self):
+        token, session = connect_token(lambda params: hex(50000))
+        estimator = GasEstimator(ttl=-1)
+
+        for _ in range(2):
+            estimator.get_gas_limit(Chains.ETHEREUM, token.functions.approve(SPENDER, 1))
+        assert len(session.calls('eth_estimateGas')) == 2
+
+    def test_fallback(self):
+        def estimate_gas(params):
+            raise RPCError(3, 'execution reverted', '0x')
+
+        token, session = connect_token(estimate_gas)
+        estimator = GasEstimator()
+        function = token.functions.approve(SPENDER, 1)
+
+        assert estimator.get_gas_limit(Chains.ETHEREUM, function, fallback=100000) == 100000
+        with pytest.raises(ContractLogicError):
+            estimator.get_gas_limit(Chains.ETHEREUM, function)
+        # Failed estimates are not cached
+        assert len(session.calls('eth_estimateGas')) == 2
+        assert estimator.info().fallbacks == 1
@@ -0,0 +1,31 @@
+import copy
+import json
+import pickle
+from collections.abc import Mapping
+
+from sdk_commons.helpers import get_abi, get_abi_selectors, get_frozen_abi
+
+
+class TestGetAbi:
+    def test_plain_json(self):
+        abi = get_abi('ERC20')
+        assert isinstance(abi, list)
+        assert all(isinstance(element, dict) for element in abi)
+        assert json.loads(json.dumps(abi)) == abi
+        assert copy.deepcopy(abi) == abi
+        assert pickle.loads(pickle.dumps(abi)) == abi
+
+    def test_copies(self):
+        abi = get_abi('ERC20')
+        abi.clear()
+        # Each caller gets its own copy
+        assert get_abi('ERC20')
+        assert get_abi('ERC20') is not get_abi('ERC20')
+
+    def test_frozen(self):
+        abi = get_frozen_abi('ERC20')
+        assert abi is get_frozen_abi('ERC20')
+        assert isinstance(abi, tuple)
+        assert all(isinstance(element, Mapping) for element in abi)
+        assert len(abi) == len(get_abi('ERC20'))
+        assert 'transfer(address,uint256)' in get_abi_selectors('ERC20')
@@ -0,0 +1,87 @@
+import pytest
+from eth_abi import encode
+from web3.exceptions import ContractLogicError
+
+from sdk_commons.chains import Chains
+from sdk_commons.multicall import AGGREGATE3_SELECTOR, MULTICALL3_ADDRESS, aggregate
+from sdk_commons.providers import get_contract, get_web3
+from tests.rpc import RPCError, connect
+
+TOKEN = '0x' + '11' * 20
+DECIMALS = '0x313ce567'
+SYMBOL = '0x95d89b41'
+
+
+def token_call(params):
+    if params[0]['data'] == DECIMALS:
+        return '0x' + encode(['uint8'], [18]).hex()
+    if params[0]['data'] == SYMBOL:
+        return '0x' + encode(['string'], ['USDC']).hex()
+    raise RPCError(3, 'execution reverted', '0x')
+
+
+class TestAggregate:
+    def test_multicall(self):
+        def call(params):
+            if params[0]['to'].lower() != MULTICALL3_ADDRESS.lower():
+                return token_call(params)
+            assert params[0]['data'].startswith('0x' + AGGREGATE3_SELECTOR.hex())
+            results = [
+                (True, encode(['uint8'], [18])),
+                (True, encode(['string'], ['USDC'])),
+                (False, b''),
+            ]
+            return '0x' + encode(['(bool,bytes)[]'], [results]).hex()
+
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_call': call})
+        token = get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20')
+
+        # The failed call is repeated alone to raise its error
+        with pytest.raises(ContractLogicError):
+            aggregate(
+                get_web3(rpc_uri, Chains.ETHEREUM),
+                Chains.ETHEREUM,
+                [token.functions.decimals(), token.functions.symbol(), token.functions.name()],
+            )
+        assert len(session.calls('eth_call')) == 2
+
+        session.requests.clear()
+        results = aggregate(
+            get_web3(rpc_uri, Chains.ETHEREUM),
+            Chains.ETHEREUM,
+            [token.functions.decimals(), token.functions.symbol()],
+        )
+        assert results == [18, 'USDC']
+        assert len(session.calls('eth_call')) == 1
+
+    def test_multicall_not_deployed(self):
+        def call(params):
+            if params[0]['to'].lower() == MULTICALL3_ADDRESS.lower():
+                # No code at the address
+                return '0x'
+            return token_call(params)
+
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_call': call})
+        token = get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20')
+
+        results = aggregate(
+            get_web3(rpc_uri, Chains.ETHEREUM),
+            Chains.ETHEREUM,
+            [token.functions.decimals(), token.functions.symbol()],
+        )
+
+        assert results == [18, 'USDC']
+        assert len(session.calls('eth_call')) == 3
+
+    def test_chain_without_multicall(self):
+        rpc_uri, session = connect(Chains.SOLANA_DEV, {'eth_call': token_call})
+        token = get_contract(rpc_uri, Chains.SOLANA_DEV, TOKEN, 'ERC20')
+
+        results = aggregate(
+            get_web3(rpc_uri, Chains.SOLANA_DEV),
+            Chains.SOLANA_DEV,
+            [token.functions.decimals(), token.functions.symbol()],
+        )
+
+        assert results == [18, 'USDC']
+        assert [params[0]['to'].lower() for params in session.calls('eth_call')] == [TOKEN] * 2
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+
+from sdk_commons import nonces
+from sdk_commons.chains import Chains
+from sdk_commons.nonces import NonceManager
+from tests.rpc import RPCError, connect
+
+
+def get_address() -> str:
+    return Web3.to_checksum_address('0x' + uuid4().hex + '0' * 8)
+
+
+class TestNonceManager:
+    def test_unique_nonces_across_threads(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def get_transaction_count(params):
+            started.set()
+            release.wait(2)
+            return '0x5'
+
+        rpc_uri, session = connect(
+            Chains.ETHEREUM, {'eth_getTransactionCount': get_transaction_count}
+        )
+        nonce_manager = NonceManager()
+        address = get_address()
+
+        with ThreadPoolExecutor(8) as executor:
+            futures = [
+                executor.submit(nonce_manager.get_nonce, rpc_uri, Chains.ETHEREUM, address)
+                for _ in range(8)
+            ]
+            started.wait(2)
+            # The account is not locked during the sync
+            assert nonce_manager._get_account(Chains.ETHEREUM, address).lock.acquire(timeout=1)
+            nonce_manager._get_account(Chains.ETHEREUM, address).lock.release()
+            release.set()
+            assigned = sorted(future.result(timeout=2) for future in futures)
+
+        assert assigned == list(range(5, 13))
+        assert len(session.calls('eth_getTransactionCount')) == 1
+
+    def test_single_sync_async(self, monkeypatch):
+        calls = []
+
+        async def get_transaction_count(address, block_identifier):
+            calls.append(address)
+            await asyncio.sleep(0.01)
+            return 5
+
+        w3 = SimpleNamespace(eth=SimpleNamespace(get_transaction_count=get_transaction_count))
+        monkeypatch.setattr(nonces, 'get_async_web3', lambda rpc_uri, chain: w3)
+        nonce_manager = NonceManager()
+        address = get_address()
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    nonce_manager.get_nonce_async('http://localhost', Chains.ETHEREUM, address)
+                    for _ in range(4)
+                )
+            )
+
+        assert sorted(asyncio.run(run())) == [5, 6, 7, 8]
+        assert calls == [address]
+
+    def test_resync_after_error(self):
+        counts = [RPCError(-32000, 'unavailable'), '0x3']
+
+        def get_transaction_count(params):
+            count = counts.pop(0)
+            if isinstance(count, Exception):
+                raise count
+            return count
+
+        rpc_uri, _ = connect(Chains.ETHEREUM, {'eth_getTransactionCount': get_transaction_count})
+        nonce_manager = NonceManager()
+        address = get_address()
+
+        with pytest.raises(ValueError):
+            nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address)
+        assert nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address) == 3
+
+        counts.append('0x4')
+        with pytest.raises(OSError):
+            with nonce_manager.reserve(rpc_uri, Chains.ETHEREUM, address) as nonce:
+                assert nonce == 4
+                raise OSError('broadcast failed')
+        # The nonce of the failed broadcast is assigned again
+        assert nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address) == 4
+
+    def test_resync_on_timeout(self):
+        counts = ['0x1', '0x2']
+        rpc_uri, _ = connect(
+            Chains.ETHEREUM, {'eth_getTransactionCount': lambda params: counts.pop(0)}
+        )
+        nonce_manager = NonceManager()
+        address = get_address()
+        assert nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address) == 1
+
+        included: Future[None] = Future()
+        nonce_manager.resync_on_timeout(included, Chains.ETHEREUM, address)
+        included.set_result(None)
+        assert nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address) == 2
+
+        dropped: Future[None] = Future()
+        nonce_manager.resync_on_timeout(dropped, Chains.ETHEREUM, address)
+        dropped.set_exception(TimeExhausted())
+        # Synced again, the dropped transaction left a gap
+        assert nonce_manager.get_nonce(rpc_uri, Chains.ETHEREUM, address) == 2
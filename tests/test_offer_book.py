@@ -0,0 +1,191 @@
+import time
+from uuid import uuid4
+
+from eth_abi import encode
+from web3 import Web3
+
+from ribbon.config import RibbonSDKConfig
+from ribbon.definitions import ContractConfig
+from ribbon.offer_book import OFFER_TOPICS, OfferBook, register_offer_book, unregister_offer_book
+from sdk_commons.chains import Chains
+from tests.rpc import connect
+
+TOPICS = {name: topic for topic, name in OFFER_TOPICS.items()}
+SELLER = Web3.to_checksum_address('0x' + '22' * 20)
+OTOKEN = Web3.to_checksum_address('0x' + '33' * 20)
+BIDDING_TOKEN = Web3.to_checksum_address('0x' + '44' * 20)
+SIGNER_WALLET = Web3.to_checksum_address('0x' + '55' * 20)
+
+
+def get_address() -> str:
+    return Web3.to_checksum_address('0x' + uuid4().hex + '0' * 8)
+
+
+def word(value: int | str) -> str:
+    if isinstance(value, str):
+        return '0x' + encode(['address'], [value]).hex()
+    return '0x' + encode(['uint256'], [value]).hex()
+
+
+def make_log(address: str, block: int, topics: list[str], data: bytes) -> dict:
+    return {
+        'address': address,
+        'topics': topics,
+        'data': '0x' + data.hex(),
+        'blockNumber': hex(block),
+        'blockHash': '0x' + '00' * 32,
+        'transactionHash': '0x' + uuid4().hex * 2,
+        'transactionIndex': '0x0',
+        'logIndex': '0x0',
+        'removed': False,
+    }
+
+
+def new_offer_log(address: str, block: int, offer_id: int, total_size: int) -> dict:
+    data = encode(
+        ['uint256', 'address', 'address', 'address', 'uint256', 'uint256', 'uint256'],
+        [offer_id, SELLER, OTOKEN, BIDDING_TOKEN, 100, 1, total_size],
+    )
+    return make_log(address, block, [TOPICS['NewOffer']], data)
+
+
+def swap_log(address: str, block: int, offer_id: int, nonce: int, size: int) -> dict:
+    data = encode(
+        ['uint256', 'uint256', 'uint256', 'address', 'uint256'],
+        [nonce, 1000, size, '0x' + '00' * 20, 0],
+    )
+    return make_log(address, block, [TOPICS['Swap'], word(offer_id), word(SIGNER_WALLET)], data)
+
+
+def settle_offer_log(address: str, block: int, offer_id: int) -> dict:
+    return make_log(address, block, [TOPICS['SettleOffer']], encode(['uint256'], [offer_id]))
+
+
+def swap_offers_result(total_size: int) -> str:
+    return (
+        '0x'
+        + encode(
+            ['address', 'address', 'uint96', 'address', 'uint96', 'uint128', 'uint128', 'uint256'],
+            [SELLER, OTOKEN, 100, BIDDING_TOKEN, 1, total_size, total_size, 0],
+        ).hex()
+    )
+
+
+def connect_swap(logs: list[dict], latest_block: int = 0x20) -> tuple[ContractConfig, object]:
+    def get_logs(params):
+        from_block, to_block = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        return [log for log in logs if from_block <= int(log['blockNumber'], 16) <= to_block]
+
+    rpc_uri, session = connect(
+        Chains.ETHEREUM,
+        {
+            'eth_blockNumber': lambda params: hex(latest_block),
+            'eth_getLogs': get_logs,
+            'eth_call': lambda params: swap_offers_result(7),
+        },
+    )
+    address = logs[0]['address'] if logs else get_address()
+    return ContractConfig(address=address, rpc_uri=rpc_uri, chain_id=Chains.ETHEREUM), session
+
+
+class TestOfferBook:
+    def test_sync(self, tmp_path):
+        address = get_address()
+        logs = [
+            new_offer_log(address, 0x10, 1, 50),
+            new_offer_log(address, 0x11, 2, 60),
+            swap_log(address, 0x12, 1, 9, 20),
+            settle_offer_log(address, 0x13, 2),
+        ]
+        config, _ = connect_swap(logs)
+        checkpoint_path = tmp_path / 'offers.json'
+        offer_book = OfferBook(config, checkpoint_path=checkpoint_path, block_range=2)
+
+        assert offer_book.sync() == 4
+        assert offer_book.block == 0x20 - 2
+        assert list(offer_book.offers) == [1]
+        assert offer_book.get_offer_details(1)['availableSize'] == 30
+        assert not offer_book.is_nonce_available(SIGNER_WALLET, 9)
+        assert offer_book.is_nonce_available(SIGNER_WALLET, 10)
+
+        resumed = OfferBook(config, checkpoint_path=checkpoint_path)
+        assert resumed.block == offer_book.block
+        assert resumed.offers == offer_book.offers
+        # Not synced since the checkpoint was saved
+        assert resumed.is_stale
+        assert resumed.find_offer_details(1) is None
+
+    def test_get_offer_details_fallback(self):
+        address = get_address()
+        config, session = connect_swap([new_offer_log(address, 0x10, 1, 50)])
+        offer_book = OfferBook(config, confirmations=0)
+        offer_book.sync()
+        register_offer_book(offer_book)
+        kwargs = dict(contract_address=address, chain_id=Chains.ETHEREUM, rpc_uri=config.rpc_uri)
+
+        try:
+            # Indexed offers are answered from memory
+            details = RibbonSDKConfig().get_offer_details(offer_id=1, **kwargs)
+            assert details['totalSize'] == 50
+            assert session.calls('eth_call') == []
+
+            # Offers after the last indexed block by the contract
+            details = RibbonSDKConfig().get_offer_details(offer_id=2, **kwargs)
+            assert details['totalSize'] == 7
+            assert len(session.calls('eth_call')) == 1
+
+            # As well as indexed offers when the offer book lags behind
+            # the latest block
+            offer_book.block -= 1
+            details = RibbonSDKConfig().get_offer_details(offer_id=1, **kwargs)
+            assert details['totalSize'] == 7
+            offer_book.block += 1
+
+            # Or once it is stale
+            offer_book.max_sync_age = 0
+            time.sleep(0.01)
+            details = RibbonSDKConfig().get_offer_details(offer_id=1, **kwargs)
+            assert details['totalSize'] == 7
+        finally:
+            unregister_offer_book(Chains.ETHEREUM, address)
+
+    def test_concurrent_syncs(self):
+        address = get_address()
+        config, session = connect_swap(
+            [new_offer_log(address, 0x10, 1, 50), swap_log(address, 0x11, 1, 9, 20)]
+        )
+        offer_book = OfferBook(config, from_block=0x10, confirmations=0, block_range=1)
+        get_logs = session.handlers['eth_getLogs']
+        concurrent_syncs = [offer_book.sync]
+
+        def get_logs_during_sync(params):
+            # Another sync indexes the block of the swap meanwhile
+            if params[0]['fromBlock'] == hex(0x11) and concurrent_syncs:
+                concurrent_syncs.pop()()
+            return get_logs(params)
+
+        session.handlers['eth_getLogs'] = get_logs_during_sync
+
+        offer_book.sync()
+        assert offer_book.block == 0x20
+        # The swap is applied once
+        assert offer_book.get_offer_details(1)['availableSize'] == 30
+
+    def test_background_sync_survives_errors(self):
+        config, _ = connect_swap([])
+        offer_book = OfferBook(config)
+        errors = [TypeError('unexpected response')]
+
+        def sync():
+            if errors:
+                raise errors.pop()
+
+        offer_book.sync = sync
+        offer_book.start(poll_interval=0.01)
+        try:
+            time.sleep(0.1)
+            assert offer_book._thread.is_alive()
+            assert offer_book.last_error is None
+            assert errors == []
+        finally:
+            offer_book.stop()
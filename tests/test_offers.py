@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from eth_abi import encode
+
+from sdk_commons.chains import Chains
+from sdk_commons.offers import OfferDetailsCache, is_missing_block_error
+from sdk_commons.providers import get_contract
+from tests.rpc import RPCError, connect
+
+CONTRACT = '0x' + '11' * 20
+DETAILS = {'availableSize': 10}
+
+
+class TestOfferDetailsCache:
+    def test_served_until_a_new_block(self):
+        block_number = [0x10]
+        rpc_uri, session = connect(
+            Chains.ETHEREUM, {'eth_blockNumber': lambda params: hex(block_number[0])}
+        )
+        cache = OfferDetailsCache(block_number_ttl=0)
+        fetched = []
+
+        def fetch(block):
+            fetched.append(block)
+            return DETAILS
+
+        for _ in range(3):
+            assert cache.get_or_fetch(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, fetch) == DETAILS
+        assert fetched == [0x10]
+
+        block_number[0] += 1
+        cache.get_or_fetch(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, fetch)
+        assert fetched == [0x10, 0x11]
+        assert cache.info().stale == 1
+
+        assert cache.invalidate(Chains.ETHEREUM, CONTRACT, 1) == 1
+        cache.get_or_fetch(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, fetch)
+        assert fetched == [0x10, 0x11, 0x11]
+
+    def test_details_are_copied(self):
+        rpc_uri, _ = connect(Chains.ETHEREUM, {'eth_blockNumber': lambda params: '0x10'})
+        cache = OfferDetailsCache()
+
+        details = cache.get_or_fetch(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, lambda block: {'a': 1})
+        details['a'] = 2
+
+        assert cache.get(Chains.ETHEREUM, CONTRACT, 1, 0x10) == {'a': 1}
+
+    def test_lagging_node(self):
+        def call(params):
+            if params[1] != 'latest':
+                raise RPCError(-32000, 'header not found')
+            return '0x' + encode(['uint8'], [18]).hex()
+
+        rpc_uri, session = connect(
+            Chains.ETHEREUM, {'eth_blockNumber': lambda params: '0x10', 'eth_call': call}
+        )
+        token = get_contract(rpc_uri, Chains.ETHEREUM, CONTRACT, 'ERC20')
+        cache = OfferDetailsCache()
+
+        details = cache.get_or_fetch(
+            rpc_uri,
+            Chains.ETHEREUM,
+            CONTRACT,
+            1,
+            lambda block: {'decimals': token.functions.decimals().call(block_identifier=block)},
+        )
+
+        assert details == {'decimals': 18}
+        assert [params[1] for params in session.calls('eth_call')] == ['0x10', 'latest']
+
+    def test_lagging_node_async(self):
+        rpc_uri, _ = connect(Chains.ETHEREUM, {'eth_blockNumber': lambda params: '0x10'})
+        cache = OfferDetailsCache()
+        cache.get_block_number(rpc_uri, Chains.ETHEREUM)
+
+        async def fetch(block):
+            if block != 'latest':
+                raise ValueError({'code': -32000, 'message': 'header not found'})
+            return DETAILS
+
+        details = asyncio.run(
+            cache.get_or_fetch_async(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, fetch)
+        )
+        assert details == DETAILS
+
+    def test_other_errors_are_raised(self):
+        rpc_uri, _ = connect(Chains.ETHEREUM, {'eth_blockNumber': lambda params: '0x10'})
+        cache = OfferDetailsCache()
+
+        def fetch(block):
+            raise ValueError('The argument is not a valid offer')
+
+        with pytest.raises(ValueError):
+            cache.get_or_fetch(rpc_uri, Chains.ETHEREUM, CONTRACT, 1, fetch)
+
+    def test_is_missing_block_error(self):
+        assert is_missing_block_error(ValueError({'code': -32000, 'message': 'header not found'}))
+        assert not is_missing_block_error(ValueError('execution reverted'))
+        assert not is_missing_block_error(OSError('header not found'))
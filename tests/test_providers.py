@@ -0,0 +1,78 @@
+import pytest
+from eth_abi import encode
+from web3.exceptions import ContractLogicError
+
+from sdk_commons.chains import Chains
+from sdk_commons.providers import BatchResponseError, batch_call, get_contract, get_web3
+from tests.rpc import RPCError, connect
+
+TOKEN = '0x' + '11' * 20
+
+
+def call_handler(params):
+    # decimals() returns 18, any other call reverts
+    if params[0]['data'] == '0x313ce567':
+        return '0x' + encode(['uint8'], [18]).hex()
+    raise RPCError(3, 'execution reverted', '0x')
+
+
+class TestBatchCall:
+    def test_batch(self):
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_call': call_handler})
+        token = get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20')
+
+        decimals, reverted = batch_call(
+            rpc_uri, Chains.ETHEREUM, [token.functions.decimals(), token.functions.symbol()]
+        )
+
+        assert decimals == 18
+        assert isinstance(reverted, ContractLogicError)
+        assert session.batches == 1
+
+    def test_node_errors_are_raised(self):
+        def rate_limited(params):
+            raise RPCError(-32005, 'rate limited')
+
+        rpc_uri, _ = connect(Chains.ETHEREUM, {'eth_call': rate_limited})
+        token = get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20')
+
+        with pytest.raises(ValueError) as e:
+            batch_call(rpc_uri, Chains.ETHEREUM, [token.functions.decimals()])
+        assert not isinstance(e.value, ContractLogicError)
+
+    def test_fallback_without_batch_support(self):
+        rpc_uri, session = connect(Chains.ETHEREUM, {'eth_call': call_handler})
+        session.batch_response = {
+            'jsonrpc': '2.0',
+            'id': None,
+            'error': {'code': -32600, 'message': 'batch requests not supported'},
+        }
+        token = get_contract(rpc_uri, Chains.ETHEREUM, TOKEN, 'ERC20')
+
+        decimals, reverted = batch_call(
+            rpc_uri, Chains.ETHEREUM, [token.functions.decimals(), token.functions.symbol()]
+        )
+
+        assert decimals == 18
+        assert isinstance(reverted, ContractLogicError)
+        assert len(session.calls('eth_call')) == 2
+
+
+class TestMakeBatchRequest:
+    def test_error_object(self):
+        rpc_uri, session = connect(Chains.ETHEREUM)
+        session.batch_response = {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600}}
+
+        with pytest.raises(BatchResponseError):
+            get_web3(rpc_uri, Chains.ETHEREUM).provider.make_batch_request(
+                [('eth_blockNumber', [])]
+            )
+
+    def test_missing_responses(self):
+        rpc_uri, session = connect(Chains.ETHEREUM)
+        session.batch_response = [{'jsonrpc': '2.0', 'id': -1, 'result': '0x1'}]
+
+        with pytest.raises(BatchResponseError):
+            get_web3(rpc_uri, Chains.ETHEREUM).provider.make_batch_request(
+                [('eth_blockNumber', [])]
+            )
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from concurrent.futures import Future
+from uuid import uuid4
+
+import pytest
+from hexbytes import HexBytes
+from web3.exceptions import TimeExhausted
+
+from sdk_commons.chains import Chains
+from sdk_commons.receipts import PendingTransaction, ReceiptPoller
+from tests.rpc import connect, make_receipt
+
+
+def get_tx_hash() -> HexBytes:
+    return HexBytes(uuid4().bytes * 2)
+
+
+def wait_stopped(poller: ReceiptPoller) -> None:
+    deadline = time.monotonic() + 2
+    while poller._thread is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert poller._thread is None
+
+
+class TestReceiptPoller:
+    def test_confirmations(self):
+        tx_hash = get_tx_hash()
+        block_number = [0x10]
+        rpc_uri, session = connect(
+            Chains.ETHEREUM,
+            {
+                'eth_blockNumber': lambda params: hex(block_number[0]),
+                'eth_getTransactionReceipt': lambda params: make_receipt(tx_hash, 0x10),
+            },
+        )
+        poller = ReceiptPoller(poll_interval=0.01)
+
+        included = poller.track(rpc_uri, Chains.ETHEREUM, tx_hash)
+        confirmed = poller.track(rpc_uri, Chains.ETHEREUM, tx_hash, confirmations=2)
+        assert poller.track(rpc_uri, Chains.ETHEREUM, tx_hash) is included
+
+        assert included.result(timeout=2)['blockNumber'] == 0x10
+        time.sleep(0.05)
+        assert not confirmed.done()
+
+        block_number[0] += 1
+        assert confirmed.result(timeout=2)['status'] == 1
+        wait_stopped(poller)
+        # Each poll requests the block number and receipts in one batch
+        assert len(session.calls('eth_blockNumber')) == session.batches
+
+    def test_timeout(self):
+        rpc_uri, _ = connect(
+            Chains.ETHEREUM,
+            {
+                'eth_blockNumber': lambda params: '0x10',
+                'eth_getTransactionReceipt': lambda params: None,
+            },
+        )
+        poller = ReceiptPoller(poll_interval=0.01, timeout=0.05)
+
+        future = poller.track(rpc_uri, Chains.ETHEREUM, get_tx_hash())
+        with pytest.raises(TimeExhausted):
+            future.result(timeout=2)
+        wait_stopped(poller)
+
+    @pytest.mark.parametrize(
+        'batch_response',
+        [
+            {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'batch'}},
+            [{'jsonrpc': '2.0', 'id': 0, 'result': None}],
+        ],
+    )
+    def test_timeout_with_failing_provider(self, batch_response):
+        rpc_uri, session = connect(Chains.ETHEREUM)
+        session.batch_response = batch_response
+        poller = ReceiptPoller(poll_interval=0.01, timeout=0.05)
+
+        future = poller.track(rpc_uri, Chains.ETHEREUM, get_tx_hash())
+        with pytest.raises(TimeExhausted):
+            future.result(timeout=2)
+        wait_stopped(poller)
+
+    def test_timeout_with_unexpected_errors(self):
+        rpc_uri, session = connect(Chains.ETHEREUM)
+
+        def post(*args, **kwargs):
+            raise TypeError('unexpected response')
+
+        session.post = post
+        poller = ReceiptPoller(poll_interval=0.01, timeout=0.05)
+
+        future = poller.track(rpc_uri, Chains.ETHEREUM, get_tx_hash())
+        with pytest.raises(TimeExhausted):
+            future.result(timeout=2)
+        wait_stopped(poller)
+
+    @pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+    def test_crash(self):
+        rpc_uri, _ = connect(Chains.ETHEREUM)
+        poller = ReceiptPoller(poll_interval=0.01, timeout=0.05)
+        errors = [RuntimeError('poller crashed')]
+
+        def poll(*args):
+            if errors:
+                raise errors.pop()
+            ReceiptPoller._poll(poller, *args)
+
+        poller._poll = poll  # type: ignore[method-assign]
+
+        future = poller.track(rpc_uri, Chains.ETHEREUM, get_tx_hash())
+        # The pending transactions fail with the error
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+        wait_stopped(poller)
+        assert poller.pending() == 0
+
+        # And the next transaction starts a new thread
+        future = poller.track(rpc_uri, Chains.ETHEREUM, get_tx_hash())
+        assert poller._thread is not None
+        with pytest.raises(TimeExhausted):
+            future.result(timeout=2)
+        wait_stopped(poller)
+
+
+class TestPendingTransaction:
+    def test_result_timeout(self):
+        transaction: PendingTransaction[int] = PendingTransaction(
+            get_tx_hash(), Future(), timeout=0.01
+        )
+
+        with pytest.raises(TimeExhausted):
+            transaction.result()
+
+        with pytest.raises(TimeExhausted):
+            asyncio.run(asyncio.wait_for(transaction, 2))
+        # The shared future is not cancelled
+        assert not transaction.future.cancelled()
+
+    def test_await(self):
+        future: Future[int] = Future()
+        transaction = PendingTransaction(get_tx_hash(), future)
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.01, future.set_result, 1)
+            return await transaction
+
+        assert asyncio.run(run()) == 1
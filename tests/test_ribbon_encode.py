@@ -0,0 +1,277 @@
+from copy import deepcopy
+from dataclasses import asdict
+
+import pytest
+from eth_account.messages import encode_structured_data
+from eth_hash.auto import keccak
+from web3 import Web3
+
+from ribbon import encode
+from ribbon.definitions import Bid
+from ribbon.encode import DOMAIN_FIELD_NAMES, DOMAIN_FIELD_TYPES, TypedDataEncoder
+from ribbon.wallet import BID_TYPES
+from sdk_commons.cache import LRUCache
+
+DOMAIN = {
+    "name": "RIBBON SWAP",
+    "version": "1",
+    "chainId": 1,
+    "verifyingContract": "0x" + "11" * 20,
+}
+BID = {
+    "swapId": 1,
+    "nonce": 2,
+    "signerWallet": "0x" + "22" * 20,
+    "sellAmount": 1000,
+    "buyAmount": 10,
+    "referrer": "0x" + "00" * 20,
+}
+MAIL_TYPES = {
+    "Mail": [
+        {"name": "sender", "type": "Person"},
+        {"name": "recipients", "type": "Person[2]"},
+        {"name": "cc", "type": "Person[]"},
+        {"name": "contents", "type": "string"},
+        {"name": "tag", "type": "bytes4"},
+        {"name": "digest", "type": "bytes32"},
+        {"name": "payload", "type": "bytes"},
+        {"name": "attachments", "type": "bytes[]"},
+        {"name": "amounts", "type": "uint256[]"},
+        {"name": "flags", "type": "bool[2]"},
+        {"name": "offset", "type": "int128"},
+    ],
+    "Person": [
+        {"name": "name", "type": "string"},
+        {"name": "wallet", "type": "address"},
+        {"name": "ids", "type": "uint64[]"},
+    ],
+}
+MAIL = {
+    "sender": {"name": "Alice", "wallet": "0x" + "aa" * 20, "ids": [1, 2]},
+    "recipients": [
+        {"name": "Bob", "wallet": "0x" + "bb" * 20, "ids": []},
+        {"name": "Carol", "wallet": "0x" + "cc" * 20, "ids": [3]},
+    ],
+    "cc": [{"name": "Dave", "wallet": "0x" + "dd" * 20, "ids": [4, 5, 6]}],
+    "contents": "Hello",
+    "tag": bytes.fromhex("01020304"),
+    "digest": bytes.fromhex("ab" * 32),
+    "payload": bytes.fromhex("0123456789" * 10),
+    "attachments": [b"", bytes.fromhex("deadbeef")],
+    "amounts": [0, 1, 2**255],
+    "flags": [True, False],
+    "offset": -5,
+}
+
+
+def get_reference_message(domain: dict, types: dict, primary_type: str, value: dict):
+    """Message encoded by eth_account"""
+    domain_fields = [
+        {"name": name, "type": DOMAIN_FIELD_TYPES[name]}
+        for name in DOMAIN_FIELD_NAMES
+        if name in domain
+    ]
+    return encode_structured_data(
+        {
+            "types": {"EIP712Domain": domain_fields, **types},
+            "domain": domain,
+            "primaryType": primary_type,
+            "message": value,
+        }
+    )
+
+
+class TestEncoderCache:
+    @pytest.fixture
+    def cache(self, monkeypatch) -> LRUCache:
+        cache: LRUCache = LRUCache(maxsize=2)
+        monkeypatch.setattr(encode, "ENCODER_CACHE", cache)
+        return cache
+
+    def test_hits_and_misses(self, cache):
+        encoder = TypedDataEncoder._from(BID_TYPES)
+        assert (cache.info().hits, cache.info().misses) == (0, 1)
+
+        assert TypedDataEncoder._from(BID_TYPES) is encoder
+        assert TypedDataEncoder._from(deepcopy(BID_TYPES)) is encoder
+        assert (cache.info().hits, cache.info().misses) == (2, 1)
+
+    def test_struct_order_is_ignored(self, cache):
+        encoder = TypedDataEncoder._from(MAIL_TYPES)
+
+        reordered = {"Person": MAIL_TYPES["Person"], "Mail": MAIL_TYPES["Mail"]}
+        assert TypedDataEncoder._from(reordered) is encoder
+        # The order of the fields is part of the type
+        reordered = {**MAIL_TYPES, "Person": MAIL_TYPES["Person"][::-1]}
+        assert TypedDataEncoder._from(reordered) is not encoder
+        assert len(cache) == 2
+
+    def test_mutated_types(self, cache):
+        types = deepcopy(BID_TYPES)
+        encoder = TypedDataEncoder._from(types)
+
+        types["Bid"].append({"name": "expiry", "type": "uint256"})
+        value = {**BID, "expiry": 5}
+        assert TypedDataEncoder._from(types) is not encoder
+        assert TypedDataEncoder._from(types).digest(value) == TypedDataEncoder(types).digest(value)
+        # The cached encoder kept its own copy of the types
+        assert encoder.types == BID_TYPES
+        assert encoder.digest(BID) == TypedDataEncoder(BID_TYPES).digest(BID)
+
+    def test_eviction(self, cache):
+        encoder = TypedDataEncoder._from(BID_TYPES)
+        TypedDataEncoder._from(MAIL_TYPES)
+        TypedDataEncoder._from({"Value": [{"name": "value", "type": "uint8"}]})
+
+        assert cache.info().evictions == 1
+        assert TypedDataEncoder._from(BID_TYPES) is not encoder
+
+
+class TestDomainSeparators:
+    @pytest.fixture
+    def cache(self, monkeypatch) -> LRUCache:
+        cache: LRUCache = LRUCache(maxsize=2)
+        monkeypatch.setattr(encode, "DOMAIN_SEPARATORS", cache)
+        return cache
+
+    def test_hits_and_misses(self, cache):
+        separator = TypedDataEncoder.domain_separator(DOMAIN)
+        assert (cache.info().hits, cache.info().misses) == (0, 1)
+
+        # Same domain, with another key order and a checksummed address
+        domain = dict(reversed(DOMAIN.items()))
+        domain["verifyingContract"] = Web3.to_checksum_address(DOMAIN["verifyingContract"])
+        assert TypedDataEncoder.domain_separator(domain) == separator
+        assert TypedDataEncoder.hash_domain(domain) == "0x" + separator.hex()
+        assert (cache.info().hits, cache.info().misses) == (2, 1)
+
+        assert TypedDataEncoder.domain_separator({**DOMAIN, "chainId": 137}) != separator
+        assert len(cache) == 2
+
+    def test_register(self, cache):
+        TypedDataEncoder.register_domain_separator(DOMAIN, "0x" + "ab" * 32)
+        assert TypedDataEncoder.domain_separator(DOMAIN) == bytes.fromhex("ab" * 32)
+
+        domain = {**DOMAIN, "verifyingContract": DOMAIN["verifyingContract"].upper()}
+        TypedDataEncoder.register_domain_separator(domain, bytes.fromhex("cd" * 32))
+        assert TypedDataEncoder.hash_domain(DOMAIN) == "0x" + "cd" * 32
+        assert cache.info().misses == 0
+
+    @pytest.mark.parametrize(
+        "domain, separator",
+        [
+            (DOMAIN, "ab" * 32),
+            (DOMAIN, "0x" + "ab" * 31),
+            (DOMAIN, bytes(31)),
+            ({**DOMAIN, "owner": "0x" + "22" * 20}, bytes(32)),
+        ],
+    )
+    def test_register_invalid(self, cache, domain, separator):
+        with pytest.raises(ValueError):
+            TypedDataEncoder.register_domain_separator(domain, separator)
+        assert len(cache) == 0
+
+
+class TestTypedDataEncoder:
+    @pytest.mark.parametrize(
+        "domain",
+        [
+            DOMAIN,
+            {"name": "RIBBON SWAP", "chainId": 137},
+            {**DOMAIN, "salt": bytes.fromhex("33" * 32)},
+        ],
+    )
+    @pytest.mark.parametrize(
+        "types, primary_type, value",
+        [(BID_TYPES, "Bid", BID), (MAIL_TYPES, "Mail", MAIL)],
+    )
+    def test_matches_eth_account(self, domain, types, primary_type, value):
+        message = get_reference_message(domain, types, primary_type, value)
+
+        assert TypedDataEncoder.hash_domain(domain) == "0x" + message.header.hex()
+        assert TypedDataEncoder._from(types).digest(value) == message.body
+        assert TypedDataEncoder._digest(domain, types, value) == keccak(
+            b"\x19" + message.version + message.header + message.body
+        )
+
+    def test_bytes_values(self):
+        # Hex strings are encoded like the raw bytes
+        value = {
+            **MAIL,
+            "tag": "0x01020304",
+            "digest": "0x" + "ab" * 32,
+            "payload": "0x" + "0123456789" * 10,
+            "attachments": ["0x", "0xdeadbeef"],
+        }
+
+        assert TypedDataEncoder._digest(DOMAIN, MAIL_TYPES, value) == TypedDataEncoder._digest(
+            DOMAIN, MAIL_TYPES, MAIL
+        )
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("tag", bytes.fromhex("010203")),
+            ("recipients", MAIL["recipients"][:1]),
+            ("flags", [True]),
+        ],
+    )
+    def test_invalid_values(self, field, value):
+        with pytest.raises(ValueError):
+            TypedDataEncoder._digest(DOMAIN, MAIL_TYPES, {**MAIL, field: value})
+
+    @pytest.mark.parametrize(
+        "data_type, valid, invalid",
+        [
+            ("uint8", [0, 255], [-1, 256]),
+            ("int8", [-128, 127], [-129, 128]),
+            ("uint256", [2**256 - 1], [2**256]),
+            ("int", [-(2**255), 2**255 - 1], [2**255]),
+        ],
+    )
+    def test_integer_bounds(self, data_type, valid, invalid):
+        types = {"Value": [{"name": "value", "type": data_type}]}
+
+        for value in valid:
+            message = get_reference_message(DOMAIN, types, "Value", {"value": value})
+            assert TypedDataEncoder._from(types).digest({"value": value}) == message.body
+        for value in invalid:
+            with pytest.raises(ValueError):
+                TypedDataEncoder._from(types).digest({"value": value})
+
+
+class TestHashMany:
+    def test_dicts(self):
+        values = [{**BID, "nonce": i} for i in range(5)]
+
+        assert TypedDataEncoder.hash_many(DOMAIN, BID_TYPES, values) == [
+            TypedDataEncoder._hash(DOMAIN, BID_TYPES, value) for value in values
+        ]
+        assert (
+            TypedDataEncoder.hash_many(DOMAIN, MAIL_TYPES, [MAIL, MAIL])
+            == [TypedDataEncoder._hash(DOMAIN, MAIL_TYPES, MAIL)] * 2
+        )
+        assert TypedDataEncoder.hash_many(DOMAIN, BID_TYPES, []) == []
+
+    def test_dataclasses(self):
+        bids = [Bid(**{**BID, "nonce": i}) for i in range(5)]
+
+        assert TypedDataEncoder.hash_many(DOMAIN, BID_TYPES, bids) == [
+            TypedDataEncoder._hash(DOMAIN, BID_TYPES, asdict(bid)) for bid in bids
+        ]
+
+    def test_lazy(self):
+        consumed = []
+
+        def values():
+            for i in range(3):
+                consumed.append(i)
+                yield {**BID, "nonce": i}
+
+        hashes = TypedDataEncoder.iter_hash_many(DOMAIN, BID_TYPES, values())
+        assert consumed == []
+
+        assert next(hashes) == TypedDataEncoder._hash(DOMAIN, BID_TYPES, {**BID, "nonce": 0})
+        assert consumed == [0]
+        assert len(list(hashes)) == 2
+        assert consumed == [0, 1, 2]
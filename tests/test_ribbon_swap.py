@@ -0,0 +1,109 @@
+from dataclasses import asdict
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from ribbon.definitions import ContractConfig, Domain, SignedBid
+from ribbon.encode import ADDRESS_ZERO, TypedDataEncoder
+from ribbon.swap import (
+    DETAILED_ERROR_MESSAGES,
+    SwapContract,
+    get_authorized_delegate,
+    precheck_signed_bid,
+)
+from ribbon.wallet import Wallet, get_bid_digest
+from sdk_commons.chains import Chains
+from tests.rpc import connect
+
+SIGNER_WALLET = Wallet(private_key="0x" + "01" * 32)
+DELEGATE = Wallet(private_key="0x" + "02" * 32)
+DOMAIN = Domain(
+    name="RIBBON SWAP",
+    version="1",
+    chainId=1,
+    verifyingContract="0x" + "11" * 20,
+)
+UNAUTHORIZED = {"errors": 1, "messages": [DETAILED_ERROR_MESSAGES["UNAUTHORIZED"]]}
+
+
+def sign_bid(signatory: Wallet) -> SignedBid:
+    """Bid of SIGNER_WALLET signed by signatory"""
+    bid = SignedBid(
+        swapId=1,
+        nonce=2,
+        signerWallet=SIGNER_WALLET.public_key,
+        sellAmount=1000,
+        buyAmount=10,
+        referrer=ADDRESS_ZERO,
+    )
+    domain_dict = {k: v for k, v in asdict(DOMAIN).items() if v is not None}
+    signature = signatory.sign_msg_hash(get_bid_digest(domain_dict, asdict(bid)))
+    bid.v, bid.r, bid.s = signature["v"], signature["r"], signature["s"]
+    return bid
+
+
+class TestPrecheckSignedBid:
+    def test_signer_wallet_signature(self):
+        get_delegate = MagicMock()
+
+        assert precheck_signed_bid(DOMAIN, sign_bid(SIGNER_WALLET), True, get_delegate) is None
+        get_delegate.assert_not_called()
+
+    def test_wrong_key_is_rejected_locally(self):
+        get_delegate = MagicMock(return_value=ADDRESS_ZERO)
+
+        assert precheck_signed_bid(DOMAIN, sign_bid(DELEGATE), True, get_delegate) == UNAUTHORIZED
+        get_delegate.assert_called_once_with(SIGNER_WALLET.public_key)
+
+    def test_authorized_delegate(self):
+        get_delegate = MagicMock(return_value=DELEGATE.public_key)
+
+        assert precheck_signed_bid(DOMAIN, sign_bid(DELEGATE), True, get_delegate) is None
+
+    def test_delegates_not_allowed(self):
+        assert precheck_signed_bid(DOMAIN, sign_bid(DELEGATE), False) == UNAUTHORIZED
+
+    def test_without_delegate_lookup(self):
+        # Left to the on-chain check
+        assert precheck_signed_bid(DOMAIN, sign_bid(DELEGATE)) is None
+
+
+class TestAuthorizedDelegate:
+    def test_delegate_is_cached(self):
+        contract = MagicMock()
+        contract.address = "0x" + "12" * 20
+        contract.functions.authorized.return_value.call.return_value = DELEGATE.public_key
+
+        for _ in range(3):
+            assert (
+                get_authorized_delegate(contract, Chains.ETHEREUM, SIGNER_WALLET.public_key)
+                == DELEGATE.public_key
+            )
+
+        contract.functions.authorized.assert_called_once_with(SIGNER_WALLET.public_key)
+
+
+class TestPrewarmDomainSeparator:
+    def test_on_chain_separator_is_used(self):
+        address = "0x" + uuid4().hex + "0" * 8
+        separator = "0x" + uuid4().hex * 2
+        rpc_uri, session = connect(Chains.ETHEREUM, {"eth_call": lambda params: separator})
+        swap_contract = SwapContract(ContractConfig(address, rpc_uri, Chains.ETHEREUM))
+
+        assert swap_contract.prewarm_domain_separator() == separator
+        domain_dict = {k: v for k, v in asdict(swap_contract.domain).items() if v is not None}
+        # Also found for the lower case address
+        domain_dict["verifyingContract"] = address
+        assert TypedDataEncoder.hash_domain(domain_dict) == separator
+        assert len(session.calls("eth_call")) == 1
+
+    def test_other_domain_is_rejected(self):
+        address = "0x" + uuid4().hex + "0" * 8
+        rpc_uri, session = connect(Chains.ETHEREUM)
+        swap_contract = SwapContract(ContractConfig(address, rpc_uri, Chains.ETHEREUM))
+
+        for domain in [DOMAIN, Domain("RIBBON SWAP", 137, address, "1")]:
+            with pytest.raises(ValueError):
+                swap_contract.prewarm_domain_separator(domain)
+        assert session.calls("eth_call") == []
@@ -0,0 +1,133 @@
+from copy import deepcopy
+from dataclasses import asdict
+
+import pytest
+
+from ribbon import wallet as wallet_module
+from ribbon.definitions import Bid, Domain
+from ribbon.encode import TypedDataEncoder
+from ribbon.wallet import (
+    BID_STRUCT_SIZE,
+    BID_TYPES,
+    SIGN_BIDS_INLINE_THRESHOLD,
+    Wallet,
+    get_bid_digest,
+    hash_bid,
+    iter_bid_digests,
+)
+
+PRIVATE_KEY = "0x" + "01" * 32
+DOMAIN = Domain(
+    name="RIBBON SWAP",
+    version="1",
+    chainId=1,
+    verifyingContract="0x" + "11" * 20,
+)
+DOMAIN_DICT = {k: v for k, v in asdict(DOMAIN).items() if v is not None}
+BIDS = [
+    asdict(Bid(swapId=1, nonce=2, signerWallet="0x" + "22" * 20, sellAmount=1000, buyAmount=10)),
+    asdict(
+        Bid(
+            swapId=0,
+            nonce=2**256 - 1,
+            signerWallet="0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1",
+            sellAmount=0,
+            buyAmount=2**255,
+            referrer="0x" + "ab" * 20,
+        )
+    ),
+]
+
+
+class TestBidDigest:
+    def test_matches_typed_data_encoder(self):
+        data = bytearray(BID_STRUCT_SIZE)
+        for bid in BIDS:
+            assert hash_bid(bid) == TypedDataEncoder._from(BID_TYPES).digest(bid)
+            # The buffer is fully overwritten for each bid
+            assert hash_bid(bid, data) == hash_bid(bid)
+            assert get_bid_digest(DOMAIN_DICT, bid) == TypedDataEncoder._digest(
+                DOMAIN_DICT, BID_TYPES, bid
+            )
+
+        assert list(iter_bid_digests(DOMAIN_DICT, BIDS)) == [
+            TypedDataEncoder._digest(DOMAIN_DICT, BID_TYPES, bid) for bid in BIDS
+        ]
+
+    def test_equal_types_use_the_fixed_layout(self, monkeypatch):
+        types = deepcopy(BID_TYPES)
+        digest = get_bid_digest(DOMAIN_DICT, BIDS[0], types)
+
+        monkeypatch.setattr(wallet_module, "hash_bid", lambda value: bytes(32))
+        assert get_bid_digest(DOMAIN_DICT, BIDS[0], types) != digest
+
+    @pytest.mark.parametrize(
+        "types",
+        [
+            # Same fields in another order
+            {"Bid": BID_TYPES["Bid"][::-1]},
+            {"Bid": BID_TYPES["Bid"] + [{"name": "expiry", "type": "uint256"}]},
+            {"Order": BID_TYPES["Bid"]},
+        ],
+    )
+    def test_other_types_fall_back(self, monkeypatch, types):
+        bids = [{**bid, "expiry": 5} for bid in BIDS]
+        fixed_digest = get_bid_digest(DOMAIN_DICT, bids[0])
+
+        def hash_bid(*args):
+            raise AssertionError("Types differ from BID_TYPES")
+
+        monkeypatch.setattr(wallet_module, "hash_bid", hash_bid)
+
+        for bid in bids:
+            assert get_bid_digest(DOMAIN_DICT, bid, types) == TypedDataEncoder._digest(
+                DOMAIN_DICT, types, bid
+            )
+        assert list(iter_bid_digests(DOMAIN_DICT, bids, types)) == [
+            TypedDataEncoder._digest(DOMAIN_DICT, types, bid) for bid in bids
+        ]
+        assert get_bid_digest(DOMAIN_DICT, bids[0], types) != fixed_digest
+
+
+class TestSignBids:
+    def test_pool_matches_sign_bid_in_order(self):
+        wallet = Wallet(private_key=PRIVATE_KEY)
+        # Distinct bids, so that a reordering changes the signatures
+        bids = [
+            Bid(
+                swapId=i % 3,
+                nonce=i,
+                signerWallet=wallet.public_key,
+                sellAmount=1000 + i,
+                buyAmount=10 + i,
+            )
+            for i in range(SIGN_BIDS_INLINE_THRESHOLD + 10)
+        ]
+        try:
+            signed_bids = wallet.sign_bids(DOMAIN, bids, workers=2)
+            pool = wallet._pool
+            assert pool is not None
+            # Workers don't inherit the locks of the SDK threads
+            assert pool._mp_context.get_start_method() == 'spawn'
+
+            assert signed_bids == [wallet.sign_bid(DOMAIN, bid) for bid in bids]
+
+            # The pool is reused by the next batch
+            assert wallet.sign_bids(DOMAIN, reversed(bids), workers=2) == signed_bids[::-1]
+            assert wallet._pool is pool
+        finally:
+            wallet.close()
+
+        assert wallet._pool is None
+
+    def test_small_batches_are_signed_inline(self):
+        wallet = Wallet(private_key=PRIVATE_KEY)
+        bids = [
+            Bid(swapId=1, nonce=i, signerWallet=wallet.public_key, sellAmount=1, buyAmount=1)
+            for i in range(3)
+        ]
+
+        assert wallet.sign_bids(DOMAIN, bids, workers=2) == [
+            wallet.sign_bid(DOMAIN, bid) for bid in bids
+        ]
+        assert wallet._pool is None
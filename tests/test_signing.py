@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+import pytest
+from eth_keys.backends import NativeECCBackend  # type: ignore
+
+from ribbon.wallet import Wallet as RibbonWallet
+from sdk_commons import signing
+from sdk_commons.signing import (
+    ECC_BACKEND_ENV,
+    SignerCache,
+    get_ecc_backend,
+    get_ecc_backend_name,
+    get_key_fingerprint,
+    set_ecc_backend,
+)
+from thetanuts.wallet import Wallet as ThetanutsWallet
+
+PRIVATE_KEY = '0x' + '01' * 32
+OTHER_PRIVATE_KEY = '0x' + '02' * 32
+PUBLIC_KEY = '0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1'
+
+
+class TestSignerCache:
+    def test_fingerprint(self):
+        private_key = '0x' + 'ab' * 32
+        fingerprint = get_key_fingerprint(private_key)
+
+        assert get_key_fingerprint('0x' + 'AB' * 32) == fingerprint
+        assert get_key_fingerprint('ab' * 32) == fingerprint
+        assert get_key_fingerprint(PRIVATE_KEY) != fingerprint
+        assert 'ab' * 32 not in fingerprint
+
+    def test_get(self):
+        cache: SignerCache[SimpleNamespace] = SignerCache()
+        signer = cache.get(PRIVATE_KEY, None, SimpleNamespace)
+
+        assert cache.get(PRIVATE_KEY, None, SimpleNamespace) is signer
+        assert cache.get(PRIVATE_KEY, PUBLIC_KEY, SimpleNamespace) is not signer
+        assert cache.get(OTHER_PRIVATE_KEY, None, SimpleNamespace) is not signer
+        assert (cache.info().hits, cache.info().misses) == (1, 3)
+        # Private keys are not stored
+        assert all(PRIVATE_KEY[2:] not in str(key) for key in cache._cache.keys())
+
+    def test_evict(self):
+        cache: SignerCache[SimpleNamespace] = SignerCache()
+        signer = cache.get(PRIVATE_KEY, None, SimpleNamespace)
+        cache.get(PRIVATE_KEY, PUBLIC_KEY, SimpleNamespace)
+        other_signer = cache.get(OTHER_PRIVATE_KEY, None, SimpleNamespace)
+
+        # Every signer of the key is removed
+        assert cache.evict(PRIVATE_KEY) == 2
+        assert cache.evict(PRIVATE_KEY) == 0
+        assert cache.get(PRIVATE_KEY, None, SimpleNamespace) is not signer
+        assert cache.get(OTHER_PRIVATE_KEY, None, SimpleNamespace) is other_signer
+
+        cache.clear()
+        assert len(cache._cache) == 0
+
+    def test_lru_eviction(self):
+        cache: SignerCache[SimpleNamespace] = SignerCache(maxsize=2)
+        signer = cache.get(PRIVATE_KEY, None, SimpleNamespace)
+        other_signer = cache.get(OTHER_PRIVATE_KEY, None, SimpleNamespace)
+        # The least recently used signer is evicted
+        cache.get(PRIVATE_KEY, None, SimpleNamespace)
+        cache.get('0x' + '03' * 32, None, SimpleNamespace)
+
+        assert cache.info().evictions == 1
+        assert cache.get(PRIVATE_KEY, None, SimpleNamespace) is signer
+        assert cache.get(OTHER_PRIVATE_KEY, None, SimpleNamespace) is not other_signer
+
+
+class TestCachedWallets:
+    def test_ribbon(self):
+        RibbonWallet.evict_cached()
+        wallet = RibbonWallet.cached(private_key=PRIVATE_KEY)
+
+        assert wallet.public_key == PUBLIC_KEY
+        assert RibbonWallet.cached(private_key=PRIVATE_KEY) is wallet
+        RibbonWallet.evict_cached(PRIVATE_KEY)
+        assert RibbonWallet.cached(private_key=PRIVATE_KEY) is not wallet
+        # Wallets without private key are not cached
+        assert RibbonWallet.cached(public_key=PUBLIC_KEY) is not RibbonWallet.cached(
+            public_key=PUBLIC_KEY
+        )
+
+    def test_thetanuts(self):
+        ThetanutsWallet.evict_cached()
+        wallet = ThetanutsWallet.cached(private_key=PRIVATE_KEY)
+
+        assert wallet.public_key == PUBLIC_KEY
+        assert ThetanutsWallet.cached(private_key=PRIVATE_KEY) is wallet
+        ThetanutsWallet.evict_cached()
+        assert ThetanutsWallet.cached(private_key=PRIVATE_KEY) is not wallet
+
+
+class TestEccBackend:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        monkeypatch.delenv(ECC_BACKEND_ENV, raising=False)
+        yield
+        set_ecc_backend(None)
+
+    def test_auto(self, monkeypatch):
+        monkeypatch.setattr(signing, 'is_coincurve_available', lambda: True)
+        assert get_ecc_backend_name() == 'coincurve'
+
+        monkeypatch.setattr(signing, 'is_coincurve_available', lambda: False)
+        assert get_ecc_backend_name() == 'native'
+        assert isinstance(get_ecc_backend(), NativeECCBackend)
+
+    def test_selection(self, monkeypatch):
+        monkeypatch.setenv(ECC_BACKEND_ENV, 'native')
+        assert get_ecc_backend_name() == 'native'
+        assert isinstance(get_ecc_backend(), NativeECCBackend)
+
+        # The selected backend takes precedence over the environment
+        set_ecc_backend('coincurve')
+        assert get_ecc_backend_name() == 'coincurve'
+        set_ecc_backend(None)
+        assert get_ecc_backend_name() == 'native'
+
+    def test_invalid(self, monkeypatch):
+        with pytest.raises(ValueError):
+            set_ecc_backend('openssl')
+
+        monkeypatch.setenv(ECC_BACKEND_ENV, 'openssl')
+        with pytest.raises(ValueError):
+            get_ecc_backend_name()
+
+    def test_not_installed(self, monkeypatch):
+        def get_backend(import_path):
+            raise ImportError(import_path)
+
+        monkeypatch.setattr(signing, 'get_backend', get_backend)
+        with pytest.raises(ValueError):
+            signing._get_ecc_backend.__wrapped__('coincurve')
+
+    @pytest.mark.parametrize('wallet_class', [RibbonWallet, ThetanutsWallet])
+    def test_wallets(self, wallet_class):
+        native_wallet = wallet_class(private_key=PRIVATE_KEY, backend='native')
+        wallet = wallet_class(private_key=PRIVATE_KEY)
+
+        assert isinstance(native_wallet.signer.backend, NativeECCBackend)
+        assert wallet.backend == get_ecc_backend_name()
+        assert wallet.signer.backend is get_ecc_backend()
+        # Both backends produce the same deterministic signatures
+        message_hash = bytes.fromhex('12' * 32)
+        assert native_wallet.signer.sign_msg_hash(message_hash) == wallet.signer.sign_msg_hash(
+            message_hash
+        )
+
+        # Cached wallets follow the selected backend
+        cached_wallet = wallet_class.cached(private_key=PRIVATE_KEY)
+        set_ecc_backend('native')
+        assert wallet_class.cached(private_key=PRIVATE_KEY) is not cached_wallet
+        assert wallet_class.cached(private_key=PRIVATE_KEY).backend == 'native'
@@ -0,0 +1,233 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+from eth_abi import encode
+from eth_account._utils.typed_transactions import TypedTransaction
+from hexbytes import HexBytes
+from web3 import Web3
+
+from sdk_commons.chains import Chains
+from sdk_commons.fees import fee_oracle
+from sdk_commons.helpers import get_abi_selectors
+from sdk_commons.nonces import nonce_manager
+from sdk_commons.providers import get_contract
+from sdk_commons.receipts import PendingTransaction, receipt_poller
+from tests.rpc import FakeRPCSession, RPCError, connect, make_receipt
+from tests.test_thetanuts_wallet import sign_bid
+from thetanuts.config import AsyncThetanuts, Thetanuts
+
+PRIVATE_KEY = '0x' + '01' * 32
+PUBLIC_KEY = '0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1'
+BRIDGE = Web3.to_checksum_address('0x' + '66' * 20)
+VALIDATE_SIGNATURE = 'validateSignature(address,uint256,uint256,address,bytes)'
+
+
+def get_address() -> str:
+    return Web3.to_checksum_address('0x' + uuid4().hex + '0' * 8)
+
+
+def uint(value: int) -> str:
+    return '0x' + encode(['uint256'], [value]).hex()
+
+
+def connect_vault() -> tuple[str, FakeRPCSession, str, list[HexBytes]]:
+    """
+    Return the RPC URI and session of a node with a vault whose round
+    is in progress, and the list of raw transactions sent to it
+    """
+    vault_address = get_address()
+    selectors: dict[str, str] = {}
+    sent: list[HexBytes] = []
+    included: set[HexBytes] = set()
+
+    def call(params):
+        if params[0]['data'] == selectors['expiry']:
+            return uint(1)
+        if params[0]['data'] == selectors['epoch']:
+            return uint(5)
+        # vaultNextStrikeX1e6 and vaultIndexToAddress of the bridge
+        return uint(2)
+
+    def estimate_gas(params):
+        # settleStrike_MM reverts until setExpiry is included
+        if params[0]['data'].startswith(selectors['settleStrike_MM']) and not included:
+            raise RPCError(3, 'execution reverted', '0x')
+        return hex(100000)
+
+    def send_raw_transaction(params):
+        sent.append(HexBytes(params[0]))
+        return Web3.keccak(HexBytes(params[0])).hex()
+
+    def get_transaction_receipt(params):
+        # Transactions are included once the poller asks for them
+        tx_hash = HexBytes(params[0])
+        included.add(tx_hash)
+        return make_receipt(tx_hash, 0x20)
+
+    rpc_uri, session = connect(
+        Chains.ETHEREUM,
+        {
+            'eth_chainId': lambda params: hex(Chains.ETHEREUM.value),
+            'eth_blockNumber': lambda params: '0x20',
+            'eth_feeHistory': lambda params: {
+                'oldestBlock': '0x1f',
+                'baseFeePerGas': ['0x10', '0x10'],
+                'reward': [['0x1', '0x2', '0x3']],
+                'gasUsedRatio': [0.5],
+            },
+            'eth_getTransactionCount': lambda params: '0x7',
+            'eth_call': call,
+            'eth_estimateGas': estimate_gas,
+            'eth_sendRawTransaction': send_raw_transaction,
+            'eth_getTransactionReceipt': get_transaction_receipt,
+        },
+    )
+    vault = get_contract(rpc_uri, Chains.ETHEREUM, vault_address, 'Thetanuts_Vault')
+    for name, args in [('expiry', []), ('epoch', []), ('settleStrike_MM', [0])]:
+        selectors[name] = vault.encodeABI(fn_name=name, args=args)[:10]
+    return rpc_uri, session, vault_address, sent
+
+
+def connect_bridge() -> tuple[str, FakeRPCSession, str, str]:
+    """
+    Return the RPC URI and session of a node with a bridge of vault
+    index 1, and the addresses of the bridge and of the vault
+    """
+    bridge_address = get_address()
+    vault_address = get_address()
+    results = {
+        get_abi_selectors('Thetanuts_ParadigmBridge')['vaultIndex(uint256)']: vault_address,
+        get_abi_selectors('Thetanuts_Vault')['COLLAT()']: get_address(),
+        get_abi_selectors('ERC20')['balanceOf(address)']: 1000,
+        get_abi_selectors('Thetanuts_ParadigmBridge')[VALIDATE_SIGNATURE]: True,
+    }
+
+    def call(params):
+        result = results[HexBytes(params[0]['data'])[:4]]
+        if isinstance(result, str):
+            return '0x' + encode(['address'], [result]).hex()
+        return uint(int(result))
+
+    rpc_uri, session = connect(Chains.ETHEREUM, {'eth_call': call})
+    return rpc_uri, session, bridge_address, vault_address
+
+
+class TestValidateBid:
+    def validate_bid(
+        self, rpc_uri: str, bridge_address: str, signature: str, local_signature_only: bool
+    ) -> dict:
+        return Thetanuts().validate_bid(
+            contract_address=bridge_address,
+            chain_id=Chains.ETHEREUM,
+            rpc_uri=rpc_uri,
+            swap_id=(1 << 16) + 5,
+            nonce=3,
+            signer_wallet=PUBLIC_KEY,
+            sell_amount=1000,
+            buy_amount=10,
+            referrer='0x' + '00' * 20,
+            signature=signature,
+            local_signature_only=local_signature_only,
+        )
+
+    @pytest.mark.parametrize('local_signature_only', [True, False])
+    def test_valid_signature(self, local_signature_only):
+        rpc_uri, session, bridge_address, vault_address = connect_bridge()
+        signature = sign_bid(PRIVATE_KEY, vault_address, 3, 1000, PUBLIC_KEY)
+
+        for bid_signature in [signature, signature[2:]]:
+            result = self.validate_bid(
+                rpc_uri, bridge_address, bid_signature, local_signature_only
+            )
+            assert result == {'errors': 0}
+
+        # validateSignature is only called without local_signature_only
+        selector = get_abi_selectors('Thetanuts_ParadigmBridge')[VALIDATE_SIGNATURE]
+        validations = [
+            params
+            for params in session.calls('eth_call')
+            if params[0]['data'][2:10] == selector.hex()
+        ]
+        assert len(validations) == (0 if local_signature_only else 2)
+
+    @pytest.mark.parametrize(
+        'get_signature',
+        [
+            lambda vault_address: '0x' + '11' * 64,
+            lambda vault_address: '11' * 64 + '1b',
+            # Signed by another key
+            lambda vault_address: sign_bid('0x' + '02' * 32, vault_address, 3, 1000, PUBLIC_KEY),
+        ],
+    )
+    def test_invalid_signature(self, get_signature):
+        rpc_uri, session, bridge_address, vault_address = connect_bridge()
+        signature = get_signature(vault_address)
+
+        for local_signature_only in [True, False]:
+            assert self.validate_bid(rpc_uri, bridge_address, signature, local_signature_only) == {
+                'errors': 1,
+                'messages': ['signature invalid'],
+            }
+        # Only the vault address is requested, once
+        assert len(session.calls('eth_call')) == 1
+
+
+class TestCreateOffer:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        monkeypatch.setattr(receipt_poller, 'poll_interval', 0.01)
+        # Fees estimated again for every transaction
+        monkeypatch.setattr(fee_oracle, 'ttl', -1)
+        nonce_manager.resync(Chains.ETHEREUM, PUBLIC_KEY)
+
+    def check_transactions(self, session: FakeRPCSession, sent: list[HexBytes]) -> None:
+        transactions = [TypedTransaction.from_bytes(raw).as_dict() for raw in sent]
+        assert [tx['nonce'] for tx in transactions] == [7, 8]
+        # Estimated once setExpiry is included, plus the margin
+        assert transactions[1]['gas'] == 120000
+        # The fees of each transaction are read when it is sent
+        assert len(session.calls('eth_feeHistory')) == 2
+
+    def test_settle_strike_waits_for_expiry(self):
+        rpc_uri, session, vault_address, sent = connect_vault()
+
+        offer_id = Thetanuts().create_offer(
+            contract_address=BRIDGE,
+            chain_id=Chains.ETHEREUM,
+            rpc_uri=rpc_uri,
+            oToken=vault_address,
+            bidding_token=get_address(),
+            public_key=PUBLIC_KEY,
+            private_key=PRIVATE_KEY,
+        )
+
+        assert offer_id == str((2 << 16) + 5 + 1)
+        self.check_transactions(session, sent)
+
+    def test_async_receipts_are_awaited(self, monkeypatch):
+        rpc_uri, session, vault_address, sent = connect_vault()
+
+        def result(self, timeout=None):
+            raise AssertionError('An executor thread waits for a receipt')
+
+        monkeypatch.setattr(PendingTransaction, 'result', result)
+        config = AsyncThetanuts()
+        config.executor = ThreadPoolExecutor(1)
+
+        offer_id = asyncio.run(
+            config.create_offer(
+                contract_address=BRIDGE,
+                chain_id=Chains.ETHEREUM,
+                rpc_uri=rpc_uri,
+                oToken=vault_address,
+                bidding_token=get_address(),
+                public_key=PUBLIC_KEY,
+                private_key=PRIVATE_KEY,
+            )
+        )
+        config.executor.shutdown()
+
+        assert offer_id == str((2 << 16) + 5 + 1)
+        self.check_transactions(session, sent)
@@ -0,0 +1,68 @@
+import pytest
+from eth_abi.packed import encode_packed
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3 import Web3
+
+from thetanuts.definitions import Bid
+from thetanuts.wallet import Wallet, recover_bid_signer
+
+PRIVATE_KEY = '0x' + '01' * 32
+PUBLIC_KEY = '0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1'
+VAULT = Web3.to_checksum_address('0x' + '44' * 20)
+
+
+def sign_bid(
+    private_key: str, vault_address: str, nonce: int, sell_amount: int, signer_wallet: str
+) -> str:
+    """Signature of a bid as created before the local recovery,
+    with eth_account's sign_message"""
+    packed = encode_packed(
+        ['address', 'uint', 'uint', 'address'], [vault_address, nonce, sell_amount, signer_wallet]
+    )
+    message = encode_defunct(Web3.keccak(packed))
+    return str(Account.sign_message(message, private_key).signature.hex())
+
+
+class TestRecoverBidSigner:
+    def test_eth_account_signature(self):
+        signature = sign_bid(PRIVATE_KEY, VAULT, 3, 1000, PUBLIC_KEY)
+
+        assert recover_bid_signer(VAULT, 3, 1000, PUBLIC_KEY, signature) == PUBLIC_KEY
+        # Metamask signatures have no 0x prefix
+        assert recover_bid_signer(VAULT, 3, 1000, PUBLIC_KEY, signature[2:]) == PUBLIC_KEY
+        # Another bid recovers another address
+        assert recover_bid_signer(VAULT, 4, 1000, PUBLIC_KEY, signature) != PUBLIC_KEY
+
+    def test_wallet_signature(self):
+        wallet = Wallet(private_key=PRIVATE_KEY)
+        bid = Bid(
+            vaultAddress=VAULT,
+            nonce=3,
+            signerWallet=PUBLIC_KEY,
+            sellAmount=1000,
+            buyAmount=10,
+            referrer='0x' + '00' * 20,
+        )
+
+        signature = wallet.sign_bid(bid)
+        assert signature == sign_bid(PRIVATE_KEY, VAULT, 3, 1000, PUBLIC_KEY)
+        assert recover_bid_signer(VAULT, 3, 1000, PUBLIC_KEY, signature) == PUBLIC_KEY
+
+    @pytest.mark.parametrize(
+        'signature',
+        [
+            '',
+            '0x',
+            '0xzz' + '00' * 64,
+            '0x' + '11' * 64,
+            '0x' + '11' * 66,
+            # v must be 27 or 28
+            '0x' + '11' * 64 + '01',
+            # r must be in the curve order
+            '0x' + '00' * 32 + '11' * 32 + '1b',
+            '0x' + 'ff' * 32 + '11' * 32 + '1b',
+        ],
+    )
+    def test_malformed_signature(self, signature):
+        assert recover_bid_signer(VAULT, 3, 1000, PUBLIC_KEY, signature) is None
@@ -0,0 +1,57 @@
+import json
+
+from sdk_commons import tokens
+from sdk_commons.chains import Chains
+from sdk_commons.tokens import TokenMetadata, TokenMetadataCache
+
+USDC = TokenMetadata(name='USD Coin', symbol='USDC', decimals=6)
+
+
+def get_address(i: int) -> str:
+    return '0x' + f'{i:040x}'
+
+
+class TestTokenMetadataCache:
+    def test_writes_are_batched(self, tmp_path, monkeypatch):
+        writes = []
+        dump_json_atomic = tokens.dump_json_atomic
+        monkeypatch.setattr(
+            tokens,
+            'dump_json_atomic',
+            lambda *args: (writes.append(args), dump_json_atomic(*args)),
+        )
+        path = tmp_path / 'tokens.json'
+        cache = TokenMetadataCache(path, save_delay=60)
+
+        for i in range(1, 101):
+            cache.put(Chains.ETHEREUM, get_address(i), USDC)
+        assert writes == []
+
+        cache.save()
+        cache.save()
+        assert len(writes) == 1
+        assert len(json.loads(path.read_text())[str(Chains.ETHEREUM.value)]) == 100
+
+        cache.seed({Chains.MATIC.value: {get_address(1): USDC._asdict()}})
+        assert len(writes) == 2
+
+        reloaded = TokenMetadataCache(path)
+        assert reloaded.get(Chains.MATIC, get_address(1)) == USDC
+        assert len(reloaded) == 101
+
+    def test_delayed_save(self, tmp_path):
+        path = tmp_path / 'tokens.json'
+        cache = TokenMetadataCache(path, save_delay=0.05)
+
+        cache.put(Chains.ETHEREUM, get_address(1), USDC)
+        timer = cache._save_timer
+        assert not path.exists()
+        timer.join()
+
+        assert TokenMetadataCache(path).get(Chains.ETHEREUM, get_address(1)) == USDC
+
+    def test_in_memory(self):
+        cache = TokenMetadataCache()
+        assert cache.get_or_create(Chains.ETHEREUM, get_address(1), lambda: USDC) == USDC
+        assert cache.get_or_create(Chains.ETHEREUM, get_address(1), lambda: None) == USDC
+        assert cache._save_timer is None
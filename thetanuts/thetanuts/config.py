@@ -1,15 +1,111 @@
+import asyncio
 import time
+from collections.abc import Iterable
 from typing import Any
 
-import web3
-from web3.middleware import geth_poa_middleware
-from web3.types import Nonce
+from eth_typing import ChecksumAddress
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+from web3.types import BlockIdentifier, LogReceipt, TxParams
 
+from sdk_commons.cache import LRUCache
 from sdk_commons.chains import Chains
-from sdk_commons.config import BidValidation, OfferDetails, OfferTokenDetails, SDKConfig
-from sdk_commons.helpers import get_abi
+from sdk_commons.config import (
+    AsyncSDKConfig,
+    BidValidation,
+    OfferDetails,
+    OfferTokenDetails,
+    SDKConfig,
+)
+from sdk_commons.fees import FeeStrategy, get_fee_params
+from sdk_commons.gas import get_gas_limit
+from sdk_commons.helpers import get_abi_topics
+from sdk_commons.offers import is_missing_block_error, offer_details_cache
+from sdk_commons.providers import (
+    batch_call,
+    get_async_chain_id,
+    get_async_contract,
+    get_chain_id,
+    get_contract,
+    get_web3,
+)
+from sdk_commons.sequencer import (
+    DEFAULT_CONFIRMATIONS,
+    Steps,
+    TransactionSequencer,
+    run_steps,
+    run_steps_async,
+)
+from sdk_commons.tokens import get_async_token_metadata, get_token_metadata
 from thetanuts.definitions import Bid
-from thetanuts.wallet import Wallet
+from thetanuts.wallet import Wallet, recover_bid_signer
+
+# Vault addresses by chain, bridge address and vault index.
+# Vaults are only appended to the bridge, indexes never change
+VAULT_ADDRESS_CACHE_SIZE = 256
+_vault_addresses: LRUCache[tuple[Chains, str, int], ChecksumAddress] = LRUCache(
+    maxsize=VAULT_ADDRESS_CACHE_SIZE
+)
+# Collateral (bidding token) addresses by chain and vault address
+_vault_collaterals: LRUCache[tuple[Chains, str], str] = LRUCache(maxsize=VAULT_ADDRESS_CACHE_SIZE)
+
+PARADIGM_OFFSET = 100  # Bridge returns 1e6, Paradigm expects 1e8
+
+
+# Vault events changing the auction details of its offers
+VAULT_OFFER_TOPICS = {
+    topic
+    for signature, topic in get_abi_topics("Thetanuts_Vault").items()
+    if signature.startswith(("NewEpoch(", "Settlement("))
+}
+
+
+def invalidate_offer_details(
+    chain_id: Chains, contract_address: str, logs: Iterable[LogReceipt]
+) -> int:
+    """
+    Remove from the offer details cache the offers of the vaults
+    that emitted NewEpoch or Settlement logs, returning how many
+    offers have been removed
+    """
+    vaults = {
+        Web3.to_checksum_address(log["address"])
+        for log in logs
+        if log["topics"] and log["topics"][0] in VAULT_OFFER_TOPICS
+    }
+    if not vaults:
+        return 0
+
+    return offer_details_cache.invalidate(
+        chain_id, contract_address, predicate=lambda details: details['seller'] in vaults
+    )
+
+
+def parse_auction_token_details(aucDetails: list | tuple) -> OfferTokenDetails:
+    """Convert the result of getAuctionDetails to OfferTokenDetails"""
+
+    return {
+        "collateralAsset": aucDetails[0],
+        "underlyingAsset": aucDetails[1],
+        "strikeAsset": aucDetails[2],
+        "strikePrice": aucDetails[3] * PARADIGM_OFFSET,
+        "expiryTimestamp": aucDetails[4],
+        "isPut": aucDetails[5],
+    }
+
+
+def parse_auction_offer_details(vault_address: str, aucDetails: list | tuple) -> OfferDetails:
+    """Convert the result of getAuctionDetails to OfferDetails"""
+
+    return {
+        'seller': vault_address,
+        'oToken': vault_address,
+        'biddingToken': aucDetails[0],
+        'minPrice': "0.0",
+        'minBidSize': aucDetails[6] * PARADIGM_OFFSET,
+        'totalSize': aucDetails[6] * PARADIGM_OFFSET,
+        'availableSize': aucDetails[6] * PARADIGM_OFFSET,
+    }
 
 
 class AuthorizationPages:
@@ -21,8 +117,23 @@ class AuthorizationPages:
 class Thetanuts(SDKConfig):
     authorization_pages = AuthorizationPages
     supported_chains = [Chains.ETHEREUM, Chains.MATIC]
-    PARADIGM_OFFSET = 100  # Bridge returns 1e6, Paradigm expects 1e8
-    PRIORITY_FEE = {Chains.ETHEREUM: hex(int(1e8)), Chains.MATIC: hex(int(30e9))}
+    PARADIGM_OFFSET = PARADIGM_OFFSET
+    # Minimum priority fees, the network minimum on Polygon
+    PRIORITY_FEE = {Chains.ETHEREUM: int(1e8), Chains.MATIC: int(30e9)}
+    FEE_STRATEGY = FeeStrategy.NORMAL
+    # Gas limit of settleStrike_MM when it can't be estimated
+    SETTLE_STRIKE_GAS = 1000000
+    # Gas limit of setNextStrikeAndSize when it can't be estimated
+    NEXT_STRIKE_GAS = 200000
+
+    def _get_fee_params(self, rpc_uri: str, chain_id: Chains) -> TxParams:
+        """
+        Fees of the next owner transaction, estimated on the recent
+        blocks
+        """
+        return get_fee_params(
+            rpc_uri, chain_id, self.FEE_STRATEGY, min_priority_fee=self.PRIORITY_FEE[chain_id]
+        )
 
     def create_offer(
         self,
@@ -34,63 +145,74 @@ class Thetanuts(SDKConfig):
         bidding_token: str,
         public_key: str,
         private_key: str,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
         **kwargs: Any,
     ) -> str:
         """
         Start new round by forcefully ending previous round
-        Needs to be done by Vault Owner
+        Needs to be done by Vault Owner. Each step waits for
+        confirmations blocks before reading the vault again
         """
 
-        w3 = web3.Web3(web3.HTTPProvider(rpc_uri))
-        if chain_id == Chains.MATIC:
-            w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-        vaultContract = w3.eth.contract(
-            w3.to_checksum_address(oToken),
-            abi=get_abi("Thetanuts_Vault"),
+        return run_steps(
+            self._create_offer_steps(
+                contract_address, chain_id, rpc_uri, oToken, public_key, private_key, confirmations
+            )
         )
 
-        nonce = w3.eth.get_transaction_count(w3.to_checksum_address(public_key))
+    def _create_offer_steps(
+        self,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        oToken: str,
+        public_key: str,
+        private_key: str,
+        confirmations: int,
+    ) -> Steps[str]:
+        """
+        Steps of create_offer, yielding the owner transactions
+        to wait for
+        """
+
+        vaultContract = get_contract(rpc_uri, chain_id, oToken, "Thetanuts_Vault")
+
+        # Nonces are assigned locally, the owner transactions are sent
+        # without fixed delays between them
+        sequencer = TransactionSequencer(
+            rpc_uri, chain_id, public_key, private_key, confirmations=confirmations
+        )
 
         if vaultContract.functions.expiry().call() > 0:  # Round in progress, let's end it
             currentTime = int(time.time())
-            tx = w3.eth.send_raw_transaction(
-                w3.eth.account.sign_transaction(
-                    vaultContract.functions.setExpiry(currentTime).build_transaction(
-                        {
-                            'nonce': Nonce(nonce),
-                            'from': public_key,
-                            'maxPriorityFeePerGas': self.PRIORITY_FEE[chain_id],
-                            'maxFeePerGas': hex(w3.eth.gas_price * 2),
-                        }
-                    ),
-                    private_key,
-                ).rawTransaction
+            setExpiry = sequencer.send(
+                vaultContract.functions.setExpiry(currentTime),
+                self._get_fee_params(rpc_uri, chain_id),
             )
-            print("Sent OWNER transaction for setting expiry", tx.hex())
-            w3.eth.wait_for_transaction_receipt(tx)
-            time.sleep(5)
-            tx = w3.eth.send_raw_transaction(
-                w3.eth.account.sign_transaction(
-                    vaultContract.functions.settleStrike_MM(int(1000e6)).build_transaction(
-                        {
-                            'nonce': Nonce(nonce + 1),
-                            'from': public_key,
-                            'maxPriorityFeePerGas': self.PRIORITY_FEE[chain_id],
-                            'maxFeePerGas': hex(w3.eth.gas_price * 2),
-                        }
+            print("Sent OWNER transaction for setting expiry", setExpiry.tx_hash.hex())
+            # settleStrike_MM reverts before the expiry, and so does
+            # its gas estimate
+            yield setExpiry
+            settleStrike = vaultContract.functions.settleStrike_MM(int(1000e6))
+            tx = sequencer.send(
+                settleStrike,
+                {
+                    "gas": get_gas_limit(
+                        chain_id,
+                        settleStrike,
+                        {"from": sequencer.address},
+                        fallback=self.SETTLE_STRIKE_GAS,
                     ),
-                    private_key,
-                ).rawTransaction
+                    **self._get_fee_params(rpc_uri, chain_id),
+                },
             )
-            print("Sent OWNER transaction for settling vault", tx.hex())
-            w3.eth.wait_for_transaction_receipt(tx)
-            time.sleep(5)
-            nonce = Nonce(nonce + 2)
+            print("Sent OWNER transaction for settling vault", tx.tx_hash.hex())
+            # The next round is read from the settled vault
+            yield tx
 
         # Configure ParadigmBridge
-        bridgeContract = w3.eth.contract(
-            w3.to_checksum_address(contract_address),
-            abi=get_abi("Thetanuts_ParadigmBridge"),
+        bridgeContract = get_contract(
+            rpc_uri, chain_id, contract_address, "Thetanuts_ParadigmBridge"
         )
 
         # Do Once! Configure ParadigmBridge to accept this vault
@@ -120,25 +242,23 @@ class Thetanuts(SDKConfig):
                 amtToSell = vaultContract.functions.initNewRound([int(price)], 0, 0).call(
                     {"from": vaultContract.functions.designatedMaker().call()}
                 )  # Get active balance in vault - will fail if not ready
-            tx = w3.eth.send_raw_transaction(
-                w3.eth.account.sign_transaction(
-                    bridgeContract.functions.setNextStrikeAndSize(
-                        oToken, int(price), amtToSell
-                    ).build_transaction(
-                        {
-                            'nonce': Nonce(nonce),
-                            'from': public_key,
-                            "gas": 200000,
-                            "maxPriorityFeePerGas": self.PRIORITY_FEE[chain_id],
-                            'maxFeePerGas': hex(w3.eth.gas_price * 2),
-                        }
+            setNextStrike = bridgeContract.functions.setNextStrikeAndSize(
+                oToken, int(price), amtToSell
+            )
+            tx = sequencer.send(
+                setNextStrike,
+                {
+                    "gas": get_gas_limit(
+                        chain_id,
+                        setNextStrike,
+                        {"from": sequencer.address},
+                        fallback=self.NEXT_STRIKE_GAS,
                     ),
-                    private_key,
-                ).rawTransaction
+                    **self._get_fee_params(rpc_uri, chain_id),
+                },
             )
-            print("Sent OWNER transaction for setting new strike and size", tx.hex())
-            w3.eth.wait_for_transaction_receipt(tx)
-            time.sleep(5)
+            print("Sent OWNER transaction for setting new strike and size", tx.tx_hash.hex())
+            yield tx
         return str(
             (bridgeContract.functions.vaultIndexToAddress(contract_address).call() << 16)
             + vaultContract.functions.epoch().call()
@@ -158,22 +278,13 @@ class Thetanuts(SDKConfig):
     ) -> OfferTokenDetails:
         """Return details about the offer token"""
 
-        w3 = web3.Web3(web3.HTTPProvider(rpc_uri))
-        bridgeContract = w3.eth.contract(
-            w3.to_checksum_address(swap_contract_address),
-            abi=get_abi("Thetanuts_ParadigmBridge"),
+        bridgeContract = get_contract(
+            rpc_uri, chain_id, swap_contract_address, "Thetanuts_ParadigmBridge"
         )
 
         aucDetails = bridgeContract.functions.getAuctionDetails(contract_address).call()
 
-        return {
-            "collateralAsset": aucDetails[0],
-            "underlyingAsset": aucDetails[1],
-            "strikeAsset": aucDetails[2],
-            "strikePrice": aucDetails[3] * self.PARADIGM_OFFSET,
-            "expiryTimestamp": aucDetails[4],
-            "isPut": aucDetails[5],
-        }
+        return parse_auction_token_details(aucDetails)
 
     def get_offer_details(
         self,
@@ -186,30 +297,32 @@ class Thetanuts(SDKConfig):
     ) -> OfferDetails:
         """Return details for a given offer"""
 
-        w3 = web3.Web3(web3.HTTPProvider(rpc_uri))
-        bridgeContract = w3.eth.contract(
-            w3.to_checksum_address(contract_address),
-            abi=get_abi("Thetanuts_ParadigmBridge"),
+        w3 = get_web3(rpc_uri, chain_id)
+        bridgeContract = get_contract(
+            rpc_uri, chain_id, contract_address, "Thetanuts_ParadigmBridge"
         )
 
-        vault_address = w3.to_checksum_address(
-            bridgeContract.functions.vaultIndex(int(offer_id >> 16)).call()
-        )
+        def fetch(block_number: BlockIdentifier) -> OfferDetails:
+            vault_address = w3.to_checksum_address(
+                bridgeContract.functions.vaultIndex(int(offer_id >> 16)).call(
+                    block_identifier=block_number
+                )
+            )
+
+            try:
+                aucDetails = bridgeContract.functions.getAuctionDetails(vault_address).call(
+                    block_identifier=block_number
+                )
+            except Exception as e:
+                if is_missing_block_error(e):
+                    raise
+                raise ValueError("The argument is not a valid offer")
 
-        try:
-            aucDetails = bridgeContract.functions.getAuctionDetails(vault_address).call()
-        except Exception:
-            raise ValueError("The argument is not a valid offer")
-
-        return {
-            'seller': vault_address,
-            'oToken': vault_address,
-            'biddingToken': aucDetails[0],
-            'minPrice': "0.0",
-            'minBidSize': aucDetails[6] * self.PARADIGM_OFFSET,
-            'totalSize': aucDetails[6] * self.PARADIGM_OFFSET,
-            'availableSize': aucDetails[6] * self.PARADIGM_OFFSET,
-        }
+            return parse_auction_offer_details(vault_address, aucDetails)
+
+        return offer_details_cache.get_or_fetch(
+            rpc_uri, chain_id, bridgeContract.address, offer_id, fetch
+        )
 
     def sign_bid(
         self,
@@ -238,7 +351,7 @@ class Thetanuts(SDKConfig):
             referrer=referrer,
         )
 
-        wallet = Wallet(public_key=public_key, private_key=private_key)
+        wallet = Wallet.cached(public_key=public_key, private_key=private_key)
         signature = wallet.sign_bid(payload)
 
         return signature
@@ -256,45 +369,76 @@ class Thetanuts(SDKConfig):
         buy_amount: int,
         referrer: str,
         signature: str,
+        local_signature_only: bool = False,
         **kwargs: Any,
     ) -> BidValidation:
-        """Validate the signing bid"""
+        """
+        Validate the signing bid. The signature is recovered locally
+        first, with local_signature_only the validateSignature call
+        is skipped when the recovered signer matches signer_wallet
+        """
 
-        w3 = web3.Web3(web3.HTTPProvider(rpc_uri))
-        bridgeContract = w3.eth.contract(
-            w3.to_checksum_address(contract_address),
-            abi=get_abi("Thetanuts_ParadigmBridge"),
+        w3 = get_web3(rpc_uri, chain_id)
+        bridgeContract = get_contract(
+            rpc_uri, chain_id, contract_address, "Thetanuts_ParadigmBridge"
         )
-        vault_address = w3.to_checksum_address(
-            bridgeContract.functions.vaultIndex(int(swap_id >> 16)).call()
+        vault_index = int(swap_id >> 16)
+        vault_address = _vault_addresses.get_or_create(
+            (chain_id, bridgeContract.address, vault_index),
+            lambda: w3.to_checksum_address(
+                bridgeContract.functions.vaultIndex(vault_index).call()
+            ),
         )
 
-        vault = w3.eth.contract(vault_address, abi=get_abi("Thetanuts_Vault"))
+        # Metamask returns a signature string without '0x' prepend
+        if signature[0:2].lower() != "0x":
+            signature = "0x" + signature
+
+        # Check for valid signature before any other call
+        signatory = recover_bid_signer(vault_address, nonce, sell_amount, signer_wallet, signature)
+        if signatory is None or signatory != w3.to_checksum_address(signer_wallet):
+            return {'errors': 1, "messages": ["signature invalid"]}
 
-        bidding_token = w3.eth.contract(
-            w3.to_checksum_address(vault.functions.COLLAT().call()),
-            abi=get_abi("ERC20"),
+        vault = get_contract(rpc_uri, chain_id, vault_address, "Thetanuts_Vault")
+        validate_signature = bridgeContract.functions.validateSignature(
+            vault_address,
+            nonce,
+            sell_amount,
+            w3.to_checksum_address(signer_wallet),
+            signature,
         )
+        checks = [] if local_signature_only else [validate_signature]
+
+        # The balance depends on the vault collateral, the bid check
+        # only on the vault: independent reads are sent in one batch
+        collateral = _vault_collaterals.get((chain_id, vault_address))
+        if collateral is None:
+            collateral, *results = batch_call(
+                rpc_uri, chain_id, [vault.functions.COLLAT(), *checks]
+            )
+            if isinstance(collateral, Exception):
+                raise collateral
+            _vault_collaterals.put((chain_id, vault_address), collateral)
+            bidding_token = get_contract(rpc_uri, chain_id, collateral, "ERC20")
+            assetBalance = bidding_token.functions.balanceOf(signer_wallet).call()
+        else:
+            bidding_token = get_contract(rpc_uri, chain_id, collateral, "ERC20")
+            assetBalance, *results = batch_call(
+                rpc_uri, chain_id, [bidding_token.functions.balanceOf(signer_wallet), *checks]
+            )
+            if isinstance(assetBalance, Exception):
+                raise assetBalance
 
         # Check for sufficient assets in wallet
-        assetBalance = bidding_token.functions.balanceOf(signer_wallet).call()
         if assetBalance < sell_amount:
             return {'errors': 1, "messages": ["insufficient bidding token in wallet"]}
 
-        # Metamask returns a signature string without '0x' prepend
-        if signature[0:2].lower() != "0x":
-            signature = "0x" + signature
+        if local_signature_only:
+            return {'errors': 0}
 
-        # Check for valid signature
-        try:
-            isValid = bridgeContract.functions.validateSignature(
-                vault_address,
-                nonce,
-                sell_amount,
-                w3.to_checksum_address(signer_wallet),
-                signature,
-            ).call()
-        except Exception:  # Catches revert when signature invalid
+        # Check for valid bid parameters
+        isValid = results[0]
+        if isinstance(isValid, ContractLogicError):  # Revert when signature invalid
             return {'errors': 1, "messages": ["signature invalid"]}
 
         if isValid:
@@ -317,17 +461,255 @@ class Thetanuts(SDKConfig):
         the given token on the wallet
         """
 
-        w3 = web3.Web3(web3.HTTPProvider(rpc_uri))
-        if not w3.eth.chain_id == chain_id.value:
+        if not get_chain_id(rpc_uri, chain_id) == chain_id.value:
             return False
 
-        bidding_token = w3.eth.contract(
-            w3.to_checksum_address(token_address),
-            abi=get_abi("ERC20"),
+        bidding_token = get_contract(rpc_uri, chain_id, token_address, "ERC20")
+
+        # Decimals are cached, only the allowance is requested
+        decimals = get_token_metadata(rpc_uri, chain_id, token_address).decimals
+        allowance = bidding_token.functions.allowance(public_key, contract_address).call()
+        allowance = allowance / (10**decimals)
+
+        return bool(allowance > 1e30)
+
+
+class AsyncThetanuts(AsyncSDKConfig):
+    """
+    asyncio implementation of Thetanuts on AsyncWeb3.
+    create_offer and sign_bid run Thetanuts in the executor,
+    the receipts of create_offer are awaited on the event loop
+    """
+
+    authorization_pages = AuthorizationPages
+    supported_chains = Thetanuts.supported_chains
+    sync_config = Thetanuts()
+
+    async def create_offer(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        oToken: str,
+        bidding_token: str,
+        public_key: str,
+        private_key: str,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Start new round by forcefully ending previous round
+        Needs to be done by Vault Owner
+        """
+
+        # Only the steps run in the executor, the receipts are
+        # awaited from the shared receipt poller
+        return await run_steps_async(
+            self.sync_config._create_offer_steps(
+                contract_address, chain_id, rpc_uri, oToken, public_key, private_key, confirmations
+            ),
+            self.executor,
         )
 
-        allowance = bidding_token.functions.allowance(public_key, contract_address).call() / (
-            10 ** bidding_token.functions.decimals().call()
+    async def get_otoken_details(
+        self,
+        *,
+        # TODO: to be renamed into token_address
+        contract_address: str,
+        # TODO: to be normalized with the other methods
+        swap_contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        **kwargs: Any,
+    ) -> OfferTokenDetails:
+        """Return details about the offer token"""
+
+        bridgeContract = get_async_contract(
+            rpc_uri, chain_id, swap_contract_address, "Thetanuts_ParadigmBridge"
         )
 
+        aucDetails = await bridgeContract.functions.getAuctionDetails(contract_address).call()
+
+        return parse_auction_token_details(aucDetails)
+
+    async def get_offer_details(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        offer_id: int,
+        **kwargs: Any,
+    ) -> OfferDetails:
+        """Return details for a given offer"""
+
+        bridgeContract = get_async_contract(
+            rpc_uri, chain_id, contract_address, "Thetanuts_ParadigmBridge"
+        )
+
+        async def fetch(block_number: BlockIdentifier) -> OfferDetails:
+            vault_address = Web3.to_checksum_address(
+                await bridgeContract.functions.vaultIndex(int(offer_id >> 16)).call(
+                    block_identifier=block_number
+                )
+            )
+
+            try:
+                aucDetails = await bridgeContract.functions.getAuctionDetails(vault_address).call(
+                    block_identifier=block_number
+                )
+            except Exception as e:
+                if is_missing_block_error(e):
+                    raise
+                raise ValueError("The argument is not a valid offer")
+
+            return parse_auction_offer_details(vault_address, aucDetails)
+
+        return await offer_details_cache.get_or_fetch_async(
+            rpc_uri, chain_id, bridgeContract.address, offer_id, fetch
+        )
+
+    async def sign_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        public_key: str,
+        private_key: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        **kwargs: Any,
+    ) -> str:
+        """Sign a bid and return the signature"""
+
+        return await self.run_in_executor(
+            self.sync_config.sign_bid,
+            contract_address=contract_address,
+            chain_id=chain_id,
+            rpc_uri=rpc_uri,
+            public_key=public_key,
+            private_key=private_key,
+            swap_id=swap_id,
+            nonce=nonce,
+            signer_wallet=signer_wallet,
+            sell_amount=sell_amount,
+            buy_amount=buy_amount,
+            referrer=referrer,
+        )
+
+    async def validate_bid(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        swap_id: int,
+        nonce: int,
+        signer_wallet: str,
+        sell_amount: int,
+        buy_amount: int,
+        referrer: str,
+        signature: str,
+        local_signature_only: bool = False,
+        **kwargs: Any,
+    ) -> BidValidation:
+        """
+        Validate the signing bid. The signature is recovered locally
+        first, with local_signature_only the validateSignature call
+        is skipped when the recovered signer matches signer_wallet
+        """
+
+        bridgeContract = get_async_contract(
+            rpc_uri, chain_id, contract_address, "Thetanuts_ParadigmBridge"
+        )
+        vault_index = int(swap_id >> 16)
+        vault_key = (chain_id, bridgeContract.address, vault_index)
+        vault_address = _vault_addresses.get(vault_key)
+        if vault_address is None:
+            vault_address = Web3.to_checksum_address(
+                await bridgeContract.functions.vaultIndex(vault_index).call()
+            )
+            _vault_addresses.put(vault_key, vault_address)
+
+        # Metamask returns a signature string without '0x' prepend
+        if signature[0:2].lower() != "0x":
+            signature = "0x" + signature
+
+        # Check for valid signature before any other call
+        signatory = recover_bid_signer(vault_address, nonce, sell_amount, signer_wallet, signature)
+        if signatory is None or signatory != Web3.to_checksum_address(signer_wallet):
+            return {'errors': 1, "messages": ["signature invalid"]}
+
+        async def get_balance() -> int:
+            collateral = _vault_collaterals.get((chain_id, vault_address))
+            if collateral is None:
+                vault = get_async_contract(rpc_uri, chain_id, vault_address, "Thetanuts_Vault")
+                collateral = await vault.functions.COLLAT().call()
+                _vault_collaterals.put((chain_id, vault_address), collateral)
+            bidding_token = get_async_contract(rpc_uri, chain_id, collateral, "ERC20")
+            return int(await bidding_token.functions.balanceOf(signer_wallet).call())
+
+        async def validate_signature() -> bool | None:
+            try:
+                return bool(
+                    await bridgeContract.functions.validateSignature(
+                        vault_address,
+                        nonce,
+                        sell_amount,
+                        Web3.to_checksum_address(signer_wallet),
+                        signature,
+                    ).call()
+                )
+            except ContractLogicError:  # Revert when signature invalid
+                return None
+
+        if local_signature_only:
+            assetBalance = await get_balance()
+            isValid: bool | None = True
+        else:
+            assetBalance, isValid = await asyncio.gather(get_balance(), validate_signature())
+
+        # Check for sufficient assets in wallet
+        if assetBalance < sell_amount:
+            return {'errors': 1, "messages": ["insufficient bidding token in wallet"]}
+
+        # Check for valid bid parameters
+        if isValid is None:
+            return {'errors': 1, "messages": ["signature invalid"]}
+
+        if isValid:
+            return {'errors': 0}
+        else:
+            return {'errors': 1, "messages": ["signature valid, bid parameters invalid"]}
+
+    async def verify_allowance(
+        self,
+        *,
+        contract_address: str,
+        chain_id: Chains,
+        rpc_uri: str,
+        public_key: str,
+        token_address: str,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Verify if the contract is allowed to access
+        the given token on the wallet
+        """
+
+        if not await get_async_chain_id(rpc_uri, chain_id) == chain_id.value:
+            return False
+
+        bidding_token = get_async_contract(rpc_uri, chain_id, token_address, "ERC20")
+
+        metadata = await get_async_token_metadata(rpc_uri, chain_id, token_address)
+        allowance = await bidding_token.functions.allowance(public_key, contract_address).call()
+        allowance = allowance / (10**metadata.decimals)
+
         return bool(allowance > 1e30)
@@ -1,12 +1,55 @@
 """ Module for wallet utilities """
-import eth_keys  # type: ignore
-import web3
 from eth_abi.packed import encode_packed
 from eth_account.messages import encode_defunct
 from web3 import Web3
 
+from sdk_commons.signing import SignerCache, get_ecc_backend_name, get_private_key, recover_signer
 from thetanuts.definitions import Bid
 
+SIGNATURE_SIZE = 65
+
+# Wallets returned by Wallet.cached, keyed by private key fingerprint
+_wallet_cache: SignerCache["Wallet"] = SignerCache()
+
+
+def get_bid_message_hash(
+    vault_address: str, nonce: int, sell_amount: int, signer_wallet: str
+) -> bytes:
+    """
+    Return the EIP191 hash signed for a bid, as done by eth_account's
+    sign_message of the packed bid fields hash
+    """
+    packed = encode_packed(
+        ['address', 'uint', 'uint', 'address'],
+        [vault_address, nonce, sell_amount, signer_wallet],
+    )
+    message = encode_defunct(Web3.keccak(packed))
+    return Web3.keccak(b"\x19" + message.version + message.header + message.body)
+
+
+def recover_bid_signer(
+    vault_address: str, nonce: int, sell_amount: int, signer_wallet: str, signature: str
+) -> str | None:
+    """
+    Recover the address that signed a bid from its signature
+    in hex format, None when the signature is malformed
+    """
+    try:
+        data = bytes.fromhex(signature[2:] if signature[:2].lower() == "0x" else signature)
+    except ValueError:
+        return None
+
+    if len(data) != SIGNATURE_SIZE:
+        return None
+
+    message_hash = get_bid_message_hash(vault_address, nonce, sell_amount, signer_wallet)
+    return recover_signer(
+        message_hash,
+        data[64],
+        int.from_bytes(data[:32], "big"),
+        int.from_bytes(data[32:64], "big"),
+    )
+
 
 class Wallet:
     """
@@ -17,23 +60,49 @@ class Wallet:
                           in hex format with 0x prefix
         private_key (str): Private key of the user
                            in hex format with 0x prefix
+        backend (str): secp256k1 backend used to sign, see
+                       sdk_commons.signing.ECC_BACKENDS
+                       (defaults to the selected backend)
 
     Attributes:
         signer (object): Instance of signer to generate signature
     """
 
-    def __init__(self, public_key: str = "", private_key: str = ""):
+    def __init__(self, public_key: str = "", private_key: str = "", backend: str | None = None):
         if private_key == "" and public_key == "":
             raise ValueError("Can't instanciate a Wallet without a public or private key")
 
         self.private_key = private_key
         self.public_key = public_key
+        self.backend = backend or get_ecc_backend_name()
 
         if self.private_key:
-            self.signer = eth_keys.keys.PrivateKey(bytes.fromhex(self.private_key[2:]))
+            self.signer = get_private_key(self.private_key, self.backend)
             if not self.public_key:
                 self.public_key = Web3.to_checksum_address(self.signer.public_key.to_address())
 
+    @classmethod
+    def cached(cls, public_key: str = "", private_key: str = "") -> "Wallet":
+        """Return a Wallet shared across calls with the same keys,
+        to avoid deriving the signer on every signature
+        """
+        if not private_key:
+            return cls(public_key=public_key)
+
+        return _wallet_cache.get(
+            private_key, public_key, lambda: cls(public_key=public_key, private_key=private_key)
+        )
+
+    @staticmethod
+    def evict_cached(private_key: str = "") -> None:
+        """Remove cached wallets for the private key,
+        or all cached wallets when not given
+        """
+        if private_key:
+            _wallet_cache.evict(private_key)
+        else:
+            _wallet_cache.clear()
+
     def sign_msg(self, messageHash: str) -> str:
         """Sign a hash message using the signer object
         Args:
@@ -64,15 +133,6 @@ class Wallet:
         if signerWallet != self.public_key:
             raise ValueError("Signer wallet address mismatch")
 
-        toSign = encode_packed(
-            ['address', 'uint', 'uint', 'address'],
-            [
-                bid.vaultAddress,
-                bid.nonce,
-                int(bid.sellAmount),
-                signerWallet,
-            ],
-        )
         print(
             "Wallet signing bid",
             [
@@ -82,8 +142,8 @@ class Wallet:
                 signerWallet,
             ],
         )
-        signature = web3.eth.Eth.account.sign_message(
-            encode_defunct(web3.Web3.keccak(toSign)), private_key=self.signer.to_hex()
-        ).signature.hex()
+        signature = self.signer.sign_msg_hash(
+            get_bid_message_hash(bid.vaultAddress, bid.nonce, int(bid.sellAmount), signerWallet)
+        )
 
-        return str(signature)
+        return Web3.to_hex(signature.to_bytes()[:64] + bytes([signature.v + 27]))